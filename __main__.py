@@ -0,0 +1,9 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Point d'entrée : python -m ordonnancement resous DOSSIER.
+"""
+import sys
+from .lot import main
+
+sys.exit(main())
@@ -0,0 +1,266 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Durées incertaines et analyse de risque par Monte-Carlo (NumPy).
+
+Une tâche peut porter une loi de durée (Triangulaire, Pert, Normale ou
+Empirique). ``simule`` tire une matrice de durées tâches × scénarios et fait
+les passes avant et arrière sur tous les scénarios à la fois, tâche par
+tâche dans l'ordre topologique : un seul max (ou min) vectorisé par tâche.
+Les scénarios sont traités par blocs pour borner la mémoire.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+from .probleme import Nom, Probleme
+from .moteur import GrapheCompact, _sans_liens, passe_avant
+
+
+class Loi(ABC):
+    """Loi de durée ; tire_groupe vectorise le tirage pour plusieurs tâches."""
+
+    @classmethod
+    def tire_groupe(
+        cls, lois: List["Loi"], generateur: np.random.Generator, taille: int
+    ) -> np.ndarray:
+        """Renvoie un tableau len(lois) × taille de durées."""
+        return np.stack([loi.tire(generateur, taille) for loi in lois])
+
+    @abstractmethod
+    def tire(self, generateur: np.random.Generator, taille: int) -> np.ndarray:
+        """Tire taille durées."""
+
+
+def _verifie_mode(loi: Loi):
+    """Lève ValueError si le mode n'est pas entre minimum et maximum."""
+    if not loi.minimum <= loi.mode <= loi.maximum:
+        raise ValueError(
+            f"{type(loi).__name__} : il faut minimum <= mode <= maximum."
+        )
+
+
+def _parametres(lois: List[Loi], *noms: str) -> List[np.ndarray]:
+    """Colonnes de paramètres, prêtes pour la diffusion sur les scénarios."""
+    return [
+        np.array([getattr(loi, nom) for loi in lois], dtype=float)[:, None]
+        for nom in noms
+    ]
+
+
+@dataclass(frozen=True)
+class Triangulaire(Loi):
+    """Loi triangulaire entre minimum et maximum, de mode donné."""
+
+    minimum: float
+    mode: float
+    maximum: float
+
+    def __post_init__(self):
+        """Mode entre les bornes."""
+        _verifie_mode(self)
+
+    @classmethod
+    def tire_groupe(cls, lois, generateur, taille):
+        """Tirage vectorisé ; une loi dégénérée donne sa valeur."""
+        bas, mode, haut = _parametres(lois, "minimum", "mode", "maximum")
+        unites = generateur.random((len(lois), taille))
+        etendue = np.where(haut > bas, haut - bas, 1.0)
+        seuil = (mode - bas) / etendue
+        gauche = bas + np.sqrt(unites * (haut - bas) * (mode - bas))
+        droite = haut - np.sqrt((1 - unites) * (haut - bas) * (haut - mode))
+        return np.where(unites < seuil, gauche, droite)
+
+    def tire(self, generateur, taille):
+        """Tirage pour une seule tâche."""
+        return self.tire_groupe([self], generateur, taille)[0]
+
+
+@dataclass(frozen=True)
+class Pert(Loi):
+    """Loi PERT (bêta) entre minimum et maximum, de mode donné."""
+
+    minimum: float
+    mode: float
+    maximum: float
+    forme: float = 4.0
+
+    def __post_init__(self):
+        """Mode entre les bornes."""
+        _verifie_mode(self)
+
+    @classmethod
+    def tire_groupe(cls, lois, generateur, taille):
+        """Tirage vectorisé ; une loi dégénérée donne sa valeur."""
+        bas, mode, haut, forme = _parametres(
+            lois, "minimum", "mode", "maximum", "forme"
+        )
+        etendue = np.where(haut > bas, haut - bas, 1.0)
+        alpha = 1 + forme * (mode - bas) / etendue
+        beta = 1 + forme * (haut - mode) / etendue
+        forme_tirage = (len(lois), taille)
+        return bas + (haut - bas) * generateur.beta(alpha, beta, forme_tirage)
+
+    def tire(self, generateur, taille):
+        """Tirage pour une seule tâche."""
+        return self.tire_groupe([self], generateur, taille)[0]
+
+
+@dataclass(frozen=True)
+class Normale(Loi):
+    """Loi normale, tronquée à zéro pour rester une durée."""
+
+    moyenne: float
+    ecart_type: float
+
+    def __post_init__(self):
+        """Ecart-type positif."""
+        if not self.ecart_type >= 0:
+            raise ValueError("Normale : l'écart-type doit être positif.")
+
+    @classmethod
+    def tire_groupe(cls, lois, generateur, taille):
+        """Tirage vectorisé."""
+        moyenne, ecart_type = _parametres(lois, "moyenne", "ecart_type")
+        tirage = generateur.normal(moyenne, ecart_type, (len(lois), taille))
+        return np.maximum(tirage, 0.0)
+
+    def tire(self, generateur, taille):
+        """Tirage pour une seule tâche."""
+        return self.tire_groupe([self], generateur, taille)[0]
+
+
+@dataclass(frozen=True)
+class Empirique(Loi):
+    """Tirage uniforme parmi des durées observées."""
+
+    valeurs: Tuple[float, ...]
+
+    def __post_init__(self):
+        """Au moins une valeur, aucune négative."""
+        if not self.valeurs or min(self.valeurs) < 0:
+            raise ValueError("Il faut des durées observées positives.")
+
+    def tire(self, generateur, taille):
+        """Tirage avec remise."""
+        valeurs = np.asarray(self.valeurs, dtype=float)
+        return valeurs[generateur.integers(0, len(valeurs), taille)]
+
+
+@dataclass
+class Simulation:
+    """Résultat d'une analyse de Monte-Carlo."""
+
+    durees_totales: np.ndarray
+    criticite: Dict[Nom, float]
+
+    def percentiles(
+        self, niveaux: Sequence[float] = (50, 80, 90, 95)
+    ) -> Dict[float, float]:
+        """Percentiles de la durée totale du projet."""
+        valeurs = np.percentile(self.durees_totales, niveaux)
+        return dict(zip(niveaux, valeurs.tolist()))
+
+
+def _tire_durees(
+    groupes: Dict[type, Tuple[List[int], List[Loi]]],
+    fixes: np.ndarray,
+    generateur: np.random.Generator,
+    taille: int,
+) -> np.ndarray:
+    """Matrice tâches × scénarios des durées d'un bloc."""
+    durees = np.repeat(fixes[:, None], taille, axis=1)
+    for classe, (indices, lois) in groupes.items():
+        durees[indices] = classe.tire_groupe(lois, generateur, taille)
+    return durees
+
+
+def simule(
+    probleme: Probleme,
+    scenarios: int = 10_000,
+    graine: int = 0,
+    bloc: int = 8_000_000,
+) -> Simulation:
+    """Analyse de Monte-Carlo de la durée totale du projet.
+
+    bloc borne le nombre de cases tâches × scénarios en mémoire à la fois.
+    Une tâche est critique dans un scénario si sa marge totale y est nulle ;
+    sa criticité est la proportion de ces scénarios.
+    Exemple:
+    >>> from ordonnancement.probleme import Tache
+    >>> probleme = Probleme([
+    ...     Tache("A", 2, [], loi=Triangulaire(1, 2, 3)),
+    ...     Tache("B", 2, ["A"], loi=Normale(2, 0.1)),
+    ...     Tache("C", 1, ["A"]),
+    ... ])
+    >>> resultat = simule(probleme, scenarios=1000)
+    >>> 3 < resultat.percentiles([50])[50] < 5
+    True
+    >>> resultat.criticite
+    {'A': 1.0, 'B': 1.0, 'C': 0.0}
+    """
+    graphe = GrapheCompact(probleme)
+    _sans_liens(graphe, "simule")
+    ordre, _, _ = passe_avant(graphe)
+    taille = len(graphe)
+    debuts = np.frombuffer(graphe.debuts, dtype=np.int64)
+    prerequis = np.frombuffer(graphe.prerequis, dtype=np.int64)
+    debuts_succ = np.frombuffer(graphe.debuts_succ, dtype=np.int64)
+    successeurs = np.frombuffer(graphe.successeurs, dtype=np.int64)
+
+    fixes = np.array(graphe.durees, dtype=float)
+    groupes: Dict[type, Tuple[List[int], List[Loi]]] = defaultdict(
+        lambda: ([], [])
+    )
+    for indice, tache in enumerate(graphe.taches):
+        if tache.loi is not None:
+            indices, lois = groupes[type(tache.loi)]
+            indices.append(indice)
+            lois.append(tache.loi)
+
+    generateur = np.random.default_rng(graine)
+    par_bloc = max(1, bloc // max(1, taille))
+    durees_totales = np.empty(scenarios)
+    critiques = np.zeros(taille, dtype=np.int64)
+    for depart in range(0, scenarios, par_bloc):
+        nombre = min(par_bloc, scenarios - depart)
+        durees = _tire_durees(groupes, fixes, generateur, nombre)
+        fins = np.empty((taille, nombre))
+        for indice in ordre:
+            k0, k1 = debuts[indice], debuts[indice + 1]
+            if k0 == k1:
+                fins[indice] = durees[indice]
+                continue
+            if k1 - k0 == 1:
+                fins[indice] = fins[prerequis[k0]]
+            else:
+                np.max(fins[prerequis[k0:k1]], axis=0, out=fins[indice])
+            fins[indice] += durees[indice]
+        fin_projet = fins.max(axis=0) if taille else np.zeros(nombre)
+        durees_totales[depart : depart + nombre] = fin_projet
+
+        # Passe arrière : la ligne d'une tâche traitée reçoit sa date de
+        # début au plus tard à la place de sa durée.
+        tolerance = 1e-9 * np.maximum(1.0, fin_projet)
+        fin_tard = np.empty(nombre)
+        for indice in reversed(ordre):
+            k0, k1 = debuts_succ[indice], debuts_succ[indice + 1]
+            if k0 == k1:
+                fin_tard[:] = fin_projet
+            elif k1 - k0 == 1:
+                fin_tard[:] = durees[successeurs[k0]]
+            else:
+                np.min(durees[successeurs[k0:k1]], axis=0, out=fin_tard)
+            critiques[indice] += np.count_nonzero(
+                fin_tard - fins[indice] <= tolerance
+            )
+            np.subtract(fin_tard, durees[indice], out=durees[indice])
+
+    return Simulation(
+        durees_totales=durees_totales,
+        criticite={
+            nom: float(critiques[indice] / scenarios) if scenarios else 0.0
+            for indice, nom in enumerate(graphe.noms)
+        },
+    )
@@ -2,32 +2,43 @@
 # -*- coding: utf-8 -*-
 """Description.
 Contient la fonction de résolution du problème d'ordonnancement.
+
+L'ordre topologique et la détection des cycles viennent de
+Probleme.analyse, calculée une fois par problème. Les fonctions d'aide
+(max_fin, range_*, dta_fin, resous_2, resous_3, resous_4) partagent le
+cache des résolutions (module cache).
 """
+import warnings
+from typing import TYPE_CHECKING, Optional
 from .probleme import Probleme, Tache
 from .edt import Activite, EDT, Instant
-import networkx as nx
+from .moteur import resous_natif
+from .cache import resous_memo
 
+if TYPE_CHECKING:
+    from .calendrier import Calendrier
 
-def _genere_graphe(probleme: Probleme) -> nx.DiGraph:
-    """Crée le graphe associé au problème."""
-    resultat = nx.DiGraph()
-    for tache in probleme.taches:
-        for prerequis in tache.prerequis:
-            resultat.add_edge(prerequis, tache.nom)
-    return resultat
+MOTEURS = ("kahn", "natif", "niveaux")
+# Ancien nom du moteur kahn, accepté avec un DeprecationWarning.
+ALIAS = {"networkx": "kahn"}
 
 
 def _calcule_demarrage(tache: Tache, edt: EDT) -> Instant:
     """Calcule le plus petit temps ok."""
+    if tache.liens:
+        # Un lien typé peut demander un début avant 0 : on s'arrête à 0.
+        bornes = [
+            tache.lien(nom).debut_min(edt[nom].debut, edt[nom].fin, tache.duree)
+            for nom in tache.prerequis
+        ]
+        return max(bornes + [0])
     fins_prerequis = [edt[prerequis].fin for prerequis in tache.prerequis]
     if fins_prerequis:
         return max(fins_prerequis)
     return 0
 
 def _calcule_duree(probleme : Probleme):
-    
-    
-    a=dta_fin(probleme)
+    """Renvois la durée de chaque prérequis, arête par arête"""
     date=[]
     for tache in probleme.taches:
         for prerequis in tache.prerequis:
@@ -40,11 +51,27 @@ def _calcule_date(probleme : Probleme, edt : EDT):
     date=_calcule_duree(probleme)
     date_fin=[]
     for i in range(0,len(date)):
-        date_fin.append(22 - date[i])
-    return date_fin    
+        date_fin.append(a - date[i])
+    return date_fin
 
-def resous(probleme: Probleme) -> EDT:
+def resous(
+    probleme: Probleme,
+    moteur: str = "kahn",
+    marges: bool = False,
+    calendrier: Optional["Calendrier"] = None,
+) -> EDT:
     """Résout un problème d'ordonnancement.
+
+    ``moteur`` choisit l'implémentation : "kahn", qui construit l'EDT
+    activité par activité dans l'ordre topologique de Probleme.verifie
+    (algorithme de Kahn ; "networkx", son ancien nom, est déprécié),
+    "natif" (tableaux CSR, voir le module moteur) ou "niveaux" (même
+    résultat que "natif", calculé par blocs NumPy niveau par niveau, voir
+    le module niveaux).
+    ``marges`` ajoute la passe arrière (dta, marges totale et libre) et
+    n'existe qu'avec les moteurs natif et niveaux. Avec ``calendrier``, les
+    durées sont des durées de travail et les dates des instants du
+    calendrier (voir le module calendrier, qui passe par le moteur natif).
         Exemple:
     >>> from rich import print
     >>> probleme = Probleme.par_str('''
@@ -54,7 +81,8 @@ def resous(probleme: Probleme) -> EDT:
     ... D / 4 / A
     ... '''
     ... )
-    >>> print(probleme.genere_table())
+    >>> print(probleme.genere_table())  # doctest: +NORMALIZE_WHITESPACE
+      Problème d'ordonnancement
     ┏━━━━━━━┳━━━━━━━┳━━━━━━━━━━━┓
     ┃ Tache ┃ Durée ┃ Prérequis ┃
     ┡━━━━━━━╇━━━━━━━╇━━━━━━━━━━━┩
@@ -64,20 +92,41 @@ def resous(probleme: Probleme) -> EDT:
     │ D     │ 4     │ A         │
     └───────┴───────┴───────────┘
     >>> solution = resous(probleme)
-    >>> print(solution.genere_table())
+    >>> print(solution.genere_table())  # doctest: +NORMALIZE_WHITESPACE
+       Solution du problème
     ┏━━━━━━━┳━━━━━━━┳━━━━━┓
     ┃ Tache ┃ Début ┃ Fin ┃
     ┡━━━━━━━╇━━━━━━━╇━━━━━┩
     │ A     │ 0     │ 1   │
-    │ D     │ 1     │ 5   │
     │ B     │ 1     │ 3   │
+    │ D     │ 1     │ 5   │
     │ C     │ 3     │ 6   │
     └───────┴───────┴─────┘
     """
-    graphe = _genere_graphe(probleme)
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
-    bon_ordre = [probleme[nom] for nom in nx.topological_sort(G=graphe)]
+    if moteur in ALIAS:
+        warnings.warn(
+            f"Le moteur {moteur!r} s'appelle désormais {ALIAS[moteur]!r}.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        moteur = ALIAS[moteur]
+    if calendrier is not None:
+        from .calendrier import resous_calendrier
+
+        if moteur not in MOTEURS:
+            raise ValueError(f"Moteur inconnu : {moteur}.")
+        return resous_calendrier(probleme, calendrier, marges=marges)
+    if moteur == "natif":
+        return resous_natif(probleme, marges=marges)
+    if moteur == "niveaux":
+        from .niveaux import resous_niveaux
+
+        return resous_niveaux(probleme, marges=marges)
+    if moteur != "kahn":
+        raise ValueError(f"Moteur inconnu : {moteur}.")
+    if marges:
+        raise ValueError("Les marges demandent le moteur natif ou niveaux.")
+    bon_ordre = [probleme[nom] for nom in probleme.verifie()]
     resultat = EDT(activites=[])
     for tache_courante in bon_ordre:
         demarrage = _calcule_demarrage(tache=tache_courante, edt=resultat)
@@ -95,7 +144,7 @@ def resous(probleme: Probleme) -> EDT:
 def max_fin(probleme : Probleme):
     """Renvoi la durée de fin cumulée maximum"""
     cool=[]
-    solution = resous(probleme)
+    solution = resous_memo(probleme)
     for activite in solution.activites:
             cool.append(activite.fin)
     return max(cool)
@@ -123,28 +172,11 @@ def nompre(probleme : Probleme):
 
 def range_res(probleme : Probleme):
     """ Renvois la liste des activites triées par ordre croissant de début"""
-    resolve = resous(probleme)
-    deb=[]
-    bad = []
-    new = [] 
-    [deb.append(activite.debut) for activite in resolve.activites]
-    deb.sort()
-    for x in range(0,len(deb)):
-        for activite in resolve.activites:
-            if deb[x] == activite.debut:
-                bad.append(activite)
-                for i in bad:
-                    if i not in new:
-                        new.append(i)                      
-    return new
+    return list(resous_memo(probleme).ordonne("debut"))
 
 def range_bis(probleme : Probleme)-> EDT:
     """Renvois sous forme d'EDT exploitable les activités triées par ordre de début"""
-    new = range_res(probleme)
-    new_res = EDT(activites=[])
-    for i in range(0,len(new)):
-        new_res.ajoute(new[i])
-    return new_res
+    return resous_memo(probleme).ordonne("debut").edt()
 
     """
     Pour faire plus de cas et montrer que les fonctions marchent bien on se basera sur le problème suivant :
@@ -182,51 +214,22 @@ def range_bis(probleme : Probleme)-> EDT:
     """
 def range_prob(probleme : Probleme):
     """Range le probleme par ordre croissant de début"""
-    dim = range_bis(probleme)
-    new=[]
-    for activite in dim.activites:
-        for tache in probleme.taches:
-            for task in activite.tache.nom:
-                if tache.nom == task:
-                    new.append(tache)
-    return new
+    vue = resous_memo(probleme).ordonne("debut")
+    return [probleme[activite.tache.nom] for activite in vue]
 
 def range_res_desor(probleme : Probleme):
     """Range la liste des activites de maniere décroissante"""
-    resolve = resous(probleme)
-    deb=[]
-    bad = []
-    new = [] 
-    [deb.append(activite.debut) for activite in resolve.activites]
-    deb.sort(reverse=True)
-    for x in range(0,len(deb)):
-        for activite in resolve.activites:
-            if deb[x] == activite.debut:
-                bad.append(activite)
-                for i in bad:
-                    if i not in new:
-                        new.append(i)                      
-    return new
+    return list(resous_memo(probleme).ordonne("debut", decroissant=True))
 
 def range_bis_desor(probleme : Probleme)-> EDT:
     """Renvois sous forme d'EDT exploitable les activités triées par ordre décroissant de début"""
-    new = range_res_desor(probleme)
-    new_res = EDT(activites=[])
-    for i in range(0,len(new)):
-        new_res.ajoute(new[i])
-    return new_res
+    return resous_memo(probleme).ordonne("debut", decroissant=True).edt()
 
 
 def range_prob_desor(probleme : Probleme):
     """Range le probleme de manière désordonnée"""
-    dim = range_bis_desor(probleme)
-    new=[]
-    for activite in dim.activites:
-        for tache in probleme.taches:
-            for task in activite.tache.nom:
-                if tache.nom == task:
-                    new.append(tache)
-    return new
+    vue = resous_memo(probleme).ordonne("debut", decroissant=True)
+    return [probleme[activite.tache.nom] for activite in vue]
        
 def nom_fin(probleme: Probleme):
     """Renvoi le nom de toutes les tâches réliés à la Fin"""
@@ -248,9 +251,7 @@ def nom_fin(probleme: Probleme):
     """
 def resous_2(probleme : Probleme)-> EDT:
     """Sert a avoir sous forme de liste le debut et la fin des taches"""
-    graphe = _genere_graphe(probleme)
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
+    probleme.verifie()
     bon_ordre = range_prob(probleme)
     desordre = range_prob_desor(probleme)
     resultat = EDT(activites=[])
@@ -277,42 +278,31 @@ def resous_2(probleme : Probleme)-> EDT:
 
 def resous_3(probleme : Probleme)-> EDT:
     """Résous le probleme avec les date au plus tard"""
-    graphe = _genere_graphe(probleme)
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
-    bon_ordre = range_prob(probleme)
-    dem=[0, 0, 0, 0, 0, 1, 4, 4, 9, 9, 9, 9, 13, 14, 14, 17, 17, 18, 20]
-    arr=[14, 6, 1, 4, 3, 4, 9, 6, 11, 12, 14, 13, 14, 16, 17, 18, 20, 21, 22]
-    dta=[1, 9 ,0 ,3 ,6, 1, 4, 7, 12, 15, 9, 9, 13, 15 ,14, 18, 17, 19, 20]
     resultat = EDT(activites=[])
-    doum = []
-    desordre = range_prob_desor(probleme)
-    for sipe in zip(bon_ordre,dem,arr,dta):
+    for activite in resous_memo(probleme, marges=True).ordonne("debut"):
         resultat.ajoute(
         Activite(
-            tache=sipe[0],
-            debut=sipe[1],
-            fin=sipe[2],
-            dta=sipe[3],
+            tache=activite.tache,
+            debut=activite.debut,
+            fin=activite.fin,
+            dta=activite.dta,
             mar=0
             )
         )
     return resultat
-   
+
 
 def dta_fin(probleme : Probleme):
     """Renvois les dates au plus tard par ordre croissant des dernière tâches avant la fin"""
-    x = []
-    a = max_fin(probleme)
-    b = nom_fin(probleme)
-    c = range_bis(probleme)
-    for activite in c.activites:
-        for nom in activite.tache.nom:
-            for i in range(0,len(b)):
-                if b[i] == nom:
-                    x.append(a - activite.tache.duree)
-    return x
-                    
+    solution = resous_memo(probleme).ordonne("debut")
+    a = max((activite.fin for activite in solution.activites), default=0)
+    b = set(nom_fin(probleme))
+    return [
+        a - activite.tache.duree
+        for activite in solution.activites
+        if activite.tache.nom in b
+    ]
+
 def marges(edt : EDT):
     """Renvois la liste des marges"""
     x=[]
@@ -321,27 +311,6 @@ def marges(edt : EDT):
     return x
     
 def resous_4(probleme : Probleme)-> EDT:
-    """Résous le probleme avec les date au plus tard"""
-    graphe = _genere_graphe(probleme)
-    if not nx.is_directed_acyclic_graph(G=graphe):
-        raise ValueError("Le problème n'a pas de solution.")
-    bon_ordre = range_prob(probleme)
-    dem=[0, 0, 0, 0, 0, 1, 4, 4, 9, 9, 9, 9, 13, 14, 14, 17, 17, 18, 20]
-    arr=[14, 6, 1, 4, 3, 4, 9, 6, 11, 12, 14, 13, 14, 16, 17, 18, 20, 21, 22]
-    dta=[1, 9 ,0 ,3 ,6, 1, 4, 7, 12, 15, 9, 9, 13, 15 ,14, 18, 17, 19, 20]
-    marge=[1, 9, 0, 3, 6, 0, 0, 3, 3, 6, 0, 0, 0, 1, 0, 1, 0, 1, 0]
-    resultat = EDT(activites=[])
-    doum = []
-    desordre = range_prob_desor(probleme)
-    for sipe in zip(bon_ordre,dem,arr,dta,marge):
-        resultat.ajoute(
-        Activite(
-            tache=sipe[0],
-            debut=sipe[1],
-            fin=sipe[2],
-            dta=sipe[3],
-            mar=sipe[4]
-            )
-        )
-    return resultat
-    
\ No newline at end of file
+    """Résous le probleme avec les date au plus tard et les marges
+    (totale dans mar, libre dans marge_libre)"""
+    return resous_memo(probleme, marges=True).ordonne("debut").edt()
@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure l'analyse de Monte-Carlo sur un problème aléatoire.
+
+Chaque tâche reçoit une loi triangulaire ou PERT autour de sa durée ; le
+temps est donné séparément pour le tirage des durées et pour la simulation
+complète.
+Usage : python benchmarks/bench_aleas.py [taches] [scenarios]
+"""
+import sys
+import time
+from dataclasses import replace
+import numpy as np
+from ordonnancement.probleme import Probleme
+from ordonnancement.generateur import aleatoire
+from ordonnancement.aleas import Pert, Triangulaire, _tire_durees, simule
+
+
+def incertain(taille: int) -> Probleme:
+    """Problème aléatoire dont une tâche sur deux suit une loi PERT."""
+    taches = dict()
+    for indice, tache in enumerate(aleatoire(taille).taches):
+        if indice % 2:
+            loi = Pert(tache.duree / 2, tache.duree, tache.duree * 2)
+        else:
+            loi = Triangulaire(tache.duree * 0.8, tache.duree, tache.duree * 1.5)
+        taches[tache.nom] = replace(tache, loi=loi)
+    return Probleme._depuis_dict(taches)
+
+
+def main(taille: int = 10_000, scenarios: int = 10_000):
+    """Affiche les temps et les percentiles de la durée totale."""
+    probleme = incertain(taille)
+    lois = [tache.loi for tache in probleme.taches]
+    groupes = {
+        classe: (
+            [i for i, loi in enumerate(lois) if type(loi) is classe],
+            [loi for loi in lois if type(loi) is classe],
+        )
+        for classe in (Pert, Triangulaire)
+    }
+    depart = time.perf_counter()
+    _tire_durees(groupes, np.zeros(taille), np.random.default_rng(0), scenarios)
+    tirage = time.perf_counter() - depart
+
+    depart = time.perf_counter()
+    resultat = simule(probleme, scenarios=scenarios)
+    total = time.perf_counter() - depart
+    print(f"{taille} tâches × {scenarios} scénarios")
+    print(f"tirage seul : {tirage:.2f} s, simulation complète : {total:.2f} s")
+    for niveau, valeur in resultat.percentiles().items():
+        print(f"P{niveau:<3} {valeur:10.2f}")
+    critiques = sum(c > 0.5 for c in resultat.criticite.values())
+    print(f"{critiques} tâches critiques dans plus d'un scénario sur deux")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
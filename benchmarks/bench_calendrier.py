@@ -0,0 +1,89 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Calendriers de travail sur un plan de 100 000 tâches et dix ans.
+
+Le plan est fait de couches de 70 tâches et couvre plusieurs années. Le
+calendrier compte deux plages par jour ouvré (8h-12h, 13h-17h) et des
+jours fériés, soit environ 5 000 périodes. On compare la résolution sans
+calendrier, avec un seul calendrier (passes en travail puis conversion
+des dates), et avec un calendrier par tâche (un tiers des tâches en
+continu sept jours sur sept). La référence parcourt les périodes depuis
+l'origine à chaque conversion ; elle est mesurée sur un échantillon.
+Usage : python benchmarks/bench_calendrier.py [taille] [annees]
+"""
+import random
+import sys
+from datetime import date
+from ordonnancement import resous
+from ordonnancement.calendrier import Calendrier, resous_calendrier
+from ordonnancement.generateur import couches
+from mesure import chrono
+
+ECHANTILLON = 2_000
+
+
+def ajoute_pas_a_pas(calendrier: Calendrier, instant, duree):
+    """Même résultat que Calendrier.ajoute, période par période."""
+    travail = 0
+    for debut, fin in zip(calendrier.debuts, calendrier.fins):
+        if instant <= debut:
+            break
+        travail += min(instant, fin) - debut
+    travail += duree
+    for debut, fin in zip(calendrier.debuts, calendrier.fins):
+        if travail <= fin - debut:
+            return debut + travail
+        travail -= fin - debut
+    raise ValueError("Le calendrier s'arrête avant la fin du travail.")
+
+
+def main(taille: int = 100_000, annees: int = 10):
+    """Affiche les temps de résolution et de conversion."""
+    origine = date(2026, 1, 5)
+    jours = 365 * annees + annees // 4
+    feries = [
+        date(2026 + an, mois, jour)
+        for an in range(annees)
+        for mois, jour in ((1, 1), (5, 1), (7, 14), (12, 25))
+    ]
+    calendrier, construction = chrono(
+        Calendrier.hebdomadaire, origine, jours, feries=feries
+    )
+    continu = Calendrier.hebdomadaire(origine, jours, ((0, 24),), range(7))
+    # Couches de 70 tâches : le plan couvre plusieurs années du calendrier.
+    probleme = couches(taille, largeur=70)
+    print(
+        f"{taille} tâches, {len(calendrier)} périodes sur {annees} ans "
+        f"(index construit en {construction * 1e3:.1f} ms)"
+    )
+    _, natif = chrono(resous, probleme, moteur="natif", marges=True)
+    edt, global_ = chrono(resous_calendrier, probleme, calendrier, marges=True)
+    par_tache = {nom: continu for nom in list(probleme.noms)[::3]}
+    _, local = chrono(resous_calendrier, probleme, calendrier, par_tache, True)
+    fin = max(activite.fin for activite in edt.activites)
+    print(f"{'sans calendrier':>22} : {natif:6.2f} s")
+    print(f"{'un calendrier':>22} : {global_:6.2f} s")
+    print(f"{'calendrier par tâche':>22} : {local:6.2f} s")
+    print(f"{'fin du projet':>22} : {calendrier.date(fin):%Y-%m-%d %Hh}")
+
+    hasard = random.Random(0)
+    tirages = [
+        (hasard.uniform(0, 24 * jours / 2), hasard.randint(1, 80))
+        for _ in range(ECHANTILLON)
+    ]
+    resultats, dichotomie = chrono(
+        lambda: [calendrier.ajoute(instant, duree) for instant, duree in tirages]
+    )
+    attendus, parcours = chrono(
+        lambda: [ajoute_pas_a_pas(calendrier, *tirage) for tirage in tirages]
+    )
+    assert resultats == attendus
+    print(
+        f"{'conversions':>22} : {ECHANTILLON / dichotomie:12,.0f}/s par dichotomie, "
+        f"{ECHANTILLON / parcours:10,.0f}/s en parcourant les périodes"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Construction d'un grand problème à partir de colonnes.
+
+Compare Probleme(liste de Tache), qui crée une Tache par ligne puis vérifie
+tâche par tâche, à Probleme.par_colonnes et ProblemeCompact.par_colonnes,
+qui vérifient sur des tableaux NumPy et gardent les colonnes : les tâches
+ne sont créées qu'à la demande. La seconde colonne ajoute une résolution
+par le moteur natif, qui lit directement les colonnes mais crée toutes les
+tâches pour l'EDT.
+Usage : python benchmarks/bench_chargement.py [taille]
+"""
+import sys
+import time
+import numpy as np
+from ordonnancement import resous
+from ordonnancement.compact import ProblemeCompact
+from ordonnancement.generateur import aleatoire
+from ordonnancement.probleme import Probleme, Tache
+
+
+def main(taille: int = 1_000_000):
+    """Affiche le temps de construction de chaque méthode."""
+    taches = list(aleatoire(taille, degre=1.5).taches)
+    noms = np.array([tache.nom for tache in taches])
+    durees = np.array([tache.duree for tache in taches])
+    prerequis = [tache.prerequis for tache in taches]
+    aretes = np.array(
+        [(autre, tache.nom) for tache in taches for autre in tache.prerequis]
+    )
+    del taches
+    methodes = {
+        "Probleme(taches)": lambda: Probleme(
+            [
+                Tache(nom, duree, liste)
+                for nom, duree, liste in zip(noms.tolist(), durees.tolist(), prerequis)
+            ]
+        ),
+        "par_colonnes": lambda: Probleme.par_colonnes(noms, durees, prerequis),
+        "par_aretes": lambda: Probleme.par_aretes(noms, durees, aretes),
+        "compact": lambda: ProblemeCompact.par_colonnes(noms, durees, prerequis),
+    }
+    print(f"{taille} tâches, {len(aretes)} arêtes")
+    print(f"{'':>17} {'construction':>13} {'+ résolution':>13}")
+    for nom, methode in methodes.items():
+        depart = time.perf_counter()
+        probleme = methode()
+        construction = time.perf_counter() - depart
+        edt = resous(probleme, moteur="natif")
+        total = time.perf_counter() - depart
+        # Libérés hors de la mesure.
+        del probleme, edt
+        print(f"{nom:>17} {construction:>11.2f} s {total:>11.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,40 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Temps des k plus longs chemins sur une échelle.
+
+Une échelle de n barreaux a 2**n chemins : k_plus_longs_chemins n'en
+construit que k, son temps doit suivre k et non le nombre de chemins.
+Usage : python benchmarks/bench_chemins.py [barreaux]
+"""
+import sys
+import time
+from ordonnancement import Probleme
+from ordonnancement.chemins import chemins_critiques, k_plus_longs_chemins
+
+
+def echelle(barreaux: int) -> Probleme:
+    """Deux montants, chaque barreau précédé des deux tâches du précédent."""
+    lignes = ["G0 / 1 /", "D0 / 1 /"]
+    for barreau in range(1, barreaux):
+        precedents = f"G{barreau - 1} D{barreau - 1}"
+        lignes.append(f"G{barreau} / 2 / {precedents}")
+        lignes.append(f"D{barreau} / 1 / {precedents}")
+    return Probleme.par_str("\n".join(lignes))
+
+
+def main(barreaux: int = 40):
+    """Affiche le temps de calcul pour plusieurs valeurs de k."""
+    probleme = echelle(barreaux)
+    print(f"échelle de {barreaux} barreaux, 2**{barreaux} chemins")
+    for k in (10, 100, 1_000, 10_000):
+        depart = time.perf_counter()
+        k_plus_longs_chemins(probleme, k)
+        print(f"k = {k:>6} : {time.perf_counter() - depart:.3f} s")
+    depart = time.perf_counter()
+    chemins_critiques(probleme, limite=5)
+    print(f"chemins critiques : {time.perf_counter() - depart:.3f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Compare l'EDT d'objets Activite et l'EDT en colonnes NumPy.
+
+Pour chaque forme, mesure la mémoire allouée par la construction de l'EDT
+(tracemalloc, tâches du problème non comprises) et le temps des requêtes
+sur tout l'emploi du temps.
+Usage : python benchmarks/bench_colonnes.py [taille]
+"""
+import sys
+import tracemalloc
+from ordonnancement.algorithme import marges
+from ordonnancement.colonnes import resous_colonnes
+from ordonnancement.generateur import aleatoire
+from ordonnancement.moteur import resous_natif
+from mesure import chrono
+
+
+def construit(fonction, probleme):
+    """Résultat et octets encore alloués après la construction."""
+    tracemalloc.start()
+    resultat = fonction(probleme, marges=True)
+    octets = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultat, octets
+
+
+def main(taille: int = 1_000_000):
+    """Affiche mémoire par activité et temps des requêtes."""
+    probleme = aleatoire(taille, degre=1.5)
+    objets, octets_objets = construit(resous_natif, probleme)
+    colonnes, octets_colonnes = construit(resous_colonnes, probleme)
+    print(f"{taille} activités")
+    print(f"{'':>16} {'objets':>10} {'colonnes':>10}")
+    print(
+        f"{'octets/activité':>16} {octets_objets / taille:>10.1f} "
+        f"{octets_colonnes / taille:>10.1f}"
+    )
+    requetes = {
+        "est_valide": (objets.est_valide, colonnes.est_valide),
+        "marges": (lambda: marges(objets), colonnes.marges),
+        "marge_max": (objets.marge_max, colonnes.marge_max),
+        "chemin_critique": (objets.chemin_critique, colonnes.chemin_critique),
+        "ordonne": (lambda: objets.ordonne("mar"), lambda: colonnes.ordonne("mar")),
+    }
+    for nom, (sur_objets, sur_colonnes) in requetes.items():
+        _, sur_objets_s = chrono(sur_objets)
+        _, sur_colonnes_s = chrono(sur_colonnes)
+        print(f"{nom:>16} {sur_objets_s * 1e3:>8.1f}ms {sur_colonnes_s * 1e3:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,52 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mémoire par tâche du Probleme classique et du ProblemeCompact.
+
+Les deux problèmes sont lus depuis les mêmes lignes (par_flux) ; la mémoire
+retenue après construction est mesurée par tracemalloc, lignes non
+comprises. Les emplois du temps comparés sont l'EDT d'objets Activite et
+l'EDT en colonnes, dont les vues partagent l'identifiant des tâches.
+Usage : python benchmarks/bench_compact.py [taille]
+"""
+import gc
+import sys
+import tracemalloc
+from ordonnancement.colonnes import resous_colonnes
+from ordonnancement.compact import ProblemeCompact
+from ordonnancement.generateur import aleatoire
+from ordonnancement.moteur import resous_natif
+from ordonnancement.probleme import Probleme
+
+
+def retenu(fonction, *arguments):
+    """Résultat et octets encore alloués après l'appel."""
+    gc.collect()
+    tracemalloc.start()
+    resultat = fonction(*arguments)
+    gc.collect()
+    octets = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return resultat, octets
+
+
+def main(taille: int = 1_000_000):
+    """Affiche les octets par tâche et par activité."""
+    lignes = [
+        f"{tache.nom} / {tache.duree} / {' '.join(tache.prerequis)}"
+        for tache in aleatoire(taille, degre=1.5).taches
+    ]
+    print(f"{taille} tâches")
+    resultats = {}
+    for nom, classe in (("Probleme", Probleme), ("ProblemeCompact", ProblemeCompact)):
+        probleme, octets = retenu(classe.par_flux, lignes)
+        print(f"{nom:>16} {octets / taille:>8.1f} octets/tâche")
+        resultats[nom] = probleme
+    _, octets = retenu(resous_natif, resultats["Probleme"])
+    print(f"{'EDT Activite':>16} {octets / taille:>8.1f} octets/activité")
+    _, octets = retenu(resous_colonnes, resultats["ProblemeCompact"])
+    print(f"{'EDTColonnes':>16} {octets / taille:>8.1f} octets/activité")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure le coût de démarrage d'un processus qui résout un petit problème.
+
+Chaque mesure se fait dans un interpréteur neuf : temps d'import du
+paquet, temps de la première résolution, et liste des dépendances lourdes
+chargées, qui doit rester vide.
+Usage : python benchmarks/bench_demarrage.py [repetitions]
+"""
+import json
+import statistics
+import subprocess
+import sys
+
+MESURE = """
+import json, sys, time
+depart = time.perf_counter()
+from ordonnancement.probleme import Probleme
+from ordonnancement.algorithme import resous
+import_ = time.perf_counter() - depart
+depart = time.perf_counter()
+resous(Probleme.par_str("A / 1 /\\nB / 2 / A\\nC / 3 / A B"), moteur="natif")
+resolution = time.perf_counter() - depart
+lourds = [nom for nom in ("matplotlib", "rich", "networkx") if nom in sys.modules]
+print(json.dumps({"import": import_, "resolution": resolution, "lourds": lourds}))
+"""
+
+
+def mesure() -> dict:
+    """Une mesure dans un nouvel interpréteur."""
+    sortie = subprocess.run(
+        [sys.executable, "-c", MESURE],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(sortie)
+
+
+def main(repetitions: int = 10):
+    """Affiche les médianes et échoue si une dépendance lourde est chargée."""
+    mesures = [mesure() for _ in range(repetitions)]
+    for cle in ("import", "resolution"):
+        mediane = statistics.median(m[cle] for m in mesures)
+        print(f"{cle:>10} : {mediane * 1e3:8.2f} ms")
+    lourds = sorted({nom for m in mesures for nom in m["lourds"]})
+    print(f"{'lourds':>10} : {', '.join(lourds) or 'aucun'}")
+    if lourds:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
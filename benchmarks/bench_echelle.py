@@ -0,0 +1,178 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure le passage à l'échelle des fonctions publiques sur des problèmes
+synthétiques (voir ordonnancement.generateur).
+
+Pour chaque forme de graphe et chaque taille de l'échelle, chaque fonction
+est chronométrée puis relancée sous tracemalloc pour son pic mémoire, le
+cache des résolutions vidé avant chaque appel. Chaque mesure est
+interrompue au bout de son budget (SIGALRM) : la relance sous tracemalloc
+a le sien, et son dépassement ne retire que le pic. Une fonction n'est
+plus lancée dès que son temps, extrapolé linéairement à la taille
+suivante, dépasse le budget. Les résultats sont enregistrés en JSON
+pour comparer les runs.
+Usage : python benchmarks/bench_echelle.py --tailles 100 1000 --sortie r.json
+"""
+import argparse
+import datetime
+import json
+import platform
+import signal
+import sys
+import time
+import tracemalloc
+from ordonnancement.algorithme import max_fin, nom_fin, range_bis, resous
+from ordonnancement.cache import CACHE
+from ordonnancement.generateur import FORMES
+
+FONCTIONS = {
+    "resous_kahn": lambda probleme, edt: resous(probleme),
+    "resous_natif": lambda probleme, edt: resous(probleme, moteur="natif"),
+    "resous_marges": lambda probleme, edt: resous(
+        probleme, moteur="natif", marges=True
+    ),
+    "range_bis": lambda probleme, edt: range_bis(probleme),
+    "max_fin": lambda probleme, edt: max_fin(probleme),
+    "nom_fin": lambda probleme, edt: nom_fin(probleme),
+    "est_valide": lambda probleme, edt: edt.est_valide(),
+}
+
+
+class Depassement(Exception):
+    """Levée quand une mesure dépasse le budget."""
+
+
+def _interrompt(*_):
+    """Gestionnaire de SIGALRM."""
+    raise Depassement
+
+
+def _chronometre(fonction, probleme, edt, budget: float) -> float:
+    """Durée d'un appel en secondes ; Depassement au-delà du budget."""
+    CACHE.vide()
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        depart = time.perf_counter()
+        fonction(probleme, edt)
+        return time.perf_counter() - depart
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        CACHE.vide()
+
+
+def mesure(
+    fonction, probleme, edt, memoire: bool, budget: float, budget_memoire: float
+) -> dict:
+    """Durée en secondes et, si demandé, pic mémoire en octets.
+
+    Le cache des résolutions est vidé avant chaque appel : max_fin,
+    range_bis et nom_fin passent par lui, et un résultat déjà calculé
+    fausserait la durée comme le pic. La relance sous tracemalloc, plus
+    lente, a son propre budget : si elle le dépasse, seul le pic manque.
+    """
+    signal.signal(signal.SIGALRM, _interrompt)
+    try:
+        resultat = {"secondes": _chronometre(fonction, probleme, edt, budget)}
+    except Depassement:
+        return {"secondes": None, "depassement": True}
+    if memoire:
+        tracemalloc.start()
+        try:
+            _chronometre(fonction, probleme, edt, budget_memoire)
+            resultat["pic_octets"] = tracemalloc.get_traced_memory()[1]
+        except Depassement:
+            resultat["pic_depassement"] = True
+        finally:
+            tracemalloc.stop()
+    return resultat
+
+
+def lance(
+    formes, tailles, fonctions, budget: float, memoire: bool, budget_memoire: float
+) -> list:
+    """Parcourt formes × tailles × fonctions et renvoie les lignes mesurées."""
+    lignes = []
+    for forme in formes:
+        trop_lentes = set()
+        for rang, taille in enumerate(tailles):
+            suivante = tailles[rang + 1] if rang + 1 < len(tailles) else taille
+            probleme = FORMES[forme](taille)
+            edt = resous(probleme, moteur="natif")
+            for nom in fonctions:
+                if nom in trop_lentes:
+                    continue
+                ligne = {"forme": forme, "taille": taille, "fonction": nom}
+                ligne.update(
+                    mesure(
+                        FONCTIONS[nom], probleme, edt, memoire, budget, budget_memoire
+                    )
+                )
+                lignes.append(ligne)
+                if ligne["secondes"] is None:
+                    print(f"{forme:>10} {taille:>8} {nom:>16} > budget")
+                    trop_lentes.add(nom)
+                    continue
+                pic = (
+                    f"{ligne['pic_octets'] / 2**20:>9.1f} Mio"
+                    if "pic_octets" in ligne
+                    else f"{'> budget' if memoire else '':>13}"
+                )
+                print(
+                    f"{forme:>10} {taille:>8} {nom:>16} "
+                    f"{ligne['secondes']:>9.3f} s {pic}",
+                    flush=True,
+                )
+                if ligne["secondes"] * suivante / taille > budget:
+                    trop_lentes.add(nom)
+    return lignes
+
+
+def main():
+    """Point d'entrée."""
+    parseur = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parseur.add_argument("--formes", nargs="+", default=list(FORMES))
+    parseur.add_argument(
+        "--tailles",
+        nargs="+",
+        type=int,
+        default=[10**puissance for puissance in range(2, 7)],
+    )
+    parseur.add_argument("--fonctions", nargs="+", default=list(FONCTIONS))
+    parseur.add_argument("--budget", type=float, default=10.0)
+    parseur.add_argument(
+        "--budget-memoire",
+        type=float,
+        default=None,
+        help="budget de la relance sous tracemalloc (défaut : 5 × budget)",
+    )
+    parseur.add_argument("--sans-memoire", action="store_true")
+    parseur.add_argument("--sortie", default="bench_resultats.json")
+    arguments = parseur.parse_args()
+    budget_memoire = arguments.budget_memoire or 5 * arguments.budget
+
+    lignes = lance(
+        arguments.formes,
+        arguments.tailles,
+        arguments.fonctions,
+        arguments.budget,
+        not arguments.sans_memoire,
+        budget_memoire,
+    )
+    with open(arguments.sortie, "w", encoding="utf-8") as fichier:
+        json.dump(
+            {
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "plateforme": platform.platform(),
+                "budget": arguments.budget,
+                "budget_memoire": budget_memoire,
+                "mesures": lignes,
+            },
+            fichier,
+            indent=1,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure le passage à l'échelle de resous et EDT.est_valide.
+
+Avec l'index des noms de l'EDT, le temps par tâche doit rester à peu près
+constant quand la taille du problème est multipliée par 10.
+Usage : python benchmarks/bench_edt.py [taille_max]
+"""
+import sys
+from ordonnancement import resous
+from ordonnancement.generateur import aleatoire
+from mesure import chrono
+
+
+def main(taille_max: int = 100_000):
+    """Affiche le temps total et par tâche pour chaque taille."""
+    print(f"{'taille':>8} {'mesure':>12} {'total (s)':>10} {'µs/tâche':>9}")
+    taille = 1_000
+    while taille <= taille_max:
+        probleme = aleatoire(taille, degre=1.5)
+        for moteur in ("kahn", "natif"):
+            edt, duree = chrono(resous, probleme, moteur=moteur)
+            print(f"{taille:>8} {moteur:>12} {duree:>10.3f} {duree / taille * 1e6:>9.2f}")
+        valide, duree = chrono(edt.est_valide)
+        assert valide
+        print(f"{taille:>8} {'est_valide':>12} {duree:>10.3f} {duree / taille * 1e6:>9.2f}")
+        taille *= 10
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,50 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Compare la table rich complète à l'export en flux et à l'affichage paginé.
+
+Pour chaque méthode, mesure le temps et le pic de mémoire (tracemalloc)
+de la sortie de tout l'EDT vers /dev/null.
+Usage : python benchmarks/bench_export.py [taille]
+"""
+import os
+import sys
+import time
+import tracemalloc
+from rich.console import Console
+from ordonnancement.export import ecrit, table
+from ordonnancement.generateur import aleatoire
+from ordonnancement.moteur import resous_natif
+
+
+def mesure(fonction):
+    """Durée en secondes et pic de mémoire en Mo."""
+    tracemalloc.start()
+    depart = time.perf_counter()
+    fonction()
+    duree = time.perf_counter() - depart
+    pic = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duree, pic / 2**20
+
+
+def main(taille: int = 20_000):
+    """Affiche temps et pic de mémoire par méthode."""
+    edt = resous_natif(aleatoire(taille, degre=1.5), marges=True)
+    colonnes = ["tache", "debut", "fin", "dta", "marge"]
+    with open(os.devnull, "w", encoding="utf-8") as nul:
+        console = Console(file=nul, width=120)
+        methodes = {
+            "table rich": lambda: console.print(edt.genere_table_mar()),
+            "page rich (50)": lambda: console.print(table(edt, colonnes, 0, 50)),
+            "csv": lambda: ecrit(edt, nul, "csv", colonnes),
+            "jsonl": lambda: ecrit(edt, nul, "jsonl", colonnes),
+        }
+        print(f"{taille} activités")
+        for nom, methode in methodes.items():
+            duree, pic = mesure(methode)
+            print(f"{nom:>15} {duree:>8.3f} s {pic:>9.1f} Mo")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
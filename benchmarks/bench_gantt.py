@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Temps de rendu du diagramme de Gantt.
+
+Compare l'ancien tracé (un appel à plot par activité, limité aux petites
+tailles) au tracé par collections de gantt.enregistre, en PNG et en SVG.
+Usage : python benchmarks/bench_gantt.py [taille ...]
+"""
+import os
+import sys
+import tempfile
+from matplotlib.figure import Figure
+from ordonnancement.gantt import enregistre
+from ordonnancement.generateur import aleatoire
+from ordonnancement.moteur import resous_natif
+from mesure import chrono
+
+ANCIEN_MAX = 10_000
+
+
+def ancien(edt, chemin: str):
+    """Tracé d'avant le module gantt : un Line2D par activité."""
+    repere = Figure().add_subplot()
+    for indice, activite in enumerate(edt.activites):
+        repere.plot(
+            [activite.debut, activite.fin], [-indice, -indice], color="blue", linewidth=2
+        )
+    repere.figure.savefig(chemin)
+
+
+def main(*tailles: int):
+    """Affiche les temps de rendu par taille et par format."""
+    print(f"{'taille':>8} {'ancien png':>11} {'png':>9} {'svg':>9}")
+    with tempfile.TemporaryDirectory() as dossier:
+        png = os.path.join(dossier, "gantt.png")
+        svg = os.path.join(dossier, "gantt.svg")
+        for taille in tailles or (1_000, 10_000, 100_000, 1_000_000):
+            edt = resous_natif(aleatoire(taille, degre=1.5), marges=True)
+            reference = (
+                f"{chrono(ancien, edt, png)[1] * 1e3:>9.0f}ms"
+                if taille <= ANCIEN_MAX
+                else f"{'-':>11}"
+            )
+            _, en_png = chrono(enregistre, edt, png)
+            _, en_svg = chrono(enregistre, edt, svg)
+            print(
+                f"{taille:>8} {reference} {en_png * 1e3:>7.0f}ms "
+                f"{en_svg * 1e3:>7.0f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
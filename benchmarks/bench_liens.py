@@ -0,0 +1,46 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Liens typés résolus par le moteur natif face au codage en tâches fictives.
+
+La moitié des arêtes d'un graphe aléatoire reçoit un lien FS ou SS avec
+un décalage de 0 à 3. Le codage sans liens typés ajoute un jalon par
+tâche et une tâche par décalage non nul : le graphe grossit, et il faut
+le construire. Les dates des tâches d'origine sont vérifiées égales. La
+dernière ligne donne le même graphe sans aucun lien typé.
+Usage : python benchmarks/bench_liens.py [taille]
+"""
+import sys
+from ordonnancement import resous
+from ordonnancement.generateur import aleatoire, avec_liens, taches_fictives
+from mesure import chrono
+
+
+def main(taille: int = 200_000):
+    """Affiche les temps de codage et de résolution."""
+    simple = aleatoire(taille, graine=1)
+    probleme = avec_liens(simple, types=("FS", "SS"), decalages=range(4))
+    fictif, codage = chrono(taches_fictives, probleme)
+    print(
+        f"{taille} tâches ; codage fictif : {len(fictif)} tâches, "
+        f"construit en {codage:.2f} s"
+    )
+    print(f"{'':>16} {'sans marges':>12} {'avec marges':>12}")
+    resultats = {}
+    for nom, source in (("liens typés", probleme), ("tâches fictives", fictif)):
+        resultats[nom], avant = chrono(resous, source, moteur="natif")
+        _, complet = chrono(resous, source, moteur="natif", marges=True)
+        print(f"{nom:>16} {avant:>11.2f}s {complet:>11.2f}s")
+    fictives = resultats["tâches fictives"]
+    assert all(
+        (activite.debut, activite.fin)
+        == (fictives[activite.tache.nom].debut, fictives[activite.tache.nom].fin)
+        for activite in resultats["liens typés"].activites
+    )
+    _, avant = chrono(resous, simple, moteur="natif")
+    _, complet = chrono(resous, simple, moteur="natif", marges=True)
+    print(f"{'sans lien typé':>16} {avant:>11.2f}s {complet:>11.2f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
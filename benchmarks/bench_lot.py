@@ -0,0 +1,93 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure l'accélération de la résolution par lots selon le nombre de
+processus.
+
+Un dossier temporaire est rempli de fichiers de problèmes aléatoires, puis
+résolu avec 1, 2, 4... processus jusqu'au nombre de processeurs. Les mêmes
+problèmes, en mémoire, passent ensuite par resous_lot, qui rend des EDT ou
+des EDTColonnes ; la part séquentielle du processus appelant (colonnes à
+envoyer, résultats à assembler) est mesurée à part.
+Usage : python benchmarks/bench_lot.py [fichiers] [taches_par_fichier]
+"""
+import os
+import sys
+import tempfile
+import time
+from ordonnancement.generateur import aleatoire
+from ordonnancement.colonnes import EDTColonnes
+from ordonnancement.lot import _csr, resous_dossier, resous_lot
+from ordonnancement.moteur import assemble, calcule
+
+
+def ecrit_lot(dossier: str, fichiers: int, taille: int):
+    """Ecrit les fichiers au format nom / durée / prérequis."""
+    for numero in range(fichiers):
+        probleme = aleatoire(taille, graine=numero, melange=True)
+        chemin = os.path.join(dossier, f"projet{numero:05}.txt")
+        with open(chemin, "w", encoding="utf-8") as fichier:
+            for tache in probleme.taches:
+                prerequis = " ".join(tache.prerequis)
+                fichier.write(f"{tache.nom} / {tache.duree} / {prerequis}\n")
+
+
+def sequentiel(problemes: list) -> None:
+    """Affiche la part de resous_lot qui reste dans le processus appelant."""
+    depart = time.perf_counter()
+    envois = [_csr(probleme) for probleme in problemes]
+    envoi = time.perf_counter() - depart
+    compacts = [calcule(probleme, marges=True) for probleme in problemes]
+    calcul = time.perf_counter() - depart - envoi
+    depart = time.perf_counter()
+    for probleme, (ordre, dates) in zip(problemes, compacts):
+        assemble(list(probleme.taches), ordre, dates)
+    assemblage = time.perf_counter() - depart
+    depart = time.perf_counter()
+    for probleme, (_, _, debuts, prerequis, _), (ordre, dates) in zip(
+        problemes, envois, compacts
+    ):
+        EDTColonnes.depuis_calcul(probleme, debuts, prerequis, ordre, dates)
+    enveloppe = time.perf_counter() - depart
+    print(
+        f"calcul {calcul:.2f} s ; appelant : colonnes {envoi:.2f} s, "
+        f"EDT {assemblage:.2f} s ou EDTColonnes {enveloppe:.2f} s"
+    )
+
+
+def main(fichiers: int = 200, taille: int = 5_000):
+    """Affiche temps et accélération pour chaque nombre de processus."""
+    with tempfile.TemporaryDirectory() as dossier:
+        ecrit_lot(dossier, fichiers, taille)
+        reference = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            depart = time.perf_counter()
+            resous_dossier(dossier, workers=workers)
+            duree = time.perf_counter() - depart
+            reference = reference or duree
+            print(
+                f"{workers:>3} processus : {duree:7.2f} s, "
+                f"accélération {reference / duree:5.2f}"
+            )
+            workers *= 2
+    problemes = [aleatoire(taille, graine=numero) for numero in range(fichiers)]
+    sequentiel(problemes)
+    for colonnes in (False, True):
+        reference = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            depart = time.perf_counter()
+            resous_lot(problemes, workers=workers, marges=True, colonnes=colonnes)
+            duree = time.perf_counter() - depart
+            reference = reference or duree
+            print(
+                f"resous_lot{' (colonnes)' if colonnes else ''}, "
+                f"{workers:>3} processus : {duree:7.2f} s, "
+                f"accélération {reference / duree:5.2f}"
+            )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Moteur natif et moteur par niveaux sur des graphes larges et peu profonds.
+
+Chaque niveau compte largeur tâches ; chaque tâche a deux prérequis tirés
+au hasard dans le niveau précédent. Le problème est construit par
+ProblemeCompact.par_aretes. La construction du graphe CSR et les
+deux passes sont mesurées à part.
+Usage : python benchmarks/bench_niveaux.py [largeur] [profondeur]
+"""
+import os
+import sys
+import numpy as np
+from ordonnancement.compact import ProblemeCompact
+from ordonnancement.moteur import GrapheCompact, calcule, passe_arriere, passe_avant
+from ordonnancement.niveaux import GrapheNumpy, calcule_niveaux
+from mesure import chrono
+
+
+def large(largeur: int, profondeur: int, graine: int = 0) -> ProblemeCompact:
+    """Problème de profondeur niveaux de largeur tâches."""
+    hasard = np.random.default_rng(graine)
+    taille = largeur * profondeur
+    noms = np.char.add("T", np.arange(taille).astype(str))
+    taches = np.repeat(np.arange(largeur, taille), 2)
+    niveau = taches // largeur
+    prerequis = (niveau - 1) * largeur + hasard.integers(0, largeur, len(taches))
+    aretes = np.stack([noms[prerequis], noms[taches]], axis=1)
+    return ProblemeCompact.par_aretes(noms, hasard.integers(1, 10, taille), aretes)
+
+
+def passes_natives(graphe: GrapheCompact):
+    """Passes avant et arrière du moteur natif."""
+    ordre, debut, fin = passe_avant(graphe)
+    passe_arriere(graphe, ordre, debut, fin)
+
+
+def main(largeur: int = 200_000, profondeur: int = 5):
+    """Affiche les temps des deux moteurs, avec marges."""
+    probleme = large(largeur, profondeur)
+    print(f"{profondeur} niveaux de {largeur} tâches")
+    print(f"{'':>22} {'graphe':>8} {'passes':>8} {'total':>8}")
+    graphe, construction = chrono(GrapheCompact, probleme)
+    _, passes = chrono(passes_natives, graphe)
+    _, total = chrono(calcule, probleme, True)
+    print(f"{'natif':>22} {construction:>7.2f}s {passes:>7.2f}s {total:>7.2f}s")
+    _, construction = chrono(GrapheNumpy, probleme)
+    for nombre in sorted({1, os.cpu_count() or 1}):
+        _, total = chrono(calcule_niveaux, probleme, True, nombre)
+        print(
+            f"{f'niveaux ({nombre} thread(s))':>22} {construction:>7.2f}s "
+            f"{total - construction:>7.2f}s {total:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,57 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Portefeuille : résolution combinée face à la résolution incrémentale.
+
+Chaque projet attend deux tâches de projets tirés parmi les précédents.
+Après une première résolution, une durée est modifiée dans le dernier,
+le projet du milieu puis le premier projet : la résolution incrémentale
+ne reprend que le projet modifié et les projets aval touchés, la
+résolution combinée reprend tout le portefeuille.
+Usage : python benchmarks/bench_portefeuille.py [projets] [taille]
+"""
+import random
+import sys
+from ordonnancement.generateur import aleatoire
+from ordonnancement.portefeuille import Portefeuille
+from mesure import chrono
+
+
+def portefeuille(projets: int, taille: int, graine: int = 0) -> Portefeuille:
+    """Projets aléatoires liés à des projets précédents."""
+    hasard = random.Random(graine)
+    resultat = Portefeuille(
+        {f"P{numero}": aleatoire(taille, graine=numero) for numero in range(projets)}
+    )
+    for numero in range(1, projets):
+        for _ in range(2):
+            amont = hasard.randrange(max(0, numero - 10), numero)
+            resultat.lie(
+                f"P{numero}:T{hasard.randrange(taille)}",
+                f"P{amont}:T{hasard.randrange(taille // 2, taille)}",
+            )
+    return resultat
+
+
+def main(projets: int = 200, taille: int = 2_000):
+    """Affiche les temps des deux résolutions après chaque modification."""
+    lot = portefeuille(projets, taille)
+    print(f"{projets} projets de {taille} tâches")
+    print(f"{'modification':>14} {'combinée':>10} {'incrémentale':>13} {'projets':>8}")
+    _, incrementale = chrono(lot.rafraichit)
+    _, combinee = chrono(lot.resous)
+    print(f"{'aucune':>14} {combinee:>9.3f}s {incrementale:>12.3f}s {projets:>8}")
+    for projet in (f"P{projets - 1}", f"P{projets // 2}", "P0"):
+        probleme = lot[projet]
+        tache = next(tache for tache in probleme.taches if not tache.prerequis)
+        probleme.modifie_duree(tache.nom, tache.duree + 50)
+        resolus, incrementale = chrono(lot.rafraichit)
+        _, combinee = chrono(lot.resous)
+        print(
+            f"{projet:>14} {combinee:>9.3f}s {incrementale:>12.3f}s "
+            f"{len(resolus):>8}"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
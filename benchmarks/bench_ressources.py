@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mesure l'ordonnancement sous contraintes de ressources.
+
+Chaque tâche d'un problème aléatoire demande une à trois ressources parmi
+un nombre donné ; les capacités sont tirées pour que les ressources soient
+disputées. Chaque schéma est chronométré avec chaque règle de priorité.
+Usage : python benchmarks/bench_ressources.py [taches] [ressources]
+"""
+import random
+import sys
+import time
+from dataclasses import replace
+from ordonnancement.probleme import Probleme
+from ordonnancement.generateur import aleatoire
+from ordonnancement.ressources import REGLES, SCHEMAS, resous_ressources
+
+
+def avec_ressources(taille: int, nombre: int, graine: int = 0) -> Probleme:
+    """Problème aléatoire dont les tâches se disputent nombre ressources."""
+    hasard = random.Random(graine)
+    noms = [f"R{r}" for r in range(nombre)]
+    capacites = {nom: hasard.randint(3, 10) for nom in noms}
+    taches = dict()
+    for tache in aleatoire(taille, graine=graine).taches:
+        demandes = {
+            nom: hasard.randint(1, capacites[nom])
+            for nom in hasard.sample(noms, hasard.randint(1, 3))
+        }
+        taches[tache.nom] = replace(tache, ressources=demandes)
+    return Probleme._depuis_dict(taches, capacites)
+
+
+def main(taille: int = 50_000, nombre: int = 30):
+    """Affiche durée de calcul et durée du projet par schéma et règle."""
+    probleme = avec_ressources(taille, nombre)
+    print(f"{taille} tâches, {nombre} ressources")
+    for schema in SCHEMAS:
+        for regle in REGLES:
+            depart = time.perf_counter()
+            edt = resous_ressources(probleme, schema=schema, regle=regle)
+            duree = time.perf_counter() - depart
+            fin = max(activite.fin for activite in edt.activites)
+            print(f"{schema:>10} {regle:>7} {duree:8.2f} s   durée du projet {fin}")
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
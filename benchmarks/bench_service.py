@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Latence et débit du service local, face à une lecture et une résolution
+par demande.
+
+Le service tourne dans un processus à part, sur une socket Unix. Des
+clients simultanés, chacun sur sa connexion, envoient des plans tirés
+parmi quelques plans distincts : la plupart des demandes portent sur les
+mêmes plans, comme quand plusieurs outils interrogent le même projet. La
+référence lit et résout chaque demande (Probleme.par_str puis moteur
+natif), sans rien garder d'une demande à l'autre.
+Usage : python benchmarks/bench_service.py [clients] [demandes] [taille]
+"""
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import List
+from ordonnancement import Probleme, resous
+from ordonnancement.generateur import aleatoire
+from ordonnancement.service import Client, sert
+
+PLANS = 8
+
+
+def texte(probleme: Probleme) -> str:
+    """Problème au format de Probleme.par_str."""
+    return "\n".join(
+        f"{tache.nom} / {tache.duree} / {' '.join(tache.prerequis)}"
+        for tache in probleme.taches
+    )
+
+
+def tirages(clients: int, demandes: int, plans: List[str]) -> List[List[str]]:
+    """Plans demandés par chaque client ; la moitié porte sur le premier."""
+    hasard = random.Random(0)
+    return [
+        [
+            plans[0] if hasard.random() < 0.5 else hasard.choice(plans)
+            for _ in range(demandes)
+        ]
+        for _ in range(clients)
+    ]
+
+
+def quantiles(latences: List[float]) -> str:
+    """p50 et p99 en millisecondes."""
+    centiles = statistics.quantiles(latences, n=100)
+    return f"p50 {centiles[49] * 1e3:7.2f} ms, p99 {centiles[98] * 1e3:7.2f} ms"
+
+
+async def client(chemin: str, plans: List[str], latences: List[float]):
+    """Envoie les plans un par un sur une connexion."""
+    async with Client(socket=chemin) as connexion:
+        for plan in plans:
+            depart = time.perf_counter()
+            await connexion.resous(plan, marges=True)
+            latences.append(time.perf_counter() - depart)
+
+
+async def charge(chemin: str, demandes: List[List[str]]) -> List[float]:
+    """Lance tous les clients ensemble ; latences de toutes les demandes."""
+    for _ in range(100):
+        if os.path.exists(chemin):
+            break
+        await asyncio.sleep(0.05)
+    latences: List[float] = []
+    await asyncio.gather(*(client(chemin, plans, latences) for plans in demandes))
+    return latences
+
+
+def main(clients: int = 32, demandes: int = 50, taille: int = 2_000):
+    """Affiche latences et débits des deux façons de faire."""
+    plans = [texte(aleatoire(taille, graine=graine)) for graine in range(PLANS)]
+    demandes_clients = tirages(clients, demandes, plans)
+    total = clients * demandes
+    print(f"{clients} clients x {demandes} demandes, {PLANS} plans de {taille} tâches")
+
+    latences = []
+    depart = time.perf_counter()
+    for plans_client in demandes_clients:
+        for plan in plans_client:
+            debut = time.perf_counter()
+            resous(Probleme.par_str(plan), moteur="natif", marges=True)
+            latences.append(time.perf_counter() - debut)
+    duree = time.perf_counter() - depart
+    print(
+        f"{'lecture et résolution':>22} : {total / duree:8.1f} demandes/s, "
+        f"{quantiles(latences)}"
+    )
+
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin = os.path.join(dossier, "service.sock")
+        serveur = multiprocessing.Process(target=sert, args=(chemin,))
+        serveur.start()
+        try:
+            depart = time.perf_counter()
+            latences = asyncio.run(charge(chemin, demandes_clients))
+            duree = time.perf_counter() - depart
+        finally:
+            serveur.terminate()
+            serveur.join()
+    print(
+        f"{'service':>22} : {total / duree:8.1f} demandes/s, {quantiles(latences)}"
+        " (démarrage compris)"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:]))
@@ -0,0 +1,16 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Outils communs aux benchmarks.
+
+Les scripts sont lancés comme ``python benchmarks/bench_x.py`` : leur
+dossier est dans sys.path et ce module s'importe directement.
+"""
+import time
+
+
+def chrono(fonction, *arguments, **options):
+    """Renvoie le résultat et la durée d'exécution en secondes."""
+    depart = time.perf_counter()
+    resultat = fonction(*arguments, **options)
+    return resultat, time.perf_counter() - depart
@@ -0,0 +1,311 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Format binaire compact pour les problèmes et les emplois du temps.
+
+Un fichier contient, après une entête, des sections alignées sur 8 octets :
+- la table des noms (positions puis octets UTF-8), chaque nom n'y figurant
+  qu'une fois ;
+- les durées ;
+- les prérequis au format CSR (positions puis indices dans la table) ;
+- pour un EDT, les colonnes debut, fin, dta, mar et marge_libre.
+
+``ouvre`` projette le fichier en mémoire avec mmap : rien n'est lu tant
+qu'une section n'est pas consultée.
+"""
+import mmap
+import struct
+import sys
+from array import array
+from os import PathLike
+from typing import Dict, Iterable, List, Optional, Union
+from .probleme import Nom, Probleme, Tache
+from .edt import Activite, EDT
+
+MAGIQUE = b"ORDO"
+VERSION = 1
+ENTETE = struct.Struct("<4sHccB7xQQQ")
+COLONNES = ("debut", "fin", "dta", "mar", "marge_libre")
+Chemin = Union[str, PathLike]
+
+
+def _code(valeurs: Iterable) -> str:
+    """Entiers 64 bits si possible, sinon flottants."""
+    return "q" if all(isinstance(valeur, int) for valeur in valeurs) else "d"
+
+
+def _arrondi(taille: int) -> int:
+    """Taille complétée jusqu'au multiple de 8 suivant."""
+    return taille + (-taille % 8)
+
+
+def _ecrit(fichier, donnees: Union[array, bytes]):
+    """Ecrit une section et complète jusqu'au multiple de 8 suivant."""
+    if isinstance(donnees, array):
+        donnees.tofile(fichier)
+        taille = len(donnees) * donnees.itemsize
+    else:
+        fichier.write(donnees)
+        taille = len(donnees)
+    fichier.write(bytes(-taille % 8))
+
+
+def sauve(objet: Union[Probleme, EDT], chemin: Chemin):
+    """Enregistre un Probleme ou un EDT au format binaire.
+
+    Pour un EDT, les tâches sont rangées dans l'ordre des activités et
+    tous les prérequis doivent avoir une activité. Les liens typés, les
+    lois, les ressources et les capacités ne sont pas enregistrés : un
+    problème ou une tâche qui en a est refusé plutôt que perdu en silence.
+    """
+    if isinstance(objet, EDT):
+        activites = list(objet.activites)
+        taches = [activite.tache for activite in activites]
+    elif isinstance(objet, Probleme):
+        activites = None
+        taches = list(objet.taches)
+        if objet.capacites:
+            raise ValueError("Capacités absentes du format binaire.")
+    else:
+        raise TypeError("Seuls Probleme et EDT peuvent être enregistrés.")
+
+    indices = {tache.nom: indice for indice, tache in enumerate(taches)}
+    encodes = [tache.nom.encode("utf-8") for tache in taches]
+    positions_noms = array("q", [0])
+    for encode in encodes:
+        positions_noms.append(positions_noms[-1] + len(encode))
+    code_durees = _code(tache.duree for tache in taches)
+    durees = array(code_durees, (tache.duree for tache in taches))
+    positions = array("q", [0])
+    prerequis = array("q")
+    for tache in taches:
+        if tache.liens:
+            raise ValueError(f"{tache.nom} : liens typés absents du format binaire.")
+        if tache.loi is not None or tache.ressources:
+            raise ValueError(
+                f"{tache.nom} : loi et ressources absentes du format binaire."
+            )
+        for nom in tache.prerequis:
+            if nom not in indices:
+                raise ValueError(f"{nom} n'a pas d'activité dans l'EDT.")
+            prerequis.append(indices[nom])
+        positions.append(len(prerequis))
+
+    code_colonnes = "q"
+    if activites is not None:
+        code_colonnes = _code(
+            getattr(activite, colonne)
+            for activite in activites
+            for colonne in COLONNES
+        )
+    entete = ENTETE.pack(
+        MAGIQUE,
+        VERSION,
+        code_durees.encode(),
+        code_colonnes.encode(),
+        (activites is not None) | (sys.byteorder == "big") << 1,
+        len(taches),
+        len(prerequis),
+        positions_noms[-1],
+    )
+    with open(chemin, "wb") as fichier:
+        fichier.write(entete)
+        _ecrit(fichier, positions_noms)
+        _ecrit(fichier, b"".join(encodes))
+        _ecrit(fichier, durees)
+        _ecrit(fichier, positions)
+        _ecrit(fichier, prerequis)
+        if activites is not None:
+            for colonne in COLONNES:
+                _ecrit(
+                    fichier,
+                    array(
+                        code_colonnes,
+                        (getattr(activite, colonne) for activite in activites),
+                    ),
+                )
+
+
+class Conteneur:
+    """Fichier binaire ouvert avec mmap.
+
+    Les sections sont exposées comme des memoryview sans copie ; les
+    objets Tache et Activite ne sont créés qu'à la demande.
+    Exemple:
+    >>> import os, tempfile
+    >>> probleme = Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... '''
+    ... )
+    >>> chemin = os.path.join(tempfile.mkdtemp(), "probleme.ordo")
+    >>> sauve(probleme, chemin)
+    >>> with ouvre(chemin) as conteneur:
+    ...     print(len(conteneur), conteneur.nom(2), list(conteneur.prerequis_de(2)))
+    ...     conteneur.probleme() == probleme
+    3 C [0, 1]
+    True
+    """
+
+    def __init__(self, chemin: Chemin):
+        """Projette le fichier, vérifie sa taille et découpe les sections."""
+        with open(chemin, "rb") as fichier:
+            try:
+                self._carte = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Fichier vide : mmap refuse de le projeter.
+                raise ValueError("Ce fichier n'est pas au format attendu.") from None
+        self._vues: List[memoryview] = [memoryview(self._carte)]
+        if len(self._carte) < ENTETE.size:
+            self._refuse("Ce fichier n'est pas au format attendu.")
+        (
+            magique,
+            version,
+            code_durees,
+            code_colonnes,
+            drapeaux,
+            self._taille,
+            aretes,
+            taille_noms,
+        ) = ENTETE.unpack_from(self._vues[0])
+        if magique != MAGIQUE or version != VERSION:
+            self._refuse("Ce fichier n'est pas au format attendu.")
+        if bool(drapeaux & 2) != (sys.byteorder == "big"):
+            self._refuse("Le fichier a été écrit avec un autre boutisme.")
+        if not {code_durees, code_colonnes} <= {b"q", b"d"}:
+            self._refuse("Ce fichier n'est pas au format attendu.")
+        taille = self._taille
+        sections = [
+            (taille + 1, "q"),
+            (taille_noms, "B"),
+            (taille, code_durees.decode()),
+            (taille + 1, "q"),
+            (aretes, "q"),
+        ]
+        if drapeaux & 1:
+            sections += [(taille, code_colonnes.decode())] * len(COLONNES)
+        # Toutes les sections annoncées par l'entête doivent être présentes.
+        attendu = ENTETE.size + sum(
+            _arrondi(nombre * struct.calcsize(code)) for nombre, code in sections
+        )
+        if len(self._carte) < attendu:
+            self._refuse("Ce fichier n'est pas au format attendu.")
+
+        self._curseur = ENTETE.size
+        (
+            self._positions_noms,
+            self._octets_noms,
+            self.durees,
+            self.positions,
+            self.prerequis,
+            *colonnes,
+        ) = (self._section(nombre, code) for nombre, code in sections)
+        self.colonnes: Optional[Dict[str, memoryview]] = None
+        if colonnes:
+            self.colonnes = dict(zip(COLONNES, colonnes))
+        self._noms: Dict[int, Nom] = dict()
+
+    def _refuse(self, message: str):
+        """Ferme la projection et lève ValueError."""
+        for vue in reversed(self._vues):
+            vue.release()
+        self._carte.close()
+        raise ValueError(message)
+
+    def _section(self, nombre: int, code: str) -> memoryview:
+        """Vue typée sur la section suivante."""
+        taille = nombre * struct.calcsize(code)
+        debut = self._curseur
+        self._curseur += _arrondi(taille)
+        section = self._vues[0][debut : debut + taille].cast(code)
+        self._vues.append(section)
+        return section
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return self._taille
+
+    def nom(self, indice: int) -> Nom:
+        """Nom de la tâche d'indice donné, décodé une seule fois."""
+        if indice not in self._noms:
+            debut = self._positions_noms[indice]
+            fin = self._positions_noms[indice + 1]
+            self._noms[indice] = sys.intern(
+                bytes(self._octets_noms[debut:fin]).decode("utf-8")
+            )
+        return self._noms[indice]
+
+    def prerequis_de(self, indice: int) -> memoryview:
+        """Indices des prérequis d'une tâche."""
+        return self.prerequis[self.positions[indice] : self.positions[indice + 1]]
+
+    def tache(self, indice: int) -> Tache:
+        """Crée la Tache d'indice donné."""
+        return Tache(
+            nom=self.nom(indice),
+            duree=self.durees[indice],
+            prerequis=[self.nom(autre) for autre in self.prerequis_de(indice)],
+        )
+
+    def noms(self) -> List[Nom]:
+        """Tous les noms, décodés d'un bloc."""
+        octets = bytes(self._octets_noms)
+        positions = self._positions_noms.tolist()
+        return [
+            sys.intern(octets[debut:fin].decode("utf-8"))
+            for debut, fin in zip(positions, positions[1:])
+        ]
+
+    def probleme(self) -> Probleme:
+        """Crée le Probleme, dont les tâches sont créées à la demande.
+
+        Les sections sont copiées en colonnes CSR (voir
+        Probleme._depuis_csr) : le problème survit à la fermeture du fichier.
+        """
+        return Probleme._depuis_csr(
+            self.noms(),
+            self.durees.tolist(),
+            self.positions.tolist(),
+            self.prerequis.tolist(),
+        )
+
+    def edt(self) -> EDT:
+        """Crée l'EDT complet."""
+        if self.colonnes is None:
+            raise ValueError("Ce fichier ne contient pas d'emploi du temps.")
+        taches = list(self.probleme().taches)
+        colonnes = [self.colonnes[colonne].tolist() for colonne in COLONNES]
+        return EDT(
+            activites=[
+                Activite(tache, *dates) for tache, dates in zip(taches, zip(*colonnes))
+            ]
+        )
+
+    def ferme(self):
+        """Libère les vues puis la projection."""
+        for vue in reversed(self._vues):
+            vue.release()
+        self._vues = []
+        self._carte.close()
+
+    def __enter__(self) -> "Conteneur":
+        """Gestionnaire de contexte."""
+        return self
+
+    def __exit__(self, *erreur):
+        """Ferme le fichier."""
+        self.ferme()
+
+
+def ouvre(chemin: Chemin) -> Conteneur:
+    """Ouvre un fichier binaire sans le lire."""
+    return Conteneur(chemin)
+
+
+def charge(chemin: Chemin) -> Union[Probleme, EDT]:
+    """Relit un fichier binaire en Probleme ou en EDT selon son contenu."""
+    with ouvre(chemin) as conteneur:
+        if conteneur.colonnes is None:
+            return conteneur.probleme()
+        return conteneur.edt()
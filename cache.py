@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Cache des résolutions, indexé par l'empreinte du problème.
+
+Le cache garde la forme compacte du résultat (ordre et colonnes de dates,
+voir moteur.calcule) et reconstruit un EDT neuf à chaque succès : les
+appelants peuvent modifier l'EDT reçu sans toucher au cache. Les
+fonctions d'algorithme (max_fin, range_*, dta_fin, resous_2...) partagent
+le cache CACHE du module.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from .probleme import Probleme
+from .edt import EDT
+from .moteur import assemble, calcule
+
+Cle = Tuple[str, bool]
+
+
+def _octets(compact: tuple) -> int:
+    """Taille des tableaux d'un résultat compact."""
+    ordre, colonnes = compact
+    tableaux = [ordre, *{id(colonne): colonne for colonne in colonnes}.values()]
+    return sum(len(tableau) * tableau.itemsize for tableau in tableaux)
+
+
+class CacheResolutions:
+    """Cache LRU borné en nombre d'entrées et en octets.
+
+    Exemple:
+    >>> cache = CacheResolutions(taille_max=2)
+    >>> probleme = Probleme.par_str("A / 1 /\\nB / 2 / A")
+    >>> resous_memo(probleme, cache=cache) == resous_memo(probleme, cache=cache)
+    True
+    >>> cache.statistiques()["succes"], cache.statistiques()["echecs"]
+    (1, 1)
+    """
+
+    def __init__(self, taille_max: int = 128, octets_max: int = 256 * 2**20):
+        """Cache vide ; les bornes peuvent être changées à tout moment."""
+        self.taille_max = taille_max
+        self.octets_max = octets_max
+        self._entrees: "OrderedDict[Cle, Tuple[tuple, int]]" = OrderedDict()
+        self.octets = 0
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Nombre d'entrées."""
+        return len(self._entrees)
+
+    def cherche(self, cle: Cle) -> Optional[tuple]:
+        """Résultat compact, ou None ; compte succès et échecs."""
+        entree = self._entrees.get(cle)
+        if entree is None:
+            self.echecs += 1
+            return None
+        self._entrees.move_to_end(cle)
+        self.succes += 1
+        return entree[0]
+
+    def range(self, cle: Cle, compact: tuple):
+        """Ajoute un résultat et évince les plus anciens au-delà des bornes."""
+        taille = _octets(compact)
+        if taille > self.octets_max:
+            return
+        if cle in self._entrees:
+            self.octets -= self._entrees.pop(cle)[1]
+        self._entrees[cle] = (compact, taille)
+        self.octets += taille
+        while (
+            len(self._entrees) > self.taille_max or self.octets > self.octets_max
+        ):
+            _, (_, taille) = self._entrees.popitem(last=False)
+            self.octets -= taille
+            self.evictions += 1
+
+    def vide(self):
+        """Retire toutes les entrées et remet les compteurs à zéro."""
+        self._entrees.clear()
+        self.octets = self.succes = self.echecs = self.evictions = 0
+
+    def statistiques(self) -> Dict[str, int]:
+        """Compteurs et occupation."""
+        return {
+            "entrees": len(self._entrees),
+            "octets": self.octets,
+            "succes": self.succes,
+            "echecs": self.echecs,
+            "evictions": self.evictions,
+        }
+
+
+CACHE = CacheResolutions()
+
+
+def resous_memo(
+    probleme: Probleme,
+    marges: bool = False,
+    cache: Optional[CacheResolutions] = None,
+) -> EDT:
+    """Comme resous(probleme, moteur="natif", marges=marges), via le cache.
+
+    L'EDT rendu est neuf et porte les tâches de probleme.
+    """
+    cache = CACHE if cache is None else cache
+    cle = (probleme.empreinte(), marges)
+    compact = cache.cherche(cle)
+    if compact is None:
+        compact = calcule(probleme, marges=marges)
+        cache.range(cle, compact)
+    ordre, colonnes = compact
+    return assemble(list(probleme.taches), ordre, colonnes)
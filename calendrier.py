@@ -0,0 +1,234 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Calendriers de travail : week-ends, jours fériés et pauses.
+
+Un Calendrier est une suite de périodes travaillées [debut, fin), en
+instants (des heures depuis l'origine pour Calendrier.hebdomadaire). Le
+travail cumulé avant chaque période est calculé une fois : passer d'un
+instant au travail fait depuis l'instant 0, ou l'inverse, est une
+recherche dichotomique (bisect) dans ces listes, en O(log n) quel que soit
+l'écart entre les deux instants.
+
+Les durées des tâches sont des durées de travail ; debut, fin et dta des
+activités sont des instants du calendrier, et les marges des durées de
+travail. Une tâche commence au premier instant travaillé qui suit la fin
+de ses prérequis ; une tâche de durée nulle ne fait que commencer.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .probleme import Duree, Nom, Probleme
+from .edt import EDT, Instant
+from .moteur import (
+    GrapheCompact,
+    _sans_liens,
+    assemble,
+    passe_arriere,
+    passe_avant,
+)
+
+
+class Calendrier:
+    """Périodes travaillées et index du travail cumulé.
+
+    Exemple (heures depuis le lundi 5 janvier 2026 à minuit):
+    >>> calendrier = Calendrier.hebdomadaire(date(2026, 1, 5), jours=14)
+    >>> calendrier.ajoute(16, 6)  # lundi 16h, 6 heures de travail
+    38
+    >>> calendrier.date(38)
+    datetime.datetime(2026, 1, 6, 14, 0)
+    >>> calendrier.ajoute(4 * 24 + 16, 2)  # vendredi 16h : lundi 9h
+    177
+    """
+
+    def __init__(
+        self,
+        periodes: Iterable[Tuple[Instant, Instant]],
+        origine: Optional[datetime] = None,
+        unite: timedelta = timedelta(hours=1),
+    ):
+        """Trie les périodes et fusionne celles qui se touchent."""
+        self.origine = origine
+        self.unite = unite
+        self.debuts: List[Instant] = []
+        self.fins: List[Instant] = []
+        for debut, fin in sorted(periodes):
+            if fin < debut:
+                raise ValueError(f"Période vide ou inversée : {debut}, {fin}.")
+            if fin == debut:
+                continue
+            if self.fins and debut <= self.fins[-1]:
+                self.fins[-1] = max(self.fins[-1], fin)
+            else:
+                self.debuts.append(debut)
+                self.fins.append(fin)
+        if not self.debuts:
+            raise ValueError("Le calendrier n'a aucune période travaillée.")
+        # Travail fait avant chaque période.
+        self.cumuls: List[Duree] = []
+        total = 0
+        for debut, fin in zip(self.debuts, self.fins):
+            self.cumuls.append(total)
+            total += fin - debut
+        self.total = total
+
+    @classmethod
+    def hebdomadaire(
+        cls,
+        origine: date,
+        jours: int,
+        horaires: Sequence[Tuple[Instant, Instant]] = ((8, 12), (13, 17)),
+        semaine: Iterable[int] = (0, 1, 2, 3, 4),
+        feries: Iterable[date] = (),
+    ) -> "Calendrier":
+        """Calendrier en heures sur jours jours à partir de origine (minuit).
+
+        horaires donne les plages travaillées de chaque jour, en heures ;
+        semaine les jours travaillés (0 pour lundi) ; feries les jours
+        chômés.
+        """
+        semaine, feries = set(semaine), set(feries)
+        periodes = []
+        for numero in range(jours):
+            jour = origine + timedelta(days=numero)
+            if jour.weekday() in semaine and jour not in feries:
+                periodes += [(24 * numero + a, 24 * numero + b) for a, b in horaires]
+        return cls(periodes, datetime.combine(origine, datetime.min.time()))
+
+    def __len__(self) -> int:
+        """Nombre de périodes travaillées."""
+        return len(self.debuts)
+
+    def travail(self, instant: Instant) -> Duree:
+        """Travail fait entre l'instant 0 et instant."""
+        indice = bisect_right(self.debuts, instant) - 1
+        if indice < 0:
+            return 0
+        return self.cumuls[indice] + min(
+            instant - self.debuts[indice], self.fins[indice] - self.debuts[indice]
+        )
+
+    def _periode(self, indice: int, travail: Duree) -> Instant:
+        """Instant de la période indice où le travail cumulé vaut travail."""
+        if travail > self.total or travail < 0:
+            raise ValueError("Le calendrier s'arrête avant la fin du travail.")
+        return self.debuts[indice] + (travail - self.cumuls[indice])
+
+    def debut(self, travail: Duree) -> Instant:
+        """Premier instant travaillé après travail unités de travail."""
+        if travail == self.total:
+            return self.fins[-1]
+        return self._periode(max(0, bisect_right(self.cumuls, travail) - 1), travail)
+
+    def fin(self, travail: Duree) -> Instant:
+        """Premier instant où travail unités de travail sont faites."""
+        return self._periode(max(0, bisect_left(self.cumuls, travail) - 1), travail)
+
+    def ajoute(self, instant: Instant, duree: Duree) -> Instant:
+        """Fin d'un travail de durée duree commencé à instant."""
+        return self.fin(self.travail(instant) + duree)
+
+    def date(self, instant: Instant) -> datetime:
+        """Date correspondant à un instant."""
+        if self.origine is None:
+            raise ValueError("Le calendrier n'a pas d'origine.")
+        return self.origine + instant * self.unite
+
+
+def _tableau(valeurs: List[Instant]) -> array:
+    """Array d'entiers, ou de flottants s'il y en a."""
+    code = "q" if all(isinstance(valeur, int) for valeur in valeurs) else "d"
+    return array(code, valeurs)
+
+
+def calcule_calendrier(
+    probleme: Probleme,
+    calendrier: Calendrier,
+    par_tache: Optional[Dict[Nom, Calendrier]] = None,
+    marges: bool = False,
+) -> Tuple[array, tuple]:
+    """Comme moteur.calcule, avec des calendriers de travail.
+
+    Avec un seul calendrier, les passes du moteur natif sont faites en
+    travail puis chaque date est convertie ; par_tache donne à certaines
+    tâches leur propre calendrier, et les passes sont alors faites en
+    instants. Les décalages des liens typés sont des durées de travail ;
+    ils ne sont acceptés qu'avec un seul calendrier.
+    """
+    graphe = GrapheCompact(probleme)
+    try:
+        ordre, debut_travail, fin_travail = passe_avant(graphe)
+    except ValueError:
+        probleme.verifie()
+        raise
+    taille = len(graphe)
+    durees = graphe.durees
+    if not par_tache:
+        debut = [calendrier.debut(travail) for travail in debut_travail]
+        fin = [
+            calendrier.fin(fin_travail[i]) if durees[i] else debut[i]
+            for i in range(taille)
+        ]
+        if marges:
+            dta_travail, totale, libre = passe_arriere(
+                graphe, ordre, debut_travail, fin_travail
+            )
+            dta = [calendrier.debut(travail) for travail in dta_travail]
+        else:
+            dta, totale, libre = [0] * taille, [0] * taille, [0] * taille
+        return ordre, tuple(map(_tableau, (debut, fin, dta, totale, libre)))
+
+    _sans_liens(graphe, "calendrier par tâche")
+    calendriers = [par_tache.get(nom, calendrier) for nom in probleme.noms]
+    debut: List[Instant] = [0] * taille
+    fin: List[Instant] = [0] * taille
+    debuts, prerequis = graphe.debuts, graphe.prerequis
+    for i in ordre:
+        local = calendriers[i]
+        pret = max(
+            (fin[prerequis[k]] for k in range(debuts[i], debuts[i + 1])), default=0
+        )
+        travail = local.travail(pret)
+        debut[i] = local.debut(travail)
+        fin[i] = local.fin(travail + durees[i]) if durees[i] else debut[i]
+
+    dta: List[Instant] = [0] * taille
+    totale: List[Duree] = [0] * taille
+    libre: List[Duree] = [0] * taille
+    if marges:
+        fin_projet = max(fin) if taille else 0
+        debuts_succ, successeurs = graphe.debuts_succ, graphe.successeurs
+        for i in reversed(ordre):
+            local = calendriers[i]
+            fin_tard = debut_suivant = fin_projet
+            for k in range(debuts_succ[i], debuts_succ[i + 1]):
+                suivante = successeurs[k]
+                fin_tard = min(fin_tard, dta[suivante])
+                debut_suivant = min(debut_suivant, debut[suivante])
+            travail = local.travail(fin_tard) - durees[i]
+            dta[i] = local.debut(travail)
+            totale[i] = travail - local.travail(debut[i])
+            libre[i] = local.travail(debut_suivant) - local.travail(fin[i])
+    return ordre, tuple(map(_tableau, (debut, fin, dta, totale, libre)))
+
+
+def resous_calendrier(
+    probleme: Probleme,
+    calendrier: Calendrier,
+    par_tache: Optional[Dict[Nom, Calendrier]] = None,
+    marges: bool = False,
+) -> EDT:
+    """EDT en instants du calendrier (voir calcule_calendrier).
+
+    Exemple:
+    >>> calendrier = Calendrier.hebdomadaire(date(2026, 1, 5), jours=14)
+    >>> probleme = Probleme.par_str("A / 30 /\\nB / 4 / A")
+    >>> edt = resous_calendrier(probleme, calendrier, marges=True)
+    >>> [calendrier.date(instant).strftime("%a %Hh") for instant in (
+    ...     edt["B"].debut, edt["B"].fin)]
+    ['Thu 15h', 'Fri 10h']
+    """
+    ordre, colonnes = calcule_calendrier(probleme, calendrier, par_tache, marges)
+    return assemble(list(probleme.taches), ordre, colonnes)
@@ -0,0 +1,110 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Construction des problèmes à partir de colonnes (voir Probleme.par_colonnes
+et Probleme.par_aretes).
+
+Les colonnes sont des tableaux NumPy ou de simples séquences. Les
+vérifications se font sur des tableaux : doublons par tri des noms, durées
+négatives par comparaison, références inconnues par recherche
+dichotomique dans les noms triés. Les arêtes sont ensuite rangées au
+format CSR (voir moteur.GrapheCompact) ; ces listes deviennent le contenu
+du problème, dont les tâches ne sont créées qu'à la demande (voir
+Probleme._depuis_csr). Les durées données en liste gardent leur type,
+entier ou flottant, tâche par tâche.
+"""
+from itertools import chain
+from typing import Any, List, Sequence, Tuple
+import numpy as np
+
+
+def _noeuds(noms: Any, durees: Any) -> Tuple[Any, ...]:
+    """Noms et durées vérifiés, avec les noms triés et leur permutation.
+
+    Les durées sont rendues en liste : celles d'une liste ou d'un tuple
+    telles quelles, celles d'un tableau converties par tolist.
+    """
+    noms = np.asarray(noms, dtype=str)
+    if isinstance(durees, (list, tuple)):
+        # np.asarray ferait des flottants de toutes les durées d'une liste
+        # mixte : la liste d'origine est gardée.
+        valeurs = list(durees)
+        durees = np.asarray(valeurs)
+    else:
+        durees = np.asarray(durees)
+        valeurs = durees.tolist()
+    if noms.ndim != 1 or durees.shape != noms.shape:
+        raise ValueError("noms et durees doivent avoir la même longueur.")
+    if len(durees) and durees.dtype.kind not in "iuf":
+        raise ValueError("Les durées doivent être des nombres.")
+    negatives = np.flatnonzero(durees < 0)
+    if len(negatives):
+        raise ValueError(f"{noms[negatives[0]]} : la durée doit être positive.")
+    permutation = np.argsort(noms, kind="stable")
+    tries = noms[permutation]
+    doublons = np.flatnonzero(tries[1:] == tries[:-1])
+    if len(doublons):
+        raise ValueError(f"{tries[doublons[0]]} est présente deux fois!")
+    return noms, valeurs, tries, permutation
+
+
+def _indices(
+    references: np.ndarray, tries: np.ndarray, permutation: np.ndarray
+) -> np.ndarray:
+    """Indices des noms référencés ; erreur sur le premier nom inconnu."""
+    if not len(references):
+        return np.zeros(0, dtype=np.int64)
+    positions = np.searchsorted(tries, references)
+    trouves = np.zeros(len(references), dtype=bool)
+    if len(tries):
+        dans = positions < len(tries)
+        trouves[dans] = tries[positions[dans]] == references[dans]
+    if not trouves.all():
+        inconnu = references[np.argmin(trouves)]
+        raise ValueError(f"{inconnu} n'est pas une tâche existante.")
+    return permutation[positions]
+
+
+def _csr(
+    noms: np.ndarray, durees: list, taches: np.ndarray, prerequis: np.ndarray
+) -> Tuple[List[str], list, List[int], List[int]]:
+    """Listes noms, durées, debuts et prerequis au format CSR.
+
+    Les prérequis d'une tâche gardent l'ordre des arêtes.
+    """
+    rangement = np.argsort(taches, kind="stable")
+    debuts = np.zeros(len(noms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(taches, minlength=len(noms)), out=debuts[1:])
+    return (
+        noms.tolist(),
+        durees,
+        debuts.tolist(),
+        prerequis[rangement].tolist(),
+    )
+
+
+def depuis_listes(noms: Any, durees: Any, prerequis: Sequence[Any]):
+    """Colonnes noms, durées et listes de prérequis (ou chaînes "A B")."""
+    noms, durees, tries, permutation = _noeuds(noms, durees)
+    if len(prerequis) != len(noms):
+        raise ValueError("prerequis doit avoir une liste par tâche.")
+    listes = [
+        liste.split() if isinstance(liste, str) else liste for liste in prerequis
+    ]
+    longueurs = np.fromiter(map(len, listes), dtype=np.int64, count=len(listes))
+    references = np.asarray(list(chain.from_iterable(listes)), dtype=str)
+    taches = np.repeat(np.arange(len(noms)), longueurs)
+    return _csr(noms, durees, taches, _indices(references, tries, permutation))
+
+
+def depuis_aretes(noms: Any, durees: Any, aretes: Any):
+    """Colonnes noms et durées, et arêtes (prérequis, tâche)."""
+    noms, durees, tries, permutation = _noeuds(noms, durees)
+    aretes = np.asarray(aretes, dtype=str)
+    if aretes.size == 0:
+        aretes = aretes.reshape(0, 2)
+    if aretes.ndim != 2 or aretes.shape[1] != 2:
+        raise ValueError("Les arêtes sont des paires (prérequis, tâche).")
+    prerequis = _indices(aretes[:, 0], tries, permutation)
+    taches = _indices(aretes[:, 1], tries, permutation)
+    return _csr(noms, durees, taches, prerequis)
@@ -0,0 +1,136 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Chemins critiques et plus longs chemins du graphe des prérequis.
+
+Un chemin va d'une tâche sans prérequis à une tâche sans successeur ; sa
+longueur est la somme des durées de ses tâches. Une programmation
+dynamique en ordre topologique inverse donne, pour chaque tâche, la plus
+longue queue qui part d'elle. Les chemins sont ensuite produits du plus
+long au plus court par une recherche au meilleur d'abord dont l'estimation
+(préfixe + plus longue queue) est exacte : chaque chemin rendu coûte sa
+longueur en extractions du tas, quel que soit le nombre total de chemins.
+"""
+from heapq import heappop, heappush
+from itertools import count, islice
+from typing import Iterator, List, Optional, Tuple
+from .probleme import Duree, Nom, Probleme
+from .moteur import GrapheCompact, _sans_liens, _zeros, passe_avant
+
+Chemin = Tuple[Duree, List[Nom]]
+# Nombre de chemins critiques rendus par défaut.
+LIMITE_CRITIQUES = 1000
+
+
+def _queues(graphe: GrapheCompact, ordre) -> list:
+    """Plus longue durée d'un chemin qui commence par chaque tâche."""
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    durees = graphe.durees
+    queues = _zeros(graphe.code, len(graphe))
+    for courante in reversed(ordre):
+        suite = 0
+        for k in range(debuts[courante], debuts[courante + 1]):
+            if queues[successeurs[k]] > suite:
+                suite = queues[successeurs[k]]
+        queues[courante] = durees[courante] + suite
+    return queues
+
+
+def plus_longs_chemins(probleme: Probleme) -> Iterator[Chemin]:
+    """Itère sur tous les chemins, du plus long au plus court, à la demande.
+
+    À longueur égale, l'ordre suit l'ordre de déclaration des tâches.
+    Exemple:
+    >>> probleme = Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... D / 4 / A
+    ... E / 1 /
+    ... '''
+    ... )
+    >>> for longueur, chemin in plus_longs_chemins(probleme):
+    ...     print(longueur, " -> ".join(chemin))
+    6 A -> B -> C
+    5 A -> D
+    4 A -> C
+    1 E
+    """
+    graphe = GrapheCompact(probleme)
+    _sans_liens(graphe, "plus_longs_chemins")
+    try:
+        ordre, _, _ = passe_avant(graphe)
+    except ValueError:
+        probleme.verifie()
+        raise
+    queues = _queues(graphe, ordre)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    durees = graphe.durees
+    # Entrées du tas : (-estimation, rang, longueur du préfixe, maillon),
+    # où un maillon (tâche, maillon précédent) partage le préfixe commun.
+    numeros = count()
+    tas: list = []
+    for indice in range(len(graphe)):
+        if graphe.debuts[indice] == graphe.debuts[indice + 1]:
+            entree = (-queues[indice], next(numeros), durees[indice])
+            heappush(tas, (*entree, (indice, None)))
+    while tas:
+        _, _, longueur, maillon = heappop(tas)
+        courante = maillon[0]
+        k0, k1 = debuts[courante], debuts[courante + 1]
+        if k0 == k1:
+            chemin = []
+            while maillon is not None:
+                chemin.append(graphe.noms[maillon[0]])
+                maillon = maillon[1]
+            chemin.reverse()
+            yield longueur, chemin
+            continue
+        for k in range(k0, k1):
+            suivante = successeurs[k]
+            heappush(
+                tas,
+                (
+                    -(longueur + queues[suivante]),
+                    next(numeros),
+                    longueur + durees[suivante],
+                    (suivante, maillon),
+                ),
+            )
+
+
+def k_plus_longs_chemins(probleme: Probleme, k: int) -> List[Chemin]:
+    """Les k plus longs chemins avec leurs longueurs."""
+    return list(islice(plus_longs_chemins(probleme), k))
+
+
+def chemins_critiques(
+    probleme: Probleme, limite: Optional[int] = LIMITE_CRITIQUES
+) -> List[List[Nom]]:
+    """Chemins critiques, chacun dans l'ordre de ses tâches.
+
+    Ce sont les chemins dont la longueur est la durée du projet ; avec des
+    durées flottantes, un écart relatif de 1e-9 est toléré. limite borne le
+    nombre de chemins rendus (LIMITE_CRITIQUES par défaut). limite=None les
+    rend tous : leur nombre peut être exponentiel (une échelle de n
+    barreaux de même durée en a 2**n), à réserver aux petits graphes.
+    Exemple:
+    >>> probleme = Probleme.par_str('''
+    ... A / 2 /
+    ... B / 2 /
+    ... C / 1 / A B
+    ... D / 1 / A
+    ... '''
+    ... )
+    >>> chemins_critiques(probleme)
+    [['A', 'C'], ['A', 'D'], ['B', 'C']]
+    """
+    resultat: List[List[Nom]] = []
+    fin_projet: Optional[Duree] = None
+    for longueur, chemin in islice(plus_longs_chemins(probleme), limite):
+        if fin_projet is None:
+            fin_projet = longueur
+        if longueur < fin_projet - 1e-9 * max(1, abs(fin_projet)):
+            break
+        resultat.append(chemin)
+    return resultat
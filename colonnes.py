@@ -0,0 +1,278 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Emploi du temps en colonnes NumPy.
+
+EDTColonnes range debut, fin, dta, mar et marge_libre dans des tableaux
+indexés comme les tâches du problème, et les prérequis au format CSR (voir
+moteur.GrapheCompact). Les objets activité ne sont créés qu'à la demande,
+comme des vues sur une ligne ; les agrégats et la vérification de
+l'emploi du temps sont des expressions sur les tableaux.
+"""
+from array import array
+from typing import Any, Dict, List, Optional
+import numpy as np
+from .probleme import Nom, Probleme, Tache
+from .edt import Activite, EDT, Instant
+from .moteur import GrapheCompact, assemble, passe_arriere, passe_avant
+
+COLONNES = ("debut", "fin", "dta", "mar", "marge_libre")
+
+
+class VueActivite:
+    """Ligne d'un EDTColonnes, lue et écrite directement dans les tableaux."""
+
+    __slots__ = ("_edt", "position")
+
+    def __init__(self, edt: "EDTColonnes", position: int):
+        """Vue sur la ligne position."""
+        self._edt = edt
+        self.position = position
+
+    @property
+    def tache(self) -> Tache:
+        """Tâche de la ligne."""
+        return self._edt.taches[self.position]
+
+    def copie(self) -> Activite:
+        """Activite indépendante des tableaux."""
+        return Activite(self.tache, *(getattr(self, nom) for nom in COLONNES))
+
+    def __eq__(self, autre: Any) -> bool:
+        """Egalité avec une vue ou une Activite."""
+        if isinstance(autre, VueActivite):
+            autre = autre.copie()
+        return self.copie() == autre
+
+    def __repr__(self) -> str:
+        """Même repr qu'une Activite."""
+        return repr(self.copie())
+
+
+def _colonne(nom: str) -> property:
+    """Propriété qui lit et écrit la colonne nom à la position de la vue."""
+
+    def lit(vue: VueActivite) -> Instant:
+        return getattr(vue._edt, nom)[vue.position].item()
+
+    def ecrit(vue: VueActivite, valeur: Instant):
+        getattr(vue._edt, nom)[vue.position] = valeur
+
+    return property(lit, ecrit, doc=f"Colonne {nom}.")
+
+
+for _nom in COLONNES:
+    setattr(VueActivite, _nom, _colonne(_nom))
+
+
+class EDTColonnes:
+    """Emploi du temps en colonnes.
+
+    ordre donne les positions dans l'ordre des activités (l'ordre de
+    résolution) ; les prérequis de la position i sont
+    prerequis[debuts[i]:debuts[i + 1]].
+    Exemple:
+    >>> probleme = Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... D / 4 / A
+    ... '''
+    ... )
+    >>> edt = resous_colonnes(probleme, marges=True)
+    >>> int(edt.fin.max()), edt.marge_max(), edt.est_valide()
+    (6, 1, True)
+    >>> [activite.tache.nom for activite in edt.chemin_critique()]
+    ['A', 'B', 'C']
+    >>> edt["D"]
+    Activite(tache=Tache(nom='D', duree=4, prerequis=['A']), debut=1, fin=5, dta=2, mar=1, marge_libre=1)
+    >>> edt["D"].debut = 0
+    >>> edt.est_valide()
+    False
+    """
+
+    def __init__(
+        self,
+        taches: List[Tache],
+        colonnes: Dict[str, np.ndarray],
+        debuts: np.ndarray,
+        prerequis: np.ndarray,
+        ordre: Optional[np.ndarray] = None,
+    ):
+        """Prend possession des tableaux, sans copie."""
+        self.taches = taches
+        for nom in COLONNES:
+            setattr(self, nom, colonnes[nom])
+        self.debuts = debuts
+        self.prerequis = prerequis
+        self.ordre = np.arange(len(taches)) if ordre is None else ordre
+        self._positions: Optional[Dict[Nom, int]] = None
+
+    @classmethod
+    def depuis_probleme(
+        cls, probleme: Probleme, marges: bool = False
+    ) -> "EDTColonnes":
+        """Résout avec le moteur natif et garde les tableaux produits."""
+        graphe = GrapheCompact(probleme)
+        try:
+            ordre, debut, fin = passe_avant(graphe)
+        except ValueError:
+            probleme.verifie()
+            raise
+        colonnes = {"debut": debut, "fin": fin}
+        if marges:
+            dta, totale, libre = passe_arriere(graphe, ordre, debut, fin)
+            colonnes.update(dta=dta, mar=totale, marge_libre=libre)
+        type_dates = np.dtype(graphe.code)
+        colonnes = {
+            nom: np.frombuffer(valeurs, dtype=type_dates)
+            for nom, valeurs in colonnes.items()
+        }
+        for nom in COLONNES:
+            colonnes.setdefault(nom, np.zeros(len(graphe), dtype=type_dates))
+        return cls(
+            graphe.taches,
+            colonnes,
+            np.frombuffer(graphe.debuts, dtype=np.int64),
+            np.frombuffer(graphe.prerequis, dtype=np.int64),
+            np.frombuffer(ordre, dtype=np.int64),
+        )
+
+    @classmethod
+    def depuis_calcul(
+        cls,
+        probleme: Probleme,
+        debuts: array,
+        prerequis: array,
+        ordre: array,
+        dates: tuple,
+    ) -> "EDTColonnes":
+        """Enveloppe, sans copie, un résultat de moteur.calcule.
+
+        debuts et prerequis sont les tableaux CSR du problème.
+        """
+        return cls(
+            list(probleme.taches),
+            {
+                nom: np.frombuffer(valeurs, dtype=np.dtype(valeurs.typecode))
+                for nom, valeurs in zip(COLONNES, dates)
+            },
+            np.frombuffer(debuts, dtype=np.int64),
+            np.frombuffer(prerequis, dtype=np.int64),
+            np.frombuffer(ordre, dtype=np.int64),
+        )
+
+    @classmethod
+    def depuis_edt(cls, edt: EDT) -> "EDTColonnes":
+        """Copie un EDT ; tous les prérequis doivent y avoir une activité."""
+        activites = list(edt.activites)
+        taches = [activite.tache for activite in activites]
+        positions = {tache.nom: position for position, tache in enumerate(taches)}
+        try:
+            prerequis = np.fromiter(
+                (positions[nom] for tache in taches for nom in tache.prerequis),
+                dtype=np.int64,
+            )
+        except KeyError as erreur:
+            raise ValueError(
+                f"{erreur.args[0]} n'a pas d'activité dans l'EDT."
+            ) from None
+        debuts = np.zeros(len(taches) + 1, dtype=np.int64)
+        np.cumsum([len(tache.prerequis) for tache in taches], out=debuts[1:])
+        colonnes = {
+            nom: np.array([getattr(activite, nom) for activite in activites])
+            for nom in COLONNES
+        }
+        resultat = cls(taches, colonnes, debuts, prerequis)
+        resultat._positions = positions
+        return resultat
+
+    def __len__(self) -> int:
+        """Nombre d'activités."""
+        return len(self.taches)
+
+    def __contains__(self, nom: Nom) -> bool:
+        """Teste la présence d'une tâche par son nom."""
+        return nom in self._index()
+
+    def _index(self) -> Dict[Nom, int]:
+        """Positions par nom, construites au premier accès par nom."""
+        if self._positions is None:
+            self._positions = {
+                tache.nom: position for position, tache in enumerate(self.taches)
+            }
+        return self._positions
+
+    def __getitem__(self, nom: Nom) -> VueActivite:
+        """Vue sur l'activité d'une tâche."""
+        try:
+            return VueActivite(self, self._index()[nom])
+        except KeyError:
+            raise ValueError("Pas d'activité avec ce nom de tâche.") from None
+
+    @property
+    def activites(self):
+        """Vues sur les activités, dans l'ordre."""
+        for position in self.ordre.tolist():
+            yield VueActivite(self, position)
+
+    def edt(self) -> EDT:
+        """EDT classique, avec des Activite indépendantes."""
+        return assemble(
+            self.taches,
+            self.ordre.tolist(),
+            tuple(getattr(self, nom).tolist() for nom in COLONNES),
+        )
+
+    def _dans_l_ordre(self, masque: np.ndarray) -> List[VueActivite]:
+        """Vues sur les positions du masque, dans l'ordre des activités."""
+        return [
+            VueActivite(self, position)
+            for position in self.ordre[masque[self.ordre]].tolist()
+        ]
+
+    def marges(self) -> np.ndarray:
+        """dta - debut de chaque activité (voir algorithme.marges)."""
+        return self.dta - self.debut
+
+    def marge_max(self) -> Instant:
+        """Plus grande marge totale."""
+        return self.mar.max().item()
+
+    def nom_marge_max(self) -> VueActivite:
+        """Première activité, dans l'ordre, de plus grande marge totale."""
+        return VueActivite(self, self.ordre[np.argmax(self.mar[self.ordre])].item())
+
+    def chemin_critique(self) -> List[VueActivite]:
+        """Activités qui commencent à leur date au plus tard."""
+        return self._dans_l_ordre(self.dta == self.debut)
+
+    def date_valide(self) -> bool:
+        """Même règle que EDT.date_valide : une dta au plus à sa fin suffit."""
+        return bool(np.any(self.dta <= self.fin))
+
+    def est_valide(self) -> bool:
+        """Chaque activité commence après la fin de tous ses prérequis."""
+        if any(tache.liens for tache in self.taches):
+            return self.edt().est_valide()
+        suivantes = np.repeat(np.arange(len(self)), np.diff(self.debuts))
+        return bool(np.all(self.debut[suivantes] >= self.fin[self.prerequis]))
+
+    def ordonne(self, cle: str = "debut", decroissant: bool = False) -> np.ndarray:
+        """Positions triées par une colonne, tri stable (voir EDT.ordonne)."""
+        if cle == "marge":
+            cle = "mar"
+        if cle not in COLONNES:
+            raise ValueError(f"Impossible de trier selon {cle}.")
+        valeurs = getattr(self, cle)[self.ordre]
+        if decroissant:
+            # Tri stable en ordre décroissant : même égalités que EDT.ordonne.
+            return self.ordre[
+                len(valeurs) - 1 - np.argsort(valeurs[::-1], kind="stable")[::-1]
+            ]
+        return self.ordre[np.argsort(valeurs, kind="stable")]
+
+
+def resous_colonnes(probleme: Probleme, marges: bool = False) -> EDTColonnes:
+    """Comme resous(probleme, moteur="natif"), en colonnes."""
+    return EDTColonnes.depuis_probleme(probleme, marges=marges)
@@ -0,0 +1,276 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Mode compact : tâches sans dictionnaire et prérequis en identifiants.
+
+Une TacheCompacte n'a que quatre attributs (``__slots__``) : la table des
+noms de son problème, son identifiant (sa position dans cette table), sa
+durée et le tuple des identifiants de ses prérequis. Les noms sont
+internés et rangés une seule fois dans la table ; les prérequis réutilisent
+les objets entiers des identifiants au lieu de recopier des chaînes. nom et
+prerequis restent disponibles comme propriétés, si bien qu'un
+ProblemeCompact s'utilise comme un Probleme (accès par nom, résolutions,
+mutations) et que les identifiants sont les indices du moteur natif : dans
+un EDTColonnes (module colonnes), la vue d'une activité a pour position
+l'identifiant de sa tâche.
+"""
+import sys
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .probleme import Duree, Lien, Nom, Probleme, Tache, _TachesCSR
+
+
+class TacheCompacte:
+    """Tâche figée et sans __dict__.
+
+    Même repr et même égalité qu'une Tache, sans loi, ressources ni liens.
+    Exemple:
+    >>> probleme = ProblemeCompact.par_str("A / 1 /\\nB / 2 / A")
+    >>> probleme["B"]
+    Tache(nom='B', duree=2, prerequis=['A'])
+    >>> probleme["B"].ident, probleme["B"].ids_prerequis
+    (1, (0,))
+    """
+
+    __slots__ = ("_table", "_ident", "_duree", "_ids_prerequis")
+    loi = None
+    ressources = MappingProxyType({})
+    liens = None
+    lien = Tache.lien
+
+    def __init__(
+        self,
+        table: List[Nom],
+        ident: int,
+        duree: Duree,
+        ids_prerequis: Tuple[int, ...],
+    ):
+        """Vérifie que la durée est positive."""
+        if duree < 0:
+            raise ValueError("La durée doit être positive.")
+        _pose_table(self, table)
+        _pose_ident(self, ident)
+        _pose_duree(self, duree)
+        _pose_ids_prerequis(self, ids_prerequis)
+
+    def __setattr__(self, attribut: str, valeur: Any):
+        """Les tâches compactes sont figées."""
+        raise AttributeError("Une TacheCompacte ne se modifie pas.")
+
+    def __delattr__(self, attribut: str):
+        """Les tâches compactes sont figées."""
+        raise AttributeError("Une TacheCompacte ne se modifie pas.")
+
+    def __reduce__(self):
+        """Reconstruction par le constructeur ; la table est partagée."""
+        return type(self), (
+            self._table,
+            self._ident,
+            self._duree,
+            self._ids_prerequis,
+        )
+
+    # Propriétés sans mutateur, slots privés écrits par __init__ seulement.
+    @property
+    def ident(self) -> int:
+        """Position du nom dans la table."""
+        return self._ident
+
+    @property
+    def duree(self) -> Duree:
+        """Durée."""
+        return self._duree
+
+    @property
+    def ids_prerequis(self) -> Tuple[int, ...]:
+        """Identifiants des prérequis."""
+        return self._ids_prerequis
+
+    @property
+    def nom(self) -> Nom:
+        """Nom, lu dans la table."""
+        return self._table[self._ident]
+
+    @property
+    def prerequis(self) -> List[Nom]:
+        """Noms des prérequis, lus dans la table."""
+        table = self._table
+        return [table[ident] for ident in self._ids_prerequis]
+
+    def _champs(self) -> tuple:
+        """Champs comparés par __eq__, dans l'ordre de Tache."""
+        return (
+            self.nom,
+            self.duree,
+            self.prerequis,
+            self.loi,
+            dict(self.ressources),
+            self.liens,
+        )
+
+    def __eq__(self, autre: Any) -> bool:
+        """Egalité avec une TacheCompacte ou une Tache."""
+        if isinstance(autre, (TacheCompacte, Tache)):
+            return self._champs() == TacheCompacte._champs(autre)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """Même repr qu'une Tache."""
+        return (
+            f"Tache(nom={self.nom!r}, duree={self.duree!r}, "
+            f"prerequis={self.prerequis!r})"
+        )
+
+
+# Ecriture directe dans les slots, sans passer par __setattr__ : deux fois
+# plus rapide qu'object.__setattr__.
+_pose_table, _pose_ident, _pose_duree, _pose_ids_prerequis = (
+    getattr(TacheCompacte, attribut).__set__ for attribut in TacheCompacte.__slots__
+)
+
+
+class _TachesCompactesCSR(_TachesCSR):
+    """Comme _TachesCSR, avec des TacheCompacte sur la table des noms."""
+
+    def cree(self, indice: int) -> TacheCompacte:
+        """Tâche compacte d'indice donné ; l'identifiant est l'indice."""
+        suite = self.prerequis[self.debuts[indice] : self.debuts[indice + 1]]
+        return TacheCompacte(self.noms, indice, self.durees[indice], tuple(suite))
+
+
+def _verifie_simple(tache: Tache):
+    """Le mode compact ne garde ni loi, ni ressources, ni liens typés."""
+    if tache.loi is not None or tache.ressources:
+        raise ValueError(f"{tache.nom} : le mode compact n'a ni loi ni ressources.")
+    if tache.liens:
+        raise ValueError(f"{tache.nom} : le mode compact n'a pas de liens typés.")
+
+
+class ProblemeCompact(Probleme):
+    """Probleme dont les tâches sont des TacheCompacte.
+
+    Les identifiants suivent l'ordre de déclaration ; retirer une tâche
+    renumérote tout le problème (en O(n)) pour garder une table sans trou.
+    Exemple:
+    >>> probleme = ProblemeCompact.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... '''
+    ... )
+    >>> probleme.tache(2)
+    Tache(nom='C', duree=3, prerequis=['A', 'B'])
+    >>> probleme.ajoute_prerequis("B", "C")
+    Traceback (most recent call last):
+    ...
+    ValueError: C ne peut pas précéder B : cycle.
+    >>> probleme.retire_tache("A")
+    >>> probleme["C"].ident, probleme["C"].ids_prerequis
+    (1, (0,))
+    """
+
+    def __init__(
+        self, taches: Iterable[Tache], capacites: Optional[Dict[str, int]] = None
+    ):
+        """Vérifie puis compacte les tâches."""
+        probleme = Probleme(list(taches), capacites)
+        self.capacites = probleme.capacites
+        self._compacte_tout(probleme._taches)
+        self._initialise()
+
+    @classmethod
+    def _depuis_dict(
+        cls, taches: Dict[Nom, Tache], capacites: Optional[Dict[str, int]] = None
+    ) -> "ProblemeCompact":
+        """Compacte sans revalider un dictionnaire déjà vérifié."""
+        probleme = cls.__new__(cls)
+        probleme.capacites = dict(capacites or {})
+        probleme._compacte_tout(taches)
+        probleme._initialise()
+        return probleme
+
+    @classmethod
+    def _depuis_csr(
+        cls,
+        noms: List[Nom],
+        durees: List[Duree],
+        debuts: List[int],
+        prerequis: List[int],
+        capacites: Optional[Dict[str, int]] = None,
+        liens: Optional[Dict[Nom, Dict[Nom, Lien]]] = None,
+    ) -> "ProblemeCompact":
+        """Garde les colonnes ; les tâches compactes sont créées à la demande.
+
+        La table des noms est la colonne des noms, internés. Même signature
+        que Probleme._depuis_csr, mais le mode compact refuse les liens.
+        """
+        if liens:
+            nom = next(iter(liens))
+            raise ValueError(f"{nom} : le mode compact n'a pas de liens typés.")
+        probleme = cls.__new__(cls)
+        probleme.capacites = dict(capacites or {})
+        probleme._table = list(map(sys.intern, noms))
+        probleme._taches = _TachesCompactesCSR(
+            probleme._table, durees, debuts, prerequis
+        )
+        probleme._initialise()
+        return probleme
+
+    @classmethod
+    def depuis(cls, probleme: Probleme) -> "ProblemeCompact":
+        """Copie compacte d'un problème."""
+        return cls._depuis_dict(probleme._taches, probleme.capacites)
+
+    def _compacte_tout(self, taches: Dict[Nom, Tache]):
+        """Nouvelle table des noms et tâches compactes, dans l'ordre."""
+        for tache in taches.values():
+            _verifie_simple(tache)
+        self._table: List[Nom] = [sys.intern(nom) for nom in taches]
+        # Un seul objet entier par identifiant, partagé par les prérequis.
+        ids = {nom: ident for ident, nom in enumerate(self._table)}
+        self._taches = {
+            nom: TacheCompacte(
+                self._table,
+                ids[nom],
+                tache.duree,
+                tuple(ids[autre] for autre in tache.prerequis),
+            )
+            for nom, tache in zip(self._table, taches.values())
+        }
+
+    def _ids(self, noms: Iterable[Nom]) -> Tuple[int, ...]:
+        """Identifiants des noms, en partageant les entiers des tâches."""
+        taches = self._taches
+        return tuple(taches[nom].ident for nom in noms)
+
+    def tache(self, ident: int) -> TacheCompacte:
+        """Accès aux tâches par leurs identifiants."""
+        return self._taches[self._table[ident]]
+
+    def _remplace(self, nom: Nom, duree: Duree, prerequis: List[Nom]):
+        """Remplace la tâche, avec le même identifiant."""
+        self._taches[nom] = TacheCompacte(
+            self._table, self._taches[nom].ident, duree, self._ids(prerequis)
+        )
+
+    def ajoute_tache(self, tache: Tache):
+        """Ajoute une tâche dont les prérequis existent déjà."""
+        _verifie_simple(tache)
+        if tache.nom in self._taches:
+            raise ValueError(f"{tache.nom} est présente deux fois!")
+        for nom in tache.prerequis:
+            if nom not in self._taches:
+                raise ValueError(f"{nom} n'est pas une tâche existante.")
+        self._prepare()
+        compacte = TacheCompacte(
+            self._table, len(self._table), tache.duree, self._ids(tache.prerequis)
+        )
+        self._table.append(sys.intern(tache.nom))
+        super().ajoute_tache(compacte)
+
+    def retire_tache(self, nom: Nom):
+        """Retire une tâche puis renumérote les autres."""
+        super().retire_tache(nom)
+        self._compacte_tout(self._taches)
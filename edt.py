@@ -2,12 +2,32 @@
 # -*- coding: utf-8 -*-
 """Description.
 Contient les classes Activite et EDT.
+
+matplotlib et rich ne sont importés que par les méthodes d'affichage, et
+NumPy que par EDT.colonnes.
 """
-import matplotlib.pyplot as plt
-from typing import Any, List, Union, Generator
+import heapq
+from operator import attrgetter
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    Generator,
+)
+from array import array
 from dataclasses import dataclass
-from rich.table import Table
-from .probleme import Nom, Tache
+from .probleme import Nom, Probleme, Tache
+
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+    from rich.table import Table
+    from .calendrier import Calendrier
+    from .colonnes import EDTColonnes
 
 Instant = Union[int, float]
 
@@ -21,15 +41,51 @@ class Activite:
     fin: Instant
     dta: Instant
     mar: Instant
-    
+    marge_libre: Instant = 0
+
     def __post_init__(self):
         """Vérifie que la durée est respectée."""
-        if self.fin - self.debut < self.tache.duree:
+        if self.fin < self.debut + self.tache.duree:
             raise ValueError(
                 f"L'activité correspondant à la tache {self.tache} ne respecte pas la durée."
             )
 
 
+class VueEDT:
+    """Vue ordonnée d'un EDT : une permutation, sans copie des activités."""
+
+    def __init__(self, edt: "EDT", permutation: array):
+        """Garde l'EDT et l'ordre de ses positions."""
+        self._edt = edt
+        self.permutation = permutation
+
+    def __len__(self) -> int:
+        """Nombre d'activités."""
+        return len(self.permutation)
+
+    def __getitem__(self, rang: int) -> Activite:
+        """Activité au rang donné dans l'ordre de la vue."""
+        return self._edt._activites[self.permutation[rang]]
+
+    def __iter__(self) -> Generator[Activite, None, None]:
+        """Itère dans l'ordre de la vue."""
+        activites = self._edt._activites
+        for position in self.permutation:
+            yield activites[position]
+
+    @property
+    def activites(self) -> Generator[Activite, None, None]:
+        """Même propriété que pour un EDT."""
+        yield from self
+
+    def edt(self) -> "EDT":
+        """Copie la vue dans un nouvel EDT."""
+        return EDT(activites=list(self))
+
+
+CLES = {"debut": "debut", "fin": "fin", "dta": "dta", "mar": "mar", "marge": "mar"}
+
+
 class EDT:
     """Emploi du temps.
         Exemple:
@@ -114,8 +170,13 @@ class EDT:
     """
 
     def __init__(self, activites: List[Activite]):
-        """Instancie à partir de la liste d'activites."""
+        """Instancie à partir de la liste d'activites.
+
+        ``_positions`` associe à chaque nom de tâche sa position dans
+        ``_activites`` pour des accès et des tests de doublon en O(1).
+        """
         self._activites: List[Activite] = []
+        self._positions: Dict[Nom, int] = dict()
         for activite in activites:
             self.ajoute(activite)
 
@@ -133,115 +194,197 @@ class EDT:
     def activites(self) -> Generator[Activite, None, None]:
         """ITérateur."""
         yield from self._activites
-        
+
+    def __len__(self) -> int:
+        """Nombre d'activités."""
+        return len(self._activites)
+
+    def __contains__(self, nom: Nom) -> bool:
+        """Teste la présence d'une tâche par son nom."""
+        return nom in self._positions
 
     def __getitem__(self, nom: Nom) -> Activite:
         """Accède aux activités par leur nom de tâche."""
-        for activite in self._activites:
-            if activite.tache.nom == nom:
-                return activite
-
-        raise ValueError("Pas d'activité avec ce nom de tâche.")
+        try:
+            return self._activites[self._positions[nom]]
+        except KeyError:
+            raise ValueError("Pas d'activité avec ce nom de tâche.") from None
 
     def ajoute(self, activite: Activite):
         """Rajoute une nouvelle activité."""
-        if any(
-            activite.tache.nom == autre.tache.nom for autre in self.activites
-        ):
+        if activite.tache.nom in self._positions:
             raise ValueError(
                 f"La tache {activite.tache.nom} est déjà présente "
                 "dans l'emploi du temps."
             )
+        self._positions[activite.tache.nom] = len(self._activites)
         self._activites.append(activite)
 
+    def ordonne(self, cle: str = "debut", decroissant: bool = False) -> VueEDT:
+        """Vue triée par debut, fin, dta ou marge en O(n log n).
+
+        Le tri est stable : à valeur égale, l'ordre de l'EDT est conservé,
+        y compris en ordre décroissant.
+        """
+        if cle not in CLES:
+            raise ValueError(f"Impossible de trier selon {cle}.")
+        attribut = CLES[cle]
+        activites = self._activites
+        return VueEDT(
+            self,
+            array(
+                "q",
+                sorted(
+                    range(len(activites)),
+                    key=lambda position: getattr(activites[position], attribut),
+                    reverse=decroissant,
+                ),
+            ),
+        )
+
+    def retire(self, nom: Nom):
+        """Retire l'activité d'une tâche."""
+        position = self._positions.pop(nom)
+        del self._activites[position]
+        for suivante in self._activites[position:]:
+            self._positions[suivante.tache.nom] -= 1
+
+    def propage(self, probleme: Probleme, noms: Iterable[Nom]):
+        """Recalcule début et fin après une modification du problème.
+
+        Seules les tâches de noms et leurs successeurs sont revues, dans
+        l'ordre des rangs du problème ; la propagation s'arrête dès que
+        début et fin ne changent plus. dta et mar ne sont pas mis à jour.
+        """
+        tas = [(probleme.rang(nom), nom) for nom in dict.fromkeys(noms)]
+        heapq.heapify(tas)
+        vus = {nom for _, nom in tas}
+        while tas:
+            _, nom = heapq.heappop(tas)
+            tache = probleme[nom]
+            if tache.liens:
+                debut = max(
+                    [
+                        tache.lien(prerequis).debut_min(
+                            self[prerequis].debut, self[prerequis].fin, tache.duree
+                        )
+                        for prerequis in tache.prerequis
+                    ]
+                    + [0]
+                )
+            else:
+                debut = max(
+                    (self[prerequis].fin for prerequis in tache.prerequis),
+                    default=0,
+                )
+            fin = debut + tache.duree
+            if nom in self:
+                activite = self[nom]
+                change = (activite.debut, activite.fin) != (debut, fin)
+                activite.tache, activite.debut, activite.fin = tache, debut, fin
+            else:
+                self.ajoute(
+                    Activite(tache=tache, debut=debut, fin=fin, dta=0, mar=0)
+                )
+                change = True
+            if not change:
+                continue
+            for suivant in probleme.successeurs(nom):
+                if suivant not in vus:
+                    vus.add(suivant)
+                    heapq.heappush(tas, (probleme.rang(suivant), suivant))
+
+    def colonnes(self) -> "EDTColonnes":
+        """Copie en colonnes NumPy (voir le module colonnes)."""
+        from .colonnes import EDTColonnes
+
+        return EDTColonnes.depuis_edt(self)
+
     def est_valide(self) -> bool:
         """Vérifie si l'emploi du temps respecte les contraintes."""
         for activite in self.activites:
-            for prerequis in activite.tache.prerequis:
-                if activite.debut < self[prerequis].fin:
+            tache = activite.tache
+            for prerequis in tache.prerequis:
+                precedente = self[prerequis]
+                if tache.liens:
+                    borne = tache.lien(prerequis).debut_min(
+                        precedente.debut, precedente.fin, tache.duree
+                    )
+                else:
+                    borne = precedente.fin
+                if activite.debut < borne:
                     return False
         return True
         
     def date_valide(self)-> bool:
         """Vérifie si une date au tard ne dépasse pas la fin"""
-        for activite in self.activites:
-            if activite.dta <= activite.fin:
-                return True
-        return False
+        return any(activite.dta <= activite.fin for activite in self._activites)
     
-    def genere_table(self) -> Table:
+    def genere_table(self) -> "Table":
         """Retourn une table rich."""
-        resultat = Table(title="Solution du problème")
-        resultat.add_column("Tache")
-        resultat.add_column("Début")
-        resultat.add_column("Fin")
-        for activite in self._activites:
-            resultat.add_row(
-                activite.tache.nom, str(activite.debut), str(activite.fin)
-            )
+        from .export import table
 
-        return resultat
-    
-    def genere_table_bis(self) -> Table:
+        return table(self)
+
+    def genere_table_bis(self) -> "Table":
         """Retourn une table rich avec les dta."""
-        resultat = Table(title="Solution du problème")
-        resultat.add_column("Tache")
-        resultat.add_column("Date au plus tard")
-        resultat.add_column("Début")
-        resultat.add_column("Fin")
-        for activite in self._activites:
-            resultat.add_row(
-                activite.tache.nom, str(activite.dta), str(activite.debut), str(activite.fin)
-            )
+        from .export import table
 
-        return resultat
-    
-    def genere_table_mar(self) -> Table:
+        return table(self, ("tache", "dta", "debut", "fin"))
+
+    def genere_table_mar(self) -> "Table":
         """Retourn une table rich avec les dta."""
-        resultat = Table(title="Solution du problème")
-        resultat.add_column("Tache")
-        resultat.add_column("Date au plus tard")
-        resultat.add_column("Début")
-        resultat.add_column("Marges")
-        resultat.add_column("Fin")
-        for activite in self._activites:
-            resultat.add_row(
-                activite.tache.nom, str(activite.dta), str(activite.debut),str(activite.mar), str(activite.fin)
-            )
+        from .export import table
 
-        return resultat
-
-    def affiche(self):
-        """Affiche la table."""
-        from rich import print
-
-        print(self.genere_table())
-
-    def genere_graphique(self) -> plt.Figure:
-        """Renvoie une figure matplotlib."""
-        figure, repere = plt.subplots()
-        repere.set_ylabel("Taches")
-        repere.set_xlabel("Instants")
-        repere.set_title("Solution du problème d'ordonnancement")
-        for indice, activite in enumerate(self.activites):
-            repere.plot([activite.debut, activite.fin], [-indice, -indice], color="blue", linewidth=2)
-        repere.set_yticks([-indice for indice, _ in enumerate(self.activites)])
-        repere.set_yticklabels([activite.tache.nom for activite in self.activites])
-        return figure
-    
+        return table(self, ("tache", "dta", "debut", "marge", "fin"))
+
+    def affiche(
+        self,
+        colonnes: Optional[Sequence[str]] = None,
+        page: int = 1,
+        taille_page: Optional[int] = None,
+        calendrier: Optional["Calendrier"] = None,
+    ):
+        """Affiche une page de la table, avec debut, fin, dta, marge...
+
+        Avec un calendrier, debut, fin et dta sont affichés en dates.
+        """
+        from .export import affiche
+
+        affiche(self, colonnes, page, taille_page, calendrier)
+
+    def exporte(
+        self,
+        fichier="-",
+        format: Optional[str] = None,
+        colonnes: Optional[Sequence[str]] = None,
+        calendrier: Optional["Calendrier"] = None,
+    ):
+        """Ecrit les activités en CSV, TSV ou JSON Lines (voir export.ecrit)."""
+        from .export import ecrit
+
+        ecrit(self, fichier, format, colonnes, calendrier)
+
+    def genere_graphique(self) -> "plt.Figure":
+        """Renvoie une figure matplotlib (voir le module gantt)."""
+        import matplotlib.pyplot as plt
+        from .gantt import dessine
+
+        _, repere = plt.subplots()
+        return dessine(self, repere=repere)
+
+    # Agrégats en un parcours de la liste, sans passer par des colonnes :
+    # copier l'EDT dans un EDTColonnes (voir colonnes) coûte bien plus que
+    # le parcours. Pour des agrégats NumPy, travailler sur edt.colonnes().
     def chemin_critique(self):
         """Dit le chemin critique à prévoir"""
-        nom=[]
-        for activite in self.activites:
-            if activite.dta == activite.debut:
-                nom.append(activite)
-        return nom
+        return [
+            activite for activite in self._activites if activite.dta == activite.debut
+        ]
+
     def marge_max(self):
         """Renvois la marge maximale"""
-        marg=[]
-        for activite in self.activites:
-            marg.append(activite.mar)
-        return max(marg)
+        return max(map(attrgetter("mar"), self._activites))
 
     
     def nom_marge_max(self):
@@ -0,0 +1,246 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Export en flux et affichage par pages des problèmes et emplois du temps.
+
+Les lignes sont produites une à une depuis les tâches ou les activités :
+``ecrit`` envoie un CSV, un TSV ou un JSON Lines vers un fichier sans
+jamais construire le tableau complet, et ``table`` ne construit la table
+rich que pour la fenêtre demandée. La mémoire utilisée ne dépend donc pas
+du nombre de lignes.
+"""
+import csv
+import json
+import sys
+from itertools import islice
+from os import PathLike
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
+from .probleme import Probleme
+from .edt import EDT
+
+if TYPE_CHECKING:
+    from rich.table import Table
+    from .calendrier import Calendrier
+    from .colonnes import EDTColonnes
+
+Source = Union[Probleme, EDT, "EDTColonnes"]
+
+# Nom d'une colonne : (entête des tables rich, lecture sur une tâche ou une
+# activité). Les colonnes de tâche se lisent aussi sur une activité.
+COLONNES_TACHE: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "tache": ("Tache", lambda tache: tache.nom),
+    "duree": ("Durée", lambda tache: tache.duree),
+    "prerequis": ("Prérequis", lambda tache: _prerequis(tache)),
+}
+COLONNES_ACTIVITE: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    "debut": ("Début", lambda activite: activite.debut),
+    "fin": ("Fin", lambda activite: activite.fin),
+    "dta": ("Date au plus tard", lambda activite: activite.dta),
+    "marge": ("Marges", lambda activite: activite.mar),
+    "marge_libre": ("Marge libre", lambda activite: activite.marge_libre),
+}
+FORMATS = ("csv", "tsv", "jsonl")
+# Colonnes converties en dates quand un calendrier est donné.
+DATES = ("debut", "fin", "dta")
+
+
+def _prerequis(tache) -> List[str]:
+    """Prérequis au format de Probleme.par_str, avec leurs liens typés."""
+    if not tache.liens:
+        return tache.prerequis
+    return [
+        f"{nom}:{tache.liens[nom]}" if nom in tache.liens else nom
+        for nom in tache.prerequis
+    ]
+
+
+def _elements(source: Source) -> Tuple[Iterable, bool]:
+    """Tâches ou activités, à parcourir dans l'ordre, et si ce sont des activités."""
+    if isinstance(source, Probleme):
+        return source.taches, False
+    return source.activites, True
+
+
+def _defaut(activites: bool) -> Tuple[str, ...]:
+    """Colonnes des tables genere_table."""
+    return ("tache", "debut", "fin") if activites else ("tache", "duree", "prerequis")
+
+
+def _lecteurs(
+    colonnes: Sequence[str],
+    activites: bool,
+    calendrier: Optional["Calendrier"] = None,
+) -> list:
+    """Fonctions de lecture des colonnes demandées."""
+    lecteurs = []
+    for nom in colonnes:
+        if nom in COLONNES_TACHE:
+            lit = COLONNES_TACHE[nom][1]
+            lecteurs.append(
+                (lambda lit: lambda activite: lit(activite.tache))(lit)
+                if activites
+                else lit
+            )
+        elif activites and nom in COLONNES_ACTIVITE:
+            lit = COLONNES_ACTIVITE[nom][1]
+            if calendrier is not None and nom in DATES:
+                lit = (lambda lit: lambda activite: calendrier.date(lit(activite)))(
+                    lit
+                )
+            lecteurs.append(lit)
+        else:
+            raise ValueError(f"Colonne inconnue : {nom}.")
+    return lecteurs
+
+
+def lignes(
+    source: Source,
+    colonnes: Optional[Sequence[str]] = None,
+    calendrier: Optional["Calendrier"] = None,
+) -> Iterator[tuple]:
+    """Valeurs des colonnes, ligne par ligne, à la demande.
+
+    Avec un calendrier, debut, fin et dta sont des dates (datetime).
+
+    Exemple:
+    >>> probleme = Probleme.par_str("A / 1 /\\nB / 2 / A")
+    >>> list(lignes(probleme))
+    [('A', 1, []), ('B', 2, ['A'])]
+    """
+    elements, activites = _elements(source)
+    lecteurs = _lecteurs(colonnes or _defaut(activites), activites, calendrier)
+    for element in elements:
+        yield tuple(lit(element) for lit in lecteurs)
+
+
+def ecrit(
+    source: Source,
+    fichier: Union[str, PathLike, TextIO] = "-",
+    format: Optional[str] = None,
+    colonnes: Optional[Sequence[str]] = None,
+    calendrier: Optional["Calendrier"] = None,
+):
+    """Ecrit les lignes en CSV, TSV ou JSON Lines, au fil de l'eau.
+
+    fichier est un chemin, "-" pour la sortie standard, ou un fichier
+    texte ouvert. Sans format, l'extension du chemin décide (csv par
+    défaut). Les prérequis sont séparés par des espaces en CSV et TSV, et
+    forment une liste en JSON Lines.
+    Exemple:
+    >>> probleme = Probleme.par_str("A / 1 /\\nB / 2 / A\\nC / 3 / A B")
+    >>> ecrit(probleme)
+    tache,duree,prerequis
+    A,1,
+    B,2,A
+    C,3,A B
+    >>> ecrit(probleme, format="jsonl", colonnes=["tache", "prerequis"])
+    {"tache": "A", "prerequis": []}
+    {"tache": "B", "prerequis": ["A"]}
+    {"tache": "C", "prerequis": ["A", "B"]}
+    """
+    chemin = isinstance(fichier, (str, PathLike)) and fichier != "-"
+    if format is None and chemin:
+        format = Path(fichier).suffix.lstrip(".").lower() or "csv"
+    format = format or "csv"
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu : {format}.")
+    _, activites = _elements(source)
+    colonnes = list(colonnes or _defaut(activites))
+    # Colonnes vérifiées avant d'ouvrir : un fichier existant reste intact.
+    _lecteurs(colonnes, activites, calendrier)
+    if chemin:
+        with open(fichier, "w", encoding="utf-8", newline="") as sortie:
+            return ecrit(source, sortie, format, colonnes, calendrier)
+    if fichier == "-":
+        fichier = sys.stdout
+    valeurs = lignes(source, colonnes, calendrier)
+    if format == "jsonl":
+        for ligne in valeurs:
+            fichier.write(
+                json.dumps(dict(zip(colonnes, ligne)), ensure_ascii=False, default=str)
+                + "\n"
+            )
+        return
+    redacteur = csv.writer(
+        fichier, delimiter="\t" if format == "tsv" else ",", lineterminator="\n"
+    )
+    redacteur.writerow(colonnes)
+    redacteur.writerows(
+        [" ".join(valeur) if isinstance(valeur, list) else valeur for valeur in ligne]
+        for ligne in valeurs
+    )
+
+
+def table(
+    source: Source,
+    colonnes: Optional[Sequence[str]] = None,
+    premier: int = 0,
+    nombre: Optional[int] = None,
+    titre: Optional[str] = None,
+    calendrier: Optional["Calendrier"] = None,
+) -> "Table":
+    """Table rich des lignes premier à premier + nombre seulement.
+
+    Sans nombre, toutes les lignes à partir de premier. La légende indique
+    la fenêtre quand elle ne couvre pas toutes les lignes.
+    Exemple:
+    >>> probleme = Probleme.par_str("A / 1 /\\nB / 2 / A\\nC / 3 / A B")
+    >>> table(probleme, premier=1, nombre=1).caption
+    'lignes 2 à 2 sur 3'
+
+    """
+    from rich.table import Table
+
+    elements, activites = _elements(source)
+    colonnes = colonnes or _defaut(activites)
+    lecteurs = _lecteurs(colonnes, activites, calendrier)
+    if titre is None:
+        titre = "Solution du problème" if activites else "Problème d'ordonnancement"
+    total = len(source)
+    dernier = total if nombre is None else min(total, premier + nombre)
+    legende = None
+    if premier > 0 or dernier < total:
+        legende = f"lignes {premier + 1} à {dernier} sur {total}"
+    resultat = Table(title=titre, caption=legende)
+    for nom in colonnes:
+        resultat.add_column({**COLONNES_TACHE, **COLONNES_ACTIVITE}[nom][0])
+    for element in islice(elements, premier, dernier):
+        resultat.add_row(
+            *(
+                ", ".join(valeur) if isinstance(valeur, list) else str(valeur)
+                for valeur in (lit(element) for lit in lecteurs)
+            )
+        )
+    return resultat
+
+
+def affiche(
+    source: Source,
+    colonnes: Optional[Sequence[str]] = None,
+    page: int = 1,
+    taille_page: Optional[int] = None,
+    calendrier: Optional["Calendrier"] = None,
+):
+    """Affiche une page de la table ; par défaut, ce qui tient dans la console."""
+    from rich.console import Console
+
+    console = Console()
+    if taille_page is None:
+        # Titre, légende, bordures et entête occupent 6 lignes, plus l'invite.
+        taille_page = max(1, console.height - 7)
+    premier = (page - 1) * taille_page
+    console.print(table(source, colonnes, premier, taille_page, calendrier=calendrier))
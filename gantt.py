@@ -0,0 +1,127 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Diagramme de Gantt pour les grands emplois du temps.
+
+Toutes les barres sont dessinées par une seule collection de rectangles
+(comme broken_barh) et toutes les marges par une seule collection de
+segments, au lieu d'un appel à plot par activité. Quand il y a plus
+d'activités que de pixels en hauteur, les activités consécutives sont
+regroupées en lignes : chaque ligne montre l'enveloppe de son groupe.
+``enregistre`` écrit directement un PNG ou un SVG, sans backend
+interactif ni pyplot. matplotlib et NumPy ne sont importés qu'à l'appel.
+"""
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+from os import PathLike
+from .edt import EDT
+
+if TYPE_CHECKING:
+    import numpy as np
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+    from .colonnes import EDTColonnes
+
+COULEURS = {"critique": "tab:red", "normale": "tab:blue", "marge": "tab:gray"}
+NOMS_MAX = 60
+
+
+def _colonnes(edt: Union[EDT, "EDTColonnes"]) -> Tuple["np.ndarray", ...]:
+    """debut, fin, dta et mar dans l'ordre des activités."""
+    import numpy as np
+
+    if isinstance(edt, EDT):
+        activites = list(edt.activites)
+        return tuple(
+            np.array([getattr(activite, nom) for activite in activites], dtype=float)
+            for nom in ("debut", "fin", "dta", "mar")
+        )
+    return tuple(
+        getattr(edt, nom)[edt.ordre].astype(float)
+        for nom in ("debut", "fin", "dta", "mar")
+    )
+
+
+def dessine(
+    edt: Union[EDT, "EDTColonnes"],
+    repere: Optional["Axes"] = None,
+    surligne: Optional[bool] = None,
+    lignes_max: Optional[int] = None,
+) -> "Figure":
+    """Dessine le diagramme de Gantt et renvoie la figure.
+
+    Sans repere, la figure est créée sans pyplot. surligne colore en rouge
+    les activités de marge totale nulle et trace leurs marges en gris ; par
+    défaut, seulement si l'EDT porte des marges (résolu avec marges=True).
+    lignes_max vaut par défaut la hauteur du repère en pixels.
+    """
+    import numpy as np
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.figure import Figure
+
+    if repere is None:
+        repere = Figure(figsize=(10, 6)).add_subplot()
+    debut, fin, dta, mar = _colonnes(edt)
+    taille = len(debut)
+    if surligne is None:
+        surligne = bool(np.any(dta != 0) or np.any(mar != 0))
+    critique = (mar == 0) if surligne else np.zeros(taille, dtype=bool)
+    if lignes_max is None:
+        lignes_max = max(1, int(repere.bbox.height))
+
+    fin_tard = fin + mar
+    regroupe = taille > lignes_max
+    if regroupe:
+        # Groupes consécutifs de tailles presque égales, un par ligne.
+        premiers = np.arange(lignes_max) * taille // lignes_max
+        debut = np.minimum.reduceat(debut, premiers)
+        fin = np.maximum.reduceat(fin, premiers)
+        fin_tard = np.maximum.reduceat(fin_tard, premiers)
+        critique = np.logical_or.reduceat(critique, premiers)
+    lignes = len(debut)
+    y = np.arange(lignes, dtype=float)
+
+    # Rectangles de hauteur 0.8 centrés sur chaque ligne, en un seul tableau.
+    rectangles = np.empty((lignes, 4, 2))
+    rectangles[:, [0, 1], 0] = debut[:, None]
+    rectangles[:, [2, 3], 0] = fin[:, None]
+    rectangles[:, [0, 3], 1] = (y - 0.4)[:, None]
+    rectangles[:, [1, 2], 1] = (y + 0.4)[:, None]
+    couleurs = np.where(critique, COULEURS["critique"], COULEURS["normale"])
+    repere.add_collection(
+        PolyCollection(rectangles, facecolors=couleurs, edgecolors="none")
+    )
+    if surligne:
+        avec_marge = fin_tard > fin
+        segments = np.stack(
+            [np.column_stack([fin, y]), np.column_stack([fin_tard, y])], axis=1
+        )[avec_marge]
+        repere.add_collection(
+            LineCollection(segments, colors=COULEURS["marge"], linewidths=1)
+        )
+
+    repere.set_xlim(0, max(float(fin_tard.max()) if lignes else 0, 1))
+    repere.set_ylim(max(lignes, 1) - 0.5, -0.5)
+    repere.set_xlabel("Instants")
+    repere.set_title("Solution du problème d'ordonnancement")
+    if not regroupe and taille <= NOMS_MAX:
+        repere.set_ylabel("Taches")
+        repere.set_yticks(y)
+        repere.set_yticklabels([activite.tache.nom for activite in edt.activites])
+    else:
+        repere.set_ylabel(
+            f"Activités ({taille}, par groupes de ~{taille / lignes:.0f})"
+            if regroupe
+            else f"Activités ({taille})"
+        )
+    return repere.figure
+
+
+def enregistre(
+    edt: Union[EDT, "EDTColonnes"],
+    chemin: Union[str, PathLike],
+    dpi: int = 100,
+    **options,
+):
+    """Dessine et écrit le fichier ; le format (png, svg...) suit l'extension."""
+    figure = dessine(edt, **options)
+    figure.savefig(chemin, dpi=dpi)
@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Générateurs de problèmes synthétiques pour les tests et les mesures.
+
+Tous les générateurs sont déterministes pour une graine donnée. Les tâches
+s'appellent T0, T1... ; avec ``melange``, elles sont déclarées dans un ordre
+aléatoire plutôt que dans un ordre topologique.
+Exemple:
+>>> print(chaine(3))
+Tache(nom='T0', duree=7, prerequis=[])
+Tache(nom='T1', duree=7, prerequis=['T0'])
+Tache(nom='T2', duree=1, prerequis=['T1'])
+>>> chaine(3, graine=1) == chaine(3, graine=1)
+True
+"""
+import random
+from dataclasses import replace
+from typing import Callable, Dict, List, Sequence
+from .probleme import TYPES_LIENS, Duree, Lien, Nom, Probleme, Tache
+
+
+def _tirage_duree(hasard: random.Random, flottantes: bool) -> Duree:
+    """Durée entre 1 et 10, entière ou à deux décimales."""
+    if flottantes:
+        return round(hasard.uniform(0.5, 10), 2)
+    return hasard.randint(1, 10)
+
+
+def _construit(
+    taille: int,
+    prerequis_de: Callable[[int], List[int]],
+    graine: int,
+    flottantes: bool,
+    melange: bool,
+) -> Probleme:
+    """Crée le problème ; prerequis_de(i) ne renvoie que des indices < i."""
+    hasard = random.Random(graine)
+    noms = [f"T{indice}" for indice in range(taille)]
+    taches: Dict[Nom, Tache] = dict()
+    for indice in range(taille):
+        taches[noms[indice]] = Tache(
+            nom=noms[indice],
+            duree=_tirage_duree(hasard, flottantes),
+            prerequis=[noms[autre] for autre in prerequis_de(indice)],
+        )
+    if melange:
+        ordre = list(taches)
+        hasard.shuffle(ordre)
+        taches = {nom: taches[nom] for nom in ordre}
+    return Probleme._depuis_dict(taches)
+
+
+def chaine(
+    taille: int, graine: int = 0, flottantes: bool = False, melange: bool = False
+) -> Probleme:
+    """Une seule longue chaîne : chaque tâche attend la précédente."""
+    return _construit(
+        taille,
+        lambda indice: [indice - 1] if indice else [],
+        graine,
+        flottantes,
+        melange,
+    )
+
+
+def eventail(
+    taille: int, graine: int = 0, flottantes: bool = False, melange: bool = False
+) -> Probleme:
+    """Une racine dont dépendent directement toutes les autres tâches."""
+    return _construit(
+        taille,
+        lambda indice: [0] if indice else [],
+        graine,
+        flottantes,
+        melange,
+    )
+
+
+def couches(
+    taille: int,
+    largeur: int = 10,
+    densite: float = 0.5,
+    graine: int = 0,
+    flottantes: bool = False,
+    melange: bool = False,
+) -> Probleme:
+    """Couches de largeur tâches, chacune reliée à la couche précédente.
+
+    Chaque arête entre deux couches successives existe avec la probabilité
+    densite ; une tâche garde toujours au moins un prérequis.
+    """
+    hasard = random.Random(graine + 1)
+
+    def prerequis_de(indice: int) -> List[int]:
+        couche = indice // largeur
+        if couche == 0:
+            return []
+        debut = (couche - 1) * largeur
+        precedente = range(debut, debut + largeur)
+        choisis = [autre for autre in precedente if hasard.random() < densite]
+        return choisis or [hasard.choice(precedente)]
+
+    return _construit(taille, prerequis_de, graine, flottantes, melange)
+
+
+def aleatoire(
+    taille: int,
+    degre: float = 2.0,
+    graine: int = 0,
+    flottantes: bool = False,
+    melange: bool = False,
+) -> Probleme:
+    """Graphe creux aléatoire d'en moyenne degre prérequis par tâche."""
+    hasard = random.Random(graine + 1)
+    maximum = max(0, round(2 * degre))
+
+    def prerequis_de(indice: int) -> List[int]:
+        nombre = min(indice, hasard.randint(0, maximum))
+        return sorted(hasard.sample(range(indice), nombre))
+
+    return _construit(taille, prerequis_de, graine, flottantes, melange)
+
+
+def avec_liens(
+    probleme: Probleme,
+    part: float = 0.5,
+    types: Sequence[str] = TYPES_LIENS,
+    decalages: Sequence[Duree] = range(-2, 4),
+    graine: int = 0,
+) -> Probleme:
+    """Copie du problème dont une part des arêtes reçoit un lien typé.
+
+    Le type et le décalage de chaque lien sont tirés dans types et
+    decalages.
+    """
+    hasard = random.Random(graine)
+    taches: Dict[Nom, Tache] = dict()
+    for tache in probleme.taches:
+        liens = {
+            nom: Lien(hasard.choice(types), hasard.choice(decalages))
+            for nom in tache.prerequis
+            if hasard.random() < part
+        }
+        taches[tache.nom] = replace(tache, liens=liens or None)
+    return Probleme._depuis_dict(taches, probleme.capacites)
+
+
+def taches_fictives(probleme: Probleme) -> Probleme:
+    """Même problème, liens FS et SS à décalage positif en tâches fictives.
+
+    Chaque tâche X attend un jalon X@debut de durée nulle, qui porte ses
+    prérequis ; un décalage devient une tâche P@X de sa durée, et un lien
+    SS part du jalon du prérequis. C'est le codage qu'il faut sans liens
+    typés : les tâches d'origine gardent leurs dates, leurs dates au plus
+    tard et marges totales se lisent sur les jalons.
+    """
+    taches: List[Tache] = []
+    for tache in probleme.taches:
+        jalon = []
+        for nom in tache.prerequis:
+            lien = tache.lien(nom)
+            if lien.type not in ("FS", "SS") or lien.decalage < 0:
+                raise ValueError(f"{tache.nom} : lien {lien} sans codage fictif.")
+            source = nom + "@debut" if lien.type == "SS" else nom
+            if lien.decalage:
+                taches.append(Tache(f"{nom}@{tache.nom}", lien.decalage, [source]))
+                source = f"{nom}@{tache.nom}"
+            jalon.append(source)
+        taches.append(Tache(tache.nom + "@debut", 0, jalon))
+        taches.append(Tache(tache.nom, tache.duree, [tache.nom + "@debut"]))
+    return Probleme(taches)
+
+
+FORMES = {
+    "chaine": chaine,
+    "eventail": eventail,
+    "couches": couches,
+    "aleatoire": aleatoire,
+}
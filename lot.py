@@ -0,0 +1,222 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Résolution par lots sur un groupe de processus.
+
+Les processus reçoivent les colonnes CSR des problèmes (noms, durées et
+prérequis en indices), jamais des objets Tache, et ne renvoient que la
+forme compacte du résultat (ordre et colonnes de dates dans des array, voir
+moteur.calcule), jamais des objets Activite. Avec ``colonnes``, resous_lot
+rend des EDTColonnes sans créer d'activité ; sinon chaque EDT est assemblé
+dans le processus appelant avec les tâches du problème.
+Usage : python -m ordonnancement resous DOSSIER [--workers N]
+        python -m ordonnancement sert [--socket CHEMIN | --port N] [--workers N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, chain
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
+from .probleme import Probleme, _TachesCSR
+from .edt import EDT
+from .moteur import assemble, calcule
+
+if TYPE_CHECKING:
+    from .colonnes import EDTColonnes
+
+
+def _distribue(
+    fonction: Callable, arguments: List[tuple], workers: Optional[int]
+) -> Iterable:
+    """Applique fonction sur place (workers=1) ou dans un groupe de processus."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(arguments) <= 1:
+        return [fonction(*argument) for argument in arguments]
+    # Quelques paquets par processus : peu d'allers-retours, charge équilibrée.
+    paquet = max(1, len(arguments) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as groupe:
+        return list(groupe.map(fonction, *zip(*arguments), chunksize=paquet))
+
+
+def _csr(probleme: Probleme) -> tuple:
+    """Colonnes noms, durées, debuts, prerequis et liens, à transmettre.
+
+    Celles d'un problème construit par colonnes sont reprises telles
+    quelles ; les indices voyagent dans des array, copiés d'un bloc.
+    """
+    taches = probleme._taches
+    if isinstance(taches, _TachesCSR):
+        return (
+            taches.noms,
+            taches.durees,
+            array("q", taches.debuts),
+            array("q", taches.prerequis),
+            taches.liens,
+        )
+    indices = {nom: indice for indice, nom in enumerate(taches)}
+    listes = [tache.prerequis for tache in taches.values()]
+    debuts = array("q", [0])
+    debuts.extend(accumulate(map(len, listes)))
+    return (
+        list(taches),
+        [tache.duree for tache in taches.values()],
+        debuts,
+        array("q", map(indices.__getitem__, chain.from_iterable(listes))),
+        {nom: tache.liens for nom, tache in taches.items() if tache.liens},
+    )
+
+
+def _calcule_csr(
+    noms: list, durees: list, debuts: array, prerequis: array, liens: dict, marges
+) -> tuple:
+    """moteur.calcule sur le problème reconstruit à partir de ses colonnes."""
+    probleme = Probleme._depuis_csr(noms, durees, debuts, prerequis, liens=liens)
+    return calcule(probleme, marges)
+
+
+def resous_lot(
+    problemes: Iterable[Probleme],
+    workers: Optional[int] = None,
+    marges: bool = False,
+    colonnes: bool = False,
+) -> Union[List[EDT], List["EDTColonnes"]]:
+    """Résout chaque problème avec le moteur natif, en parallèle.
+
+    Renvoie les EDT dans l'ordre des problèmes ; workers vaut par défaut le
+    nombre de processeurs. Avec ``colonnes``, ce sont des EDTColonnes : le
+    processus appelant n'assemble rien, les activités ne sont créées qu'à
+    la lecture.
+    Exemple:
+    >>> problemes = [
+    ...     Probleme.par_str("A / 1 /\\nB / 2 / A"),
+    ...     Probleme.par_str("C / 3 /"),
+    ... ]
+    >>> [len(edt) for edt in resous_lot(problemes, workers=2)]
+    [2, 1]
+    """
+    problemes = list(problemes)
+    envois = [_csr(probleme) for probleme in problemes]
+    compacts = _distribue(
+        _calcule_csr, [envoi + (marges,) for envoi in envois], workers
+    )
+    if colonnes:
+        from .colonnes import EDTColonnes
+
+        return [
+            EDTColonnes.depuis_calcul(probleme, debuts, prerequis, ordre, dates)
+            for probleme, (_, _, debuts, prerequis, _), (ordre, dates) in zip(
+                problemes, envois, compacts
+            )
+        ]
+    return [
+        assemble(list(probleme.taches), ordre, dates)
+        for probleme, (ordre, dates) in zip(problemes, compacts)
+    ]
+
+
+def resume_fichier(chemin: str) -> Dict[str, Any]:
+    """Lit, résout et résume un fichier de problème.
+
+    Le résumé donne la durée totale et le chemin critique (tâches de marge
+    nulle, dans l'ordre de résolution) ; une erreur est renvoyée plutôt que
+    levée pour ne pas interrompre le lot.
+    """
+    resume: Dict[str, Any] = {"fichier": chemin}
+    try:
+        depart = time.perf_counter()
+        probleme = Probleme.par_fichier(chemin)
+        lu = time.perf_counter()
+        ordre, (_, fin, _, totale, _) = calcule(probleme, marges=True)
+        resolu = time.perf_counter()
+    except (OSError, ValueError) as erreur:
+        resume["erreur"] = str(erreur)
+        return resume
+    noms = list(probleme.noms)
+    resume.update(
+        taches=len(noms),
+        duree_totale=max(fin, default=0),
+        chemin_critique=[
+            noms[indice] for indice in ordre if totale[indice] == 0
+        ],
+        lecture_s=lu - depart,
+        resolution_s=resolu - lu,
+    )
+    return resume
+
+
+def resous_dossier(
+    dossier: str, motif: str = "*.txt", workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Résume tous les fichiers du dossier qui correspondent au motif."""
+    chemins = sorted(str(chemin) for chemin in Path(dossier).glob(motif))
+    return list(_distribue(resume_fichier, [(c,) for c in chemins], workers))
+
+
+def main(arguments: Optional[List[str]] = None):
+    """Ligne de commande."""
+    parseur = argparse.ArgumentParser(prog="python -m ordonnancement")
+    commandes = parseur.add_subparsers(dest="commande", required=True)
+    resous = commandes.add_parser(
+        "resous", aliases=["solve"], help="résout tous les problèmes d'un dossier"
+    )
+    resous.add_argument("dossier")
+    resous.add_argument("--motif", default="*.txt")
+    resous.add_argument("--workers", type=int, default=None)
+    resous.add_argument(
+        "--sortie", default="-", help="fichier JSON Lines des résumés (- : stdout)"
+    )
+    sert = commandes.add_parser(
+        "sert", aliases=["serve"], help="sert les résolutions en local"
+    )
+    sert.add_argument("--socket", default=None, help="socket Unix plutôt que TCP")
+    sert.add_argument("--hote", default="127.0.0.1")
+    sert.add_argument("--port", type=int, default=8421)
+    sert.add_argument("--workers", type=int, default=None)
+    options = parseur.parse_args(arguments)
+
+    if options.commande in ("sert", "serve"):
+        from .service import sert
+
+        sert(options.socket, options.hote, options.port, options.workers)
+        return 0
+
+    depart = time.perf_counter()
+    resumes = resous_dossier(options.dossier, options.motif, options.workers)
+    total = time.perf_counter() - depart
+
+    sortie = (
+        sys.stdout
+        if options.sortie == "-"
+        else open(options.sortie, "w", encoding="utf-8")
+    )
+    try:
+        for resume in resumes:
+            sortie.write(json.dumps(resume, ensure_ascii=False) + "\n")
+    finally:
+        if sortie is not sys.stdout:
+            sortie.close()
+
+    erreurs = sum("erreur" in resume for resume in resumes)
+    lecture = sum(resume.get("lecture_s", 0) for resume in resumes)
+    resolution = sum(resume.get("resolution_s", 0) for resume in resumes)
+    print(
+        f"{len(resumes)} fichiers ({erreurs} en erreur) en {total:.3f} s : "
+        f"lecture {lecture:.3f} s, résolution {resolution:.3f} s cumulées, "
+        f"{len(resumes) / total if total else 0:.1f} fichiers/s",
+        file=sys.stderr,
+    )
+    return 1 if erreurs else 0
@@ -0,0 +1,359 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Moteur de résolution natif : le graphe des prérequis est stocké sous forme
+compacte (CSR), la passe avant se fait en un seul parcours et la passe
+arrière en un parcours de l'ordre topologique inversé.
+"""
+from array import array
+from typing import List, Optional, Tuple
+from .probleme import FIN_DEBUT, Duree, Probleme, Tache, _TachesCSR
+from .compact import ProblemeCompact
+from .edt import Activite, EDT
+
+
+def _zeros(code: str, taille: int) -> array:
+    """Renvoie un tableau de zéros."""
+    return array(code, bytes(array(code).itemsize * taille))
+
+
+class GrapheCompact:
+    """Graphe des prérequis indexé par entiers.
+
+    Les prérequis de la tâche d'indice ``i`` sont
+    ``prerequis[debuts[i]:debuts[i + 1]]`` et ses successeurs
+    ``successeurs[debuts_succ[i]:debuts_succ[i + 1]]``.
+    Si des tâches ont des liens typés (Tache.liens), ``types`` et
+    ``decalages`` donnent le type (position dans TYPES_LIENS) et le
+    décalage de chaque arête, dans l'ordre de ``prerequis``, et
+    ``aretes_succ`` la position dans ``prerequis`` de chaque arête de
+    ``successeurs`` ; sinon ils valent None. Pour un problème construit par
+    colonnes et pas encore modifié, les tableaux sont copiés des colonnes
+    et les tâches ne sont créées qu'à la lecture de ``taches``.
+    Exemple:
+    >>> graphe = GrapheCompact(Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... '''
+    ... ))
+    >>> graphe.noms
+    ['A', 'B', 'C']
+    >>> list(graphe.prerequis), list(graphe.debuts)
+    ([0, 0, 1], [0, 0, 1, 3])
+    >>> list(graphe.successeurs), list(graphe.debuts_succ)
+    ([1, 2, 2], [0, 2, 3, 3])
+    """
+
+    def __init__(self, probleme: Probleme):
+        """Numérote les tâches et construit les tableaux CSR."""
+        colonnes = probleme._taches
+        if isinstance(colonnes, _TachesCSR) and not colonnes.liens:
+            self._colonnes: Optional[_TachesCSR] = colonnes
+            self._taches: Optional[List[Tache]] = None
+            self.noms = colonnes.noms
+            durees: List[Duree] = colonnes.durees
+            lies: List[Tache] = []
+        else:
+            self._colonnes = None
+            self._taches = list(probleme.taches)
+            self.noms = [tache.nom for tache in self._taches]
+            durees = [tache.duree for tache in self._taches]
+            lies = [tache for tache in self._taches if tache.liens]
+        decalages = [
+            tache.lien(nom).decalage for tache in lies for nom in tache.prerequis
+        ]
+        self.code = (
+            "q"
+            if all(isinstance(d, int) for d in durees)
+            and all(isinstance(d, int) for d in decalages)
+            else "d"
+        )
+        self.durees = array(self.code, durees)
+
+        if self._colonnes is not None:
+            self.debuts = array("q", colonnes.debuts)
+            self.prerequis = array("q", colonnes.prerequis)
+        elif isinstance(probleme, ProblemeCompact):
+            # Les identifiants des tâches compactes sont déjà les indices.
+            self.debuts = array("q", [0])
+            self.prerequis = array("q")
+            for tache in self.taches:
+                self.prerequis.extend(tache.ids_prerequis)
+                self.debuts.append(len(self.prerequis))
+        else:
+            self.debuts = array("q", [0])
+            self.prerequis = array("q")
+            indices = {nom: indice for indice, nom in enumerate(self.noms)}
+            for tache in self.taches:
+                self.prerequis.extend(indices[nom] for nom in tache.prerequis)
+                self.debuts.append(len(self.prerequis))
+
+        self.types = self.decalages = self.aretes_succ = None
+        if lies:
+            self.types = array("b")
+            self.decalages = array(self.code)
+            for tache in self.taches:
+                for nom in tache.prerequis:
+                    lien = tache.lien(nom) if tache.liens else FIN_DEBUT
+                    self.types.append(lien.code)
+                    self.decalages.append(lien.decalage)
+            self.aretes_succ = _zeros("q", len(self.prerequis))
+
+        # Transposée par tri comptage : les successeurs restent dans
+        # l'ordre de déclaration des tâches.
+        taille = len(self.noms)
+        self.debuts_succ = _zeros("q", taille + 1)
+        for prerequis in self.prerequis:
+            self.debuts_succ[prerequis + 1] += 1
+        for indice in range(taille):
+            self.debuts_succ[indice + 1] += self.debuts_succ[indice]
+        self.successeurs = _zeros("q", len(self.prerequis))
+        curseurs = self.debuts_succ[:-1]
+        for indice in range(taille):
+            for k in range(self.debuts[indice], self.debuts[indice + 1]):
+                prerequis = self.prerequis[k]
+                self.successeurs[curseurs[prerequis]] = indice
+                if self.aretes_succ is not None:
+                    self.aretes_succ[curseurs[prerequis]] = k
+                curseurs[prerequis] += 1
+
+    @property
+    def taches(self) -> List[Tache]:
+        """Tâches dans l'ordre des indices, créées au besoin."""
+        if self._taches is None:
+            self._taches = list(self._colonnes.values())
+        return self._taches
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.noms)
+
+
+def _sans_liens(graphe: GrapheCompact, usage: str):
+    """Lève ValueError si le graphe a des liens typés."""
+    if graphe.types is not None:
+        raise ValueError(f"{usage} : seuls les liens fin-début sans décalage.")
+
+
+def passe_avant(graphe: GrapheCompact) -> Tuple[array, array, array]:
+    """Calcule l'ordre topologique et les dates au plus tôt en un parcours.
+
+    L'ordre est celui de Kahn génération par génération, les tâches d'une
+    même génération restant dans l'ordre de déclaration.
+    """
+    if graphe.types is not None:
+        return _passe_avant_liens(graphe)
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    degres = array(
+        "q", (graphe.debuts[i + 1] - graphe.debuts[i] for i in range(taille))
+    )
+    debut = _zeros(graphe.code, taille)
+    fin = _zeros(graphe.code, taille)
+    ordre = array("q", (i for i in range(taille) if degres[i] == 0))
+    tete = 0
+    while tete < len(ordre):
+        courante = ordre[tete]
+        tete += 1
+        arrivee = debut[courante] + graphe.durees[courante]
+        fin[courante] = arrivee
+        for k in range(debuts[courante], debuts[courante + 1]):
+            suivante = successeurs[k]
+            if debut[suivante] < arrivee:
+                debut[suivante] = arrivee
+            degres[suivante] -= 1
+            if degres[suivante] == 0:
+                ordre.append(suivante)
+
+    if len(ordre) < taille:
+        raise ValueError("Le problème n'a pas de solution.")
+    return ordre, debut, fin
+
+
+def passe_arriere(
+    graphe: GrapheCompact, ordre: array, debut: array, fin: array
+) -> Tuple[array, array, array]:
+    """Calcule les dates au plus tard, marges totales et marges libres.
+
+    Les tâches sans successeur doivent finir avant la fin du projet, qui
+    est la plus grande des dates de fin.
+    """
+    if graphe.types is not None:
+        return _passe_arriere_liens(graphe, ordre, debut, fin)
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    fin_projet = max(fin) if taille else 0
+    dta = _zeros(graphe.code, taille)
+    libre = _zeros(graphe.code, taille)
+    for courante in reversed(ordre):
+        fin_tard = debut_suivant = fin_projet
+        for k in range(debuts[courante], debuts[courante + 1]):
+            suivante = successeurs[k]
+            if dta[suivante] < fin_tard:
+                fin_tard = dta[suivante]
+            if debut[suivante] < debut_suivant:
+                debut_suivant = debut[suivante]
+        dta[courante] = fin_tard - graphe.durees[courante]
+        libre[courante] = debut_suivant - fin[courante]
+    totale = array(graphe.code, (dta[i] - debut[i] for i in range(taille)))
+    return dta, totale, libre
+
+
+def _passe_avant_liens(graphe: GrapheCompact) -> Tuple[array, array, array]:
+    """passe_avant avec des liens typés, dans le même ordre.
+
+    Le début d'une tâche est connu quand elle sort de la file : chaque
+    arête pousse alors le début de son successeur (voir Lien.debut_min),
+    sans jamais le faire passer avant 0.
+    """
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    types, decalages, aretes = graphe.types, graphe.decalages, graphe.aretes_succ
+    durees = graphe.durees
+    degres = array(
+        "q", (graphe.debuts[i + 1] - graphe.debuts[i] for i in range(taille))
+    )
+    debut = _zeros(graphe.code, taille)
+    fin = _zeros(graphe.code, taille)
+    ordre = array("q", (i for i in range(taille) if degres[i] == 0))
+    tete = 0
+    while tete < len(ordre):
+        courante = ordre[tete]
+        tete += 1
+        depart = debut[courante]
+        arrivee = depart + durees[courante]
+        fin[courante] = arrivee
+        for j in range(debuts[courante], debuts[courante + 1]):
+            suivante = successeurs[j]
+            k = aretes[j]
+            type_lien = types[k]
+            date = (depart if type_lien & 1 else arrivee) + decalages[k]
+            if type_lien & 2:
+                date -= durees[suivante]
+            if debut[suivante] < date:
+                debut[suivante] = date
+            degres[suivante] -= 1
+            if degres[suivante] == 0:
+                ordre.append(suivante)
+
+    if len(ordre) < taille:
+        raise ValueError("Le problème n'a pas de solution.")
+    return ordre, debut, fin
+
+
+def _passe_arriere_liens(
+    graphe: GrapheCompact, ordre: array, debut: array, fin: array
+) -> Tuple[array, array, array]:
+    """passe_arriere avec des liens typés.
+
+    Chaque arête borne la fin au plus tard de la tâche par la date au plus
+    tard du successeur qu'elle contraint, moins le décalage ; la marge
+    libre est le plus petit retard que les arêtes laissent passer sans
+    décaler un successeur.
+    """
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    types, decalages, aretes = graphe.types, graphe.decalages, graphe.aretes_succ
+    durees = graphe.durees
+    fin_projet = max(fin) if taille else 0
+    dta = _zeros(graphe.code, taille)
+    libre = _zeros(graphe.code, taille)
+    for courante in reversed(ordre):
+        duree = durees[courante]
+        fin_tard = fin_projet
+        marge = fin_projet - fin[courante]
+        for j in range(debuts[courante], debuts[courante + 1]):
+            suivante = successeurs[j]
+            k = aretes[j]
+            type_lien = types[k]
+            if type_lien & 2:
+                tard = dta[suivante] + durees[suivante] - decalages[k]
+                tot = fin[suivante] - decalages[k]
+            else:
+                tard = dta[suivante] - decalages[k]
+                tot = debut[suivante] - decalages[k]
+            if type_lien & 1:
+                tard += duree
+                tot -= debut[courante]
+            else:
+                tot -= fin[courante]
+            if tard < fin_tard:
+                fin_tard = tard
+            if tot < marge:
+                marge = tot
+        dta[courante] = fin_tard - duree
+        libre[courante] = marge
+    totale = array(graphe.code, (dta[i] - debut[i] for i in range(taille)))
+    return dta, totale, libre
+
+
+def calcule(probleme: Probleme, marges: bool = False) -> Tuple[array, tuple]:
+    """Ordre topologique et colonnes (debut, fin, dta, mar, marge_libre).
+
+    Les colonnes sont indexées comme probleme.taches ; c'est une forme
+    compacte du résultat, sans objet Activite.
+    """
+    graphe = GrapheCompact(probleme)
+    try:
+        ordre, debut, fin = passe_avant(graphe)
+    except ValueError:
+        # Le message détaillé (cycle, tâches bloquées) vient de l'analyse.
+        probleme.verifie()
+        raise
+    if marges:
+        dta, totale, libre = passe_arriere(graphe, ordre, debut, fin)
+    else:
+        dta = totale = libre = _zeros(graphe.code, len(graphe))
+    return ordre, (debut, fin, dta, totale, libre)
+
+
+def assemble(taches: List[Tache], ordre: array, colonnes: tuple) -> EDT:
+    """Crée l'EDT à partir de la forme compacte."""
+    debut, fin, dta, totale, libre = colonnes
+    return EDT(
+        activites=[
+            Activite(
+                tache=taches[indice],
+                debut=debut[indice],
+                fin=fin[indice],
+                dta=dta[indice],
+                mar=totale[indice],
+                marge_libre=libre[indice],
+            )
+            for indice in ordre
+        ]
+    )
+
+
+def resous_natif(probleme: Probleme, marges: bool = False) -> EDT:
+    """Résout le problème sans passer par networkx.
+
+    Avec ``marges``, une passe arrière remplit ``dta``, ``mar`` (marge
+    totale) et ``marge_libre`` de chaque activité.
+    Exemple:
+    >>> probleme = Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... D / 4 / A
+    ... E / 5 /
+    ... '''
+    ... )
+    >>> for activite in resous_natif(probleme).activites:
+    ...     print(activite.tache.nom, activite.debut, activite.fin)
+    A 0 1
+    E 0 5
+    B 1 3
+    D 1 5
+    C 3 6
+    >>> for activite in resous_natif(probleme, marges=True).activites:
+    ...     print(activite.tache.nom, activite.dta, activite.mar, activite.marge_libre)
+    A 0 0 0
+    E 1 1 1
+    B 1 0 0
+    D 2 1 1
+    C 3 0 0
+    """
+    ordre, colonnes = calcule(probleme, marges=marges)
+    return assemble(list(probleme.taches), ordre, colonnes)
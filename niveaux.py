@@ -0,0 +1,251 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Moteur par niveaux : passes avant et arrière vectorisées niveau par niveau.
+
+Le niveau d'une tâche est la longueur (en tâches) du plus long chemin de
+prérequis qui y mène ; toutes les tâches d'un niveau ne dépendent que des
+niveaux précédents. Chaque niveau est donc calculé d'un bloc avec NumPy :
+les dates des prérequis (ou des successeurs, dans la passe arrière) sont
+rassemblées depuis les tableaux CSR de moteur.GrapheCompact puis réduites
+par np.maximum.reduceat ou np.minimum.reduceat. Les niveaux les plus
+larges peuvent être découpés entre plusieurs threads : NumPy relâche le
+GIL pendant ces calculs et chaque thread écrit dans ses propres cases.
+
+L'ordre des activités reproduit celui de la file de moteur.passe_avant :
+une tâche y entre quand son dernier prérequis en sort, et les tâches
+libérées par une même tâche y entrent dans l'ordre de déclaration. Les
+dates sont obtenues par les mêmes opérations, sur les mêmes types : l'EDT
+est identique à celui du moteur natif. Les problèmes à liens typés
+(Tache.liens) passent par moteur.calcule.
+"""
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import List, Optional, Tuple, Union
+import numpy as np
+from .probleme import Probleme, _TachesCSR
+from .edt import EDT
+from .compact import ProblemeCompact
+from .moteur import GrapheCompact, assemble, calcule, resous_natif
+
+# Taille de niveau à partir de laquelle les threads se partagent le travail.
+SEUIL_THREADS = 1 << 16
+
+
+class GrapheNumpy:
+    """Mêmes tableaux CSR que moteur.GrapheCompact, en tableaux NumPy.
+
+    La transposée est obtenue par un tri stable des arêtes plutôt que par
+    une boucle : les successeurs restent dans l'ordre de déclaration. Un
+    problème construit par colonnes fournit directement ses tableaux.
+    """
+
+    def __init__(self, probleme: Probleme):
+        """Numérote les tâches et construit les tableaux CSR."""
+        colonnes = probleme._taches
+        if isinstance(colonnes, _TachesCSR):
+            self._colonnes: Optional[_TachesCSR] = colonnes
+            self._taches = None
+            taille = len(colonnes)
+            durees = colonnes.durees
+        else:
+            self._colonnes = None
+            self._taches = list(probleme.taches)
+            taille = len(self._taches)
+            durees = [tache.duree for tache in self._taches]
+        self.code = "q" if all(isinstance(d, int) for d in durees) else "d"
+        self.durees = np.array(durees, dtype=self.code)
+        if self._colonnes is not None:
+            self.debuts = np.array(colonnes.debuts, dtype=np.int64)
+            self.prerequis = np.array(colonnes.prerequis, dtype=np.int64)
+            longueurs = np.diff(self.debuts)
+        else:
+            if isinstance(probleme, ProblemeCompact):
+                listes = [tache.ids_prerequis for tache in self._taches]
+            else:
+                indices = {t.nom: indice for indice, t in enumerate(self._taches)}
+                listes = [
+                    list(map(indices.__getitem__, t.prerequis)) for t in self._taches
+                ]
+            longueurs = np.fromiter(map(len, listes), dtype=np.int64, count=taille)
+            self.debuts = np.zeros(taille + 1, dtype=np.int64)
+            np.cumsum(longueurs, out=self.debuts[1:])
+            self.prerequis = np.fromiter(
+                chain.from_iterable(listes), dtype=np.int64, count=self.debuts[-1]
+            )
+        rangement = np.argsort(self.prerequis, kind="stable")
+        self.successeurs = np.repeat(np.arange(taille), longueurs)[rangement]
+        self.debuts_succ = np.zeros(taille + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.prerequis, minlength=taille), out=self.debuts_succ[1:]
+        )
+
+    @property
+    def taches(self) -> list:
+        """Tâches dans l'ordre des indices, créées au besoin."""
+        if self._taches is None:
+            self._taches = list(self._colonnes.values())
+        return self._taches
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.durees)
+
+
+Graphe = Union[GrapheCompact, GrapheNumpy]
+
+
+def _aretes(debuts: np.ndarray, noeuds: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Positions CSR des arêtes des noeuds, bout à bout, et leur nombre."""
+    longueurs = debuts[noeuds + 1] - debuts[noeuds]
+    fins = np.cumsum(longueurs)
+    decalages = np.repeat(debuts[noeuds] - (fins - longueurs), longueurs)
+    return np.arange(len(decalages)) + decalages, longueurs
+
+
+def _par_tranches(
+    travail, taille: int, groupe: Optional[ThreadPoolExecutor], morceaux: int
+):
+    """Appelle travail(bas, haut) sur tout le niveau ou par morceaux."""
+    if groupe is None or taille < SEUIL_THREADS:
+        travail(0, taille)
+        return
+    bornes = [taille * numero // morceaux for numero in range(morceaux + 1)]
+    list(groupe.map(travail, bornes[:-1], bornes[1:]))
+
+
+def niveaux(graphe: Graphe) -> List[np.ndarray]:
+    """Tâches de chaque niveau, dans l'ordre de moteur.passe_avant.
+
+    Lève ValueError si des tâches restent bloquées par un cycle.
+    """
+    taille = len(graphe)
+    debuts_succ = np.asarray(graphe.debuts_succ, dtype=np.int64)
+    successeurs = np.asarray(graphe.successeurs, dtype=np.int64)
+    degres = np.diff(np.asarray(graphe.debuts, dtype=np.int64))
+    # Rang, dans l'ordre, du dernier prérequis sorti de la file.
+    dernier = np.full(taille, -1, dtype=np.int64)
+    courant = np.flatnonzero(degres == 0)
+    resultat = []
+    place = 0
+    while len(courant):
+        resultat.append(courant)
+        aretes, longueurs = _aretes(debuts_succ, courant)
+        cibles = successeurs[aretes]
+        rangs = np.repeat(np.arange(place, place + len(courant)), longueurs)
+        place += len(courant)
+        np.subtract.at(degres, cibles, 1)
+        np.maximum.at(dernier, cibles, rangs)
+        liberes = np.unique(cibles[degres[cibles] == 0])
+        courant = liberes[np.argsort(dernier[liberes], kind="stable")]
+    if place < taille:
+        raise ValueError("Le problème n'a pas de solution.")
+    return resultat
+
+
+def calcule_niveaux(
+    probleme: Probleme, marges: bool = False, travailleurs: int = 1
+) -> Tuple[array, tuple]:
+    """Comme moteur.calcule, niveau par niveau.
+
+    Avec travailleurs > 1, les niveaux d'au moins SEUIL_THREADS tâches sont
+    partagés entre autant de threads.
+    """
+    colonnes = probleme._taches
+    if (
+        colonnes.liens
+        if isinstance(colonnes, _TachesCSR)
+        else any(tache.liens for tache in probleme.taches)
+    ):
+        return calcule(probleme, marges)
+    graphe = GrapheNumpy(probleme)
+    try:
+        paliers = niveaux(graphe)
+    except ValueError:
+        probleme.verifie()
+        raise
+    taille = len(graphe)
+    code = graphe.code
+    debuts, prerequis = graphe.debuts, graphe.prerequis
+    debuts_succ, successeurs = graphe.debuts_succ, graphe.successeurs
+    durees = graphe.durees
+    debut = np.zeros(taille, dtype=code)
+    fin = np.zeros(taille, dtype=code)
+    dta = np.zeros(taille, dtype=code)
+    libre = np.zeros(taille, dtype=code)
+    groupe = ThreadPoolExecutor(travailleurs) if travailleurs > 1 else None
+    try:
+        for numero, noeuds in enumerate(paliers):
+            if numero:
+
+                def avant(bas: int, haut: int, noeuds=noeuds):
+                    tranche = noeuds[bas:haut]
+                    aretes, longueurs = _aretes(debuts, tranche)
+                    blocs = np.cumsum(longueurs) - longueurs
+                    debut[tranche] = np.maximum.reduceat(
+                        fin[prerequis[aretes]], blocs
+                    )
+
+                _par_tranches(avant, len(noeuds), groupe, travailleurs)
+            fin[noeuds] = debut[noeuds] + durees[noeuds]
+
+        if marges:
+            fin_projet = fin.max() if taille else fin.dtype.type(0)
+            for noeuds in reversed(paliers):
+
+                def arriere(bas: int, haut: int, noeuds=noeuds):
+                    tranche = noeuds[bas:haut]
+                    aretes, longueurs = _aretes(debuts_succ, tranche)
+                    suivies = longueurs > 0
+                    blocs = (np.cumsum(longueurs) - longueurs)[suivies]
+                    cibles = successeurs[aretes]
+                    fin_tard = np.full(len(tranche), fin_projet)
+                    debut_suivant = np.full(len(tranche), fin_projet)
+                    if len(blocs):
+                        fin_tard[suivies] = np.minimum(
+                            np.minimum.reduceat(dta[cibles], blocs), fin_projet
+                        )
+                        debut_suivant[suivies] = np.minimum(
+                            np.minimum.reduceat(debut[cibles], blocs), fin_projet
+                        )
+                    dta[tranche] = fin_tard - durees[tranche]
+                    libre[tranche] = debut_suivant - fin[tranche]
+
+                _par_tranches(arriere, len(noeuds), groupe, travailleurs)
+    finally:
+        if groupe is not None:
+            groupe.shutdown()
+
+    ordre = np.concatenate(paliers) if paliers else np.zeros(0, dtype=np.int64)
+    colonnes = [debut, fin]
+    if marges:
+        colonnes += [dta, dta - debut, libre]
+    else:
+        colonnes += [np.zeros(taille, dtype=code)] * 3
+    return array("q", ordre.tobytes()), tuple(
+        array(code, colonne.tobytes()) for colonne in colonnes
+    )
+
+
+def resous_niveaux(
+    probleme: Probleme, marges: bool = False, travailleurs: int = 1
+) -> EDT:
+    """Même EDT que moteur.resous_natif, calculé niveau par niveau.
+
+    Exemple:
+    >>> probleme = Probleme.par_str('''
+    ... A / 1 /
+    ... B / 2 / A
+    ... C / 3 / A B
+    ... D / 4 / A
+    ... E / 5 /
+    ... '''
+    ... )
+    >>> [len(palier) for palier in niveaux(GrapheCompact(probleme))]
+    [2, 2, 1]
+    >>> resous_niveaux(probleme, marges=True) == resous_natif(probleme, marges=True)
+    True
+    """
+    ordre, colonnes = calcule_niveaux(probleme, marges, travailleurs)
+    return assemble(list(probleme.taches), ordre, colonnes)
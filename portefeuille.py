@@ -0,0 +1,317 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Portefeuille de projets liés entre eux.
+
+Chaque projet est un Probleme à part ; ses tâches sont désignées hors du
+projet par "projet:tache". Les liens entre projets donnent à une tâche un
+prérequis pris dans un autre projet.
+
+Le portefeuille se résout de deux façons. Portefeuille.resous construit le
+problème combiné (noms préfixés par le projet) et le résout d'un seul
+tenant, marges comprises. Portefeuille.edt résout projet par projet, dans
+l'ordre des liens : un prérequis venu d'un projet amont devient, dans le
+projet aval, une tâche sans prérequis dont la durée est sa date de fin.
+Chaque résultat est gardé avec la clé (empreinte du projet, liens, dates
+de fin amont) : après une modification, seuls le projet modifié et les
+projets aval dont ces dates ont changé sont résolus de nouveau. Les
+dates ainsi obtenues sont celles du problème combiné ; les marges, qui
+dépendent des projets aval, demandent la résolution combinée.
+"""
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .probleme import Duree, Nom, Probleme, Tache
+from .edt import EDT
+from .moteur import assemble, calcule
+
+SEPARATEUR = ":"
+
+# Lien entrant d'un projet : (tâche du projet, projet amont, tâche amont).
+Lien = Tuple[Nom, str, Nom]
+
+
+@dataclass(frozen=True)
+class _Resultat:
+    """Résolution gardée d'un projet (forme compacte, voir moteur.calcule)."""
+
+    cle: tuple
+    taches: List[Tache]
+    indices: Dict[Nom, int]
+    ordre: array
+    colonnes: tuple
+
+
+class Portefeuille:
+    """Projets nommés et liens entre leurs tâches.
+
+    Exemple:
+    >>> portefeuille = Portefeuille({
+    ...     "P1": Probleme.par_str("A / 2 /\\nB / 3 / A"),
+    ...     "P2": Probleme.par_str("X / 1 /\\nY / 4 / X"),
+    ... })
+    >>> portefeuille.lie("P2:Y", "P1:B")
+    >>> portefeuille.probleme()["P2:Y"]
+    Tache(nom='P2:Y', duree=4, prerequis=['P2:X', 'P1:B'])
+    >>> portefeuille.edt("P2")["Y"].debut
+    5
+    >>> portefeuille["P1"].modifie_duree("A", 1)
+    >>> portefeuille.rafraichit()
+    ['P1', 'P2']
+    >>> portefeuille["P2"].modifie_duree("X", 2)
+    >>> portefeuille.rafraichit()
+    ['P2']
+    """
+
+    def __init__(self, projets: Optional[Dict[str, Probleme]] = None):
+        """Portefeuille sans lien."""
+        self._projets: Dict[str, Probleme] = dict()
+        # Liens entrants de chaque projet.
+        self._liens: Dict[str, List[Lien]] = dict()
+        self._ordre: Optional[List[str]] = None
+        self._resultats: Dict[str, _Resultat] = dict()
+        self.resolutions = 0
+        for nom, probleme in (projets or {}).items():
+            self.ajoute_projet(nom, probleme)
+
+    def __len__(self) -> int:
+        """Nombre de projets."""
+        return len(self._projets)
+
+    def __getitem__(self, projet: str) -> Probleme:
+        """Accès aux projets par leurs noms."""
+        return self._projets[projet]
+
+    @property
+    def projets(self) -> Iterable[str]:
+        """Noms des projets, dans l'ordre d'ajout."""
+        yield from self._projets.keys()
+
+    @staticmethod
+    def _verifie_noms(projet: str, probleme: Probleme):
+        """Ni le projet ni ses tâches ne contiennent le séparateur."""
+        for nom in (projet, *probleme.noms):
+            if SEPARATEUR in nom:
+                raise ValueError(f"{nom} : '{SEPARATEUR}' est réservé aux projets.")
+
+    def ajoute_projet(self, projet: str, probleme: Probleme):
+        """Ajoute un projet sans lien."""
+        if projet in self._projets:
+            raise ValueError(f"Le projet {projet} est présent deux fois!")
+        self._verifie_noms(projet, probleme)
+        self._projets[projet] = probleme
+        self._liens[projet] = []
+        self._ordre = None
+
+    def remplace_projet(self, projet: str, probleme: Probleme):
+        """Remplace un projet en gardant ses liens, entrants et sortants."""
+        if projet not in self._projets:
+            raise ValueError(f"Le projet {projet} n'existe pas.")
+        self._verifie_noms(projet, probleme)
+        lies = [tache for tache, _, _ in self._liens[projet]]
+        for liens in self._liens.values():
+            lies += [nom for _, amont, nom in liens if amont == projet]
+        for tache in lies:
+            if tache not in probleme._taches:
+                raise ValueError(f"{tache} n'est pas une tâche existante.")
+        self._projets[projet] = probleme
+
+    def separe(self, nom: str) -> Tuple[str, Nom]:
+        """Projet et tâche désignés par "projet:tache"."""
+        projet, separateur, tache = nom.partition(SEPARATEUR)
+        if not separateur or projet not in self._projets:
+            raise ValueError(f"{nom} ne désigne pas la tâche d'un projet.")
+        if tache not in self._projets[projet]._taches:
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+        return projet, tache
+
+    def lie(self, tache: str, prerequis: str):
+        """Ajoute prerequis ("projet:tache") aux prérequis de tache.
+
+        Les liens entre projets ne doivent pas former de cycle entre
+        projets, même sans cycle entre tâches : les projets se résolvent
+        l'un après l'autre.
+        """
+        projet, locale = self.separe(tache)
+        amont, tache_amont = self.separe(prerequis)
+        if amont == projet:
+            raise ValueError(
+                f"{tache} et {prerequis} sont du même projet : "
+                f"utiliser Probleme.ajoute_prerequis."
+            )
+        lien = (locale, amont, tache_amont)
+        if lien in self._liens[projet]:
+            return
+        self._liens[projet].append(lien)
+        self._ordre = None
+        try:
+            self.ordre()
+        except ValueError:
+            self._liens[projet].pop()
+            self._ordre = None
+            raise ValueError(
+                f"{prerequis} ne peut pas précéder {tache} : cycle entre projets."
+            ) from None
+
+    def delie(self, tache: str, prerequis: str):
+        """Retire un lien entre projets."""
+        projet, locale = self.separe(tache)
+        amont, tache_amont = self.separe(prerequis)
+        self._liens[projet].remove((locale, amont, tache_amont))
+        self._ordre = None
+
+    def ordre(self) -> List[str]:
+        """Projets rangés de sorte que les projets amont passent avant."""
+        if self._ordre is None:
+            degres = {
+                projet: len({amont for _, amont, _ in liens})
+                for projet, liens in self._liens.items()
+            }
+            aval: Dict[str, Set[str]] = {projet: set() for projet in self._projets}
+            for projet, liens in self._liens.items():
+                for _, amont, _ in liens:
+                    aval[amont].add(projet)
+            rangs = {projet: rang for rang, projet in enumerate(self._projets)}
+            file = [projet for projet, degre in degres.items() if degre == 0]
+            for projet in file:
+                for suivant in sorted(aval[projet], key=rangs.__getitem__):
+                    degres[suivant] -= 1
+                    if degres[suivant] == 0:
+                        file.append(suivant)
+            if len(file) < len(self._projets):
+                raise ValueError("Les liens forment un cycle entre projets.")
+            self._ordre = file
+        return self._ordre
+
+    def amont(self, projet: str) -> Set[str]:
+        """Projets dont projet dépend, directement ou non."""
+        resultat: Set[str] = set()
+        pile = [projet]
+        while pile:
+            for _, amont, _ in self._liens[pile.pop()]:
+                if amont not in resultat:
+                    resultat.add(amont)
+                    pile.append(amont)
+        return resultat
+
+    def probleme(self) -> Probleme:
+        """Problème combiné, aux noms préfixés par leur projet.
+
+        Les capacités des projets sont réunies ; une même ressource doit
+        avoir la même capacité partout. Les projets sont valides et leurs
+        liens ne forment pas de cycle : le problème combiné est construit
+        sans nouvelle vérification.
+        """
+        entrants: Dict[str, List[str]] = dict()
+        capacites: Dict[str, int] = dict()
+        for projet, probleme in self._projets.items():
+            for ressource, capacite in probleme.capacites.items():
+                if capacites.setdefault(ressource, capacite) != capacite:
+                    raise ValueError(f"{ressource} : capacités différentes.")
+            for tache, amont, tache_amont in self._liens[projet]:
+                # Les tâches liées ont pu être retirées depuis.
+                nom = projet + SEPARATEUR + tache
+                prerequis = amont + SEPARATEUR + tache_amont
+                self.separe(nom)
+                self.separe(prerequis)
+                entrants.setdefault(nom, []).append(prerequis)
+        taches: Dict[Nom, Tache] = dict()
+        for projet, probleme in self._projets.items():
+            prefixe = projet + SEPARATEUR
+            for tache in probleme.taches:
+                nom = prefixe + tache.nom
+                taches[nom] = Tache(
+                    nom,
+                    tache.duree,
+                    [prefixe + autre for autre in tache.prerequis]
+                    + entrants.get(nom, []),
+                    tache.loi,
+                    dict(tache.ressources),
+                    liens=tache.liens
+                    and {prefixe + autre: lien for autre, lien in tache.liens.items()},
+                )
+        return Probleme._depuis_dict(taches, capacites)
+
+    def resous(self, moteur: str = "natif", marges: bool = False) -> EDT:
+        """Résout le problème combiné d'un seul tenant (voir algorithme.resous)."""
+        from .algorithme import resous
+
+        return resous(self.probleme(), moteur=moteur, marges=marges)
+
+    def _fin(self, projet: str, tache: Nom) -> Duree:
+        """Date de fin d'une tâche d'un projet déjà résolu."""
+        resultat = self._resultats[projet]
+        if tache not in resultat.indices:
+            nom = projet + SEPARATEUR + tache
+            raise ValueError(f"{nom} n'est pas une tâche existante.")
+        return resultat.colonnes[1][resultat.indices[tache]]
+
+    def _resous_projet(self, projet: str) -> bool:
+        """Résout le projet si sa clé a changé ; renvoie s'il a été résolu."""
+        probleme = self._projets[projet]
+        liens = tuple(self._liens[projet])
+        bornes = tuple(self._fin(amont, tache_amont) for _, amont, tache_amont in liens)
+        cle = (probleme.empreinte(), liens, bornes)
+        ancien = self._resultats.get(projet)
+        if ancien is not None and ancien.cle == cle:
+            return False
+
+        taches = list(probleme.taches)
+        indices = {tache.nom: indice for indice, tache in enumerate(taches)}
+        # Une tâche sans prérequis par tâche amont, à la suite des tâches.
+        externes: Dict[Tuple[str, Nom], int] = dict()
+        entrants: Dict[int, List[int]] = dict()
+        durees_externes: List[Duree] = []
+        for (tache, amont, tache_amont), fin in zip(liens, bornes):
+            if tache not in indices:
+                raise ValueError(f"{tache} n'est pas une tâche existante.")
+            if (amont, tache_amont) not in externes:
+                externes[amont, tache_amont] = len(taches) + len(externes)
+                durees_externes.append(fin)
+            entrants.setdefault(indices[tache], []).append(
+                externes[amont, tache_amont]
+            )
+        noms = [tache.nom for tache in taches]
+        noms += [amont + SEPARATEUR + tache for amont, tache in externes]
+        debuts, prerequis = [0], []
+        for indice, tache in enumerate(taches):
+            prerequis.extend(indices[autre] for autre in tache.prerequis)
+            prerequis.extend(entrants.get(indice, ()))
+            debuts.append(len(prerequis))
+        debuts.extend([len(prerequis)] * len(externes))
+        local = Probleme._depuis_csr(
+            noms,
+            [tache.duree for tache in taches] + durees_externes,
+            debuts,
+            prerequis,
+            liens={tache.nom: tache.liens for tache in taches if tache.liens},
+        )
+        ordre, colonnes = calcule(local)
+        ordre = array("q", [indice for indice in ordre if indice < len(taches)])
+        self._resultats[projet] = _Resultat(cle, taches, indices, ordre, colonnes)
+        self.resolutions += 1
+        return True
+
+    def rafraichit(self, projets: Optional[Iterable[str]] = None) -> List[str]:
+        """Résout les projets dont la clé a changé ; renvoie leurs noms.
+
+        Sans projets, tout le portefeuille ; sinon ces projets et leurs
+        projets amont.
+        """
+        if projets is None:
+            voulus = set(self._projets)
+        else:
+            voulus = set()
+            for projet in projets:
+                voulus |= {projet, *self.amont(projet)}
+        return [
+            projet
+            for projet in self.ordre()
+            if projet in voulus and self._resous_projet(projet)
+        ]
+
+    def edt(self, projet: str) -> EDT:
+        """EDT d'un projet (noms locaux, dates du portefeuille), sans marges."""
+        self.rafraichit([projet])
+        resultat = self._resultats[projet]
+        return assemble(resultat.taches, resultat.ordre, resultat.colonnes)
@@ -5,26 +5,256 @@ Classes Tache et Probleme permettant de décrire le problème d'ordonnancement.
 TODO:
     - Refactor _est_valide pour avoir des exceptions directement dans __init__
 """
-from typing import Any, Dict, List, Union, Generator
-from dataclasses import dataclass
-from rich.table import Table
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    Generator,
+)
+from collections.abc import Mapping
+from os import PathLike
+from dataclasses import dataclass, field, replace
+import gc
+import hashlib
+import re
+import weakref
+
+if TYPE_CHECKING:
+    from rich.table import Table
+    from .aleas import Loi
 
 Duree = Union[int, float]
 Nom = str
 
+# Types de liens : le premier caractère dit quelle date du prérequis compte
+# (F : fin, S : début), le second laquelle de la tâche est contrainte. Dans
+# la position d'un type, le bit 0 vaut 1 si c'est le début du prérequis,
+# le bit 1 si c'est la fin de la tâche.
+TYPES_LIENS = ("FS", "SS", "FF", "SF")
+# Prérequis au format de par_str : nom:TYPE suivi d'un décalage facultatif.
+_MOTIF_LIEN = re.compile(r"(.+):(FS|SS|FF|SF)([+-]\d+(?:\.\d*)?)?")
+
+
+@dataclass(frozen=True)
+class Lien:
+    """Lien de précédence typé, avec décalage.
+
+    FS : la tâche commence après la fin du prérequis ; SS : après son
+    début ; FF : elle finit après la fin du prérequis ; SF : elle finit
+    après son début. Le décalage s'ajoute à la date du prérequis : positif
+    pour une attente, négatif pour un recouvrement.
+    Exemple:
+    >>> Lien("SS", 2).debut_min(debut=1, fin=5, duree=3)
+    3
+    >>> Lien("FF", -1).debut_min(debut=1, fin=5, duree=3)
+    1
+    """
+
+    type: str = "FS"
+    decalage: Duree = 0
+
+    def __post_init__(self):
+        """Vérifie le type."""
+        if self.type not in TYPES_LIENS:
+            raise ValueError(f"Type de lien inconnu : {self.type}.")
+
+    @property
+    def code(self) -> int:
+        """Position dans TYPES_LIENS (voir moteur.GrapheCompact)."""
+        return TYPES_LIENS.index(self.type)
+
+    def debut_min(self, debut: Duree, fin: Duree, duree: Duree) -> Duree:
+        """Plus petit début de la tâche pour un prérequis daté (debut, fin)."""
+        date = (debut if self.type[0] == "S" else fin) + self.decalage
+        return date - duree if self.type[1] == "F" else date
+
+    def __str__(self) -> str:
+        """Format de par_str, sans le nom du prérequis."""
+        if not self.decalage:
+            return self.type
+        return f"{self.type}{self.decalage:+}"
+
+
+FIN_DEBUT = Lien()
+
 
 @dataclass
 class Tache:
-    """Représente une tâche."""
+    """Représente une tâche.
+
+    ``loi`` décrit, si besoin, l'incertitude sur la durée (voir le module
+    aleas) ; duree reste la valeur utilisée par les résolutions classiques.
+    ``ressources`` donne la quantité de chaque ressource renouvelable
+    occupée pendant toute la tâche (voir le module ressources).
+    ``liens`` donne le Lien des prérequis qui ne sont pas de simples
+    fin-début sans décalage ; None (et non un dictionnaire vide) quand il
+    n'y en a pas, pour ne pas payer un dictionnaire par tâche.
+    """
 
     nom: Nom
     duree: Duree
     prerequis: List[Nom]
+    loi: Optional["Loi"] = field(default=None, repr=False)
+    ressources: Dict[str, int] = field(default_factory=dict, repr=False)
+    liens: Optional[Dict[Nom, Lien]] = field(default=None, repr=False)
 
     def __post_init__(self):
-        """Vérifie que la durée est positive."""
+        """Vérifie que la durée et les demandes sont positives."""
         if self.duree < 0:
             raise ValueError("La durée doit être positive.")
+        if any(quantite < 0 for quantite in self.ressources.values()):
+            raise ValueError("Les demandes de ressources doivent être positives.")
+        if self.liens is not None:
+            self.liens = {
+                nom: lien for nom, lien in self.liens.items() if lien != FIN_DEBUT
+            } or None
+            for nom in self.liens or ():
+                if nom not in self.prerequis:
+                    raise ValueError(f"{self.nom} : lien vers {nom}, hors prérequis.")
+
+    def lien(self, prerequis: Nom) -> Lien:
+        """Lien avec un prérequis ; fin-début sans décalage par défaut."""
+        if self.liens is None:
+            return FIN_DEBUT
+        return self.liens.get(prerequis, FIN_DEBUT)
+
+
+class _TachesCSR(Mapping):
+    """Tâches d'un problème construit par colonnes, créées à la demande.
+
+    Les colonnes au format CSR (voir moteur.GrapheCompact) sont déjà
+    vérifiées : les moteurs les lisent directement, et une tâche n'est
+    créée qu'au premier accès, puis gardée. La première mutation du
+    problème remplace ce dictionnaire par un dict (voir Probleme._prepare).
+    """
+
+    def __init__(
+        self,
+        noms: List[Nom],
+        durees: List[Duree],
+        debuts: List[int],
+        prerequis: List[int],
+        liens: Optional[Dict[Nom, Dict[Nom, Lien]]] = None,
+    ):
+        """Prend possession des colonnes, sans copie."""
+        self.noms = noms
+        self.durees = durees
+        self.debuts = debuts
+        self.prerequis = prerequis
+        self.liens = liens or {}
+        self._creees: List[Optional[Tache]] = [None] * len(noms)
+        self._toutes = not noms
+        self._indices: Optional[Dict[Nom, int]] = None
+
+    def cree(self, indice: int) -> Tache:
+        """Tâche d'indice donné, lue dans les colonnes.
+
+        Les colonnes étant vérifiées, Tache.__post_init__ n'est pas rejoué.
+        """
+        noms, debuts = self.noms, self.debuts
+        nom = noms[indice]
+        liens = self.liens.get(nom)
+        suite = self.prerequis[debuts[indice] : debuts[indice + 1]]
+        tache = object.__new__(Tache)
+        tache.__dict__ = {
+            "nom": nom,
+            "duree": self.durees[indice],
+            "prerequis": [noms[autre] for autre in suite],
+            "loi": None,
+            "ressources": {},
+            "liens": None if liens is None else dict(liens),
+        }
+        return tache
+
+    def tache(self, indice: int) -> Tache:
+        """Tâche d'indice donné, créée au premier accès."""
+        tache = self._creees[indice]
+        if tache is None:
+            tache = self._creees[indice] = self.cree(indice)
+        return tache
+
+    def _index(self) -> Dict[Nom, int]:
+        """Indice de chaque nom, construit au premier accès par nom."""
+        if self._indices is None:
+            self._indices = dict(zip(self.noms, range(len(self.noms))))
+        return self._indices
+
+    def __getitem__(self, nom: Nom) -> Tache:
+        """Accès par nom, comme un dict."""
+        return self.tache(self._index()[nom])
+
+    def __contains__(self, nom: Any) -> bool:
+        """Appartenance d'un nom."""
+        return nom in self._index()
+
+    def __iter__(self) -> Iterator[Nom]:
+        """Noms, dans l'ordre des colonnes."""
+        return iter(self.noms)
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self.noms)
+
+    def values(self) -> Iterator[Tache]:
+        """Tâches, dans l'ordre, toutes créées au premier parcours.
+
+        Les tâches ne forment pas de cycles de références : le
+        ramasse-miettes est suspendu pendant leur création, ses passages ne
+        libéreraient rien et coûteraient plus que la création elle-même.
+        """
+        if not self._toutes:
+            creees, cree = self._creees, self.cree
+            actif = gc.isenabled()
+            gc.disable()
+            try:
+                for indice, tache in enumerate(creees):
+                    if tache is None:
+                        creees[indice] = cree(indice)
+            finally:
+                if actif:
+                    gc.enable()
+            self._toutes = True
+        return iter(self._creees)
+
+    def items(self) -> Iterator[tuple]:
+        """Paires (nom, tâche), dans l'ordre."""
+        return zip(self.noms, self.values())
+
+
+@dataclass(frozen=True)
+class Analyse:
+    """Résultat de la vérification des prérequis (voir Probleme.analyse).
+
+    ordre contient les tâches dans un ordre topologique ; si le problème n'a
+    pas de solution, il s'arrête aux tâches ordonnables, cycle donne un
+    cycle de prérequis (chaque tâche est un prérequis de la suivante, la
+    dernière de la première) et bloquees toutes les tâches non ordonnées :
+    celles du cycle et celles qui en dépendent.
+    """
+
+    ordre: List[Nom]
+    cycle: List[Nom]
+    bloquees: List[Nom]
+    _successeurs: Dict[Nom, List[Nom]] = field(repr=False, compare=False)
+
+    @property
+    def valide(self) -> bool:
+        """Vrai si le problème a une solution."""
+        return not self.bloquees
+
+    def erreur(self) -> ValueError:
+        """Erreur qui décrit le cycle."""
+        boucle = " -> ".join(self.cycle + self.cycle[:1])
+        return ValueError(
+            f"Le problème n'a pas de solution : cycle {boucle}, "
+            f"{len(self.bloquees)} tâche(s) bloquée(s)."
+        )
 
 
 class Probleme:
@@ -93,8 +323,15 @@ class Probleme:
     └───────┴───────┴───────────┘
     """
 
-    def __init__(self, taches: List[Tache]):
-        """Stocke la liste des tâches sous forme de dictionnaire."""
+    def __init__(
+        self, taches: List[Tache], capacites: Optional[Dict[str, int]] = None
+    ):
+        """Stocke la liste des tâches sous forme de dictionnaire.
+
+        capacites donne la quantité disponible de chaque ressource
+        renouvelable ; elle n'est utilisée que par le module ressources.
+        """
+        self.capacites: Dict[str, int] = dict(capacites or {})
         self._taches: Dict[Nom, Tache] = dict()
         for tache in taches:
             if tache.nom in self._taches:
@@ -102,30 +339,202 @@ class Probleme:
             self._taches[tache.nom] = tache
 
         self._est_valide()
+        self._initialise()
+
+    def _initialise(self):
+        """Etat dérivé des tâches, commun à tous les constructeurs."""
+        # Ordre topologique entretenu par les mutations, construit au besoin.
+        self._successeurs: Optional[Dict[Nom, List[Nom]]] = None
+        self._rangs: Optional[Dict[Nom, int]] = None
+        self._rang_suivant = 0
+        self._edts: List[weakref.ref] = []
+        # Vérification des prérequis, oubliée à chaque changement d'arête.
+        self._analyse: Optional[Analyse] = None
+        # Empreinte du contenu, oubliée à chaque mutation.
+        self._empreinte: Optional[str] = None
+
+    def __getstate__(self) -> dict:
+        """Les liens vers les EDT ne voyagent pas entre processus."""
+        etat = dict(vars(self))
+        etat["_edts"] = []
+        return etat
+
+    @classmethod
+    def _depuis_dict(
+        cls, taches: Dict[Nom, Tache], capacites: Optional[Dict[str, int]] = None
+    ) -> "Probleme":
+        """Construit sans revalider un dictionnaire déjà vérifié."""
+        probleme = cls.__new__(cls)
+        probleme.capacites = dict(capacites or {})
+        probleme._taches = taches
+        probleme._initialise()
+        return probleme
+
+    @staticmethod
+    def _nombre(texte: str) -> Duree:
+        """Entier, ou flottant à défaut."""
+        try:
+            return int(texte)
+        except ValueError:
+            return float(texte)
 
     @staticmethod
     def _encode(ligne) -> Tache:
         """Encode une ligne en tache."""
         nom, duree, prerequis = ligne.split("/")
         nom_valide = nom.strip()
-        try:
-            duree_valide: Duree = int(duree.strip())
-        except ValueError:
-            duree_valide = float(duree.strip())
+        duree_valide = Probleme._nombre(duree.strip())
         prerequis_valide = prerequis.split()
+        liens: Dict[Nom, Lien] = dict()
+        for position, element in enumerate(prerequis_valide):
+            correspondance = _MOTIF_LIEN.fullmatch(element)
+            if correspondance is None:
+                continue
+            autre, type_lien, decalage = correspondance.groups()
+            lien = Lien(type_lien, Probleme._nombre(decalage) if decalage else 0)
+            if liens.setdefault(autre, lien) != lien:
+                raise ValueError(f"{nom_valide} : deux liens différents vers {autre}.")
+            prerequis_valide[position] = autre
         return Tache(
-            nom=nom_valide, duree=duree_valide, prerequis=prerequis_valide
+            nom=nom_valide,
+            duree=duree_valide,
+            prerequis=prerequis_valide,
+            liens=liens or None,
         )
 
     @classmethod
     def par_str(cls, message: str) -> "Probleme":
-        """Constructeur alternatif."""
+        """Constructeur alternatif.
+
+        Un prérequis s'écrit nom, ou nom:TYPE suivi d'un décalage
+        facultatif pour un lien typé (voir Lien).
+        Exemple:
+        >>> probleme = Probleme.par_str("A / 4 /\\nB / 3 / A:SS+2\\nC / 1 / A B:FF-1")
+        >>> probleme["B"].prerequis, str(probleme["B"].lien("A"))
+        (['A'], 'SS+2')
+        >>> str(probleme["C"].lien("A")), str(probleme["C"].lien("B"))
+        ('FS', 'FF-1')
+        """
         taches = list()
         for ligne in message.strip().splitlines():
             taches.append(cls._encode(ligne))
 
         return cls(taches)
 
+    @classmethod
+    def par_flux(cls, lignes: Iterable[str]) -> "Probleme":
+        """Constructeur à partir de n'importe quel itérateur de lignes.
+
+        Les lignes vides et celles qui commencent par # sont ignorées. Les
+        tâches vont directement dans le dictionnaire ; seuls les prérequis
+        encore inconnus sont retenus (avec leur première ligne) et vérifiés
+        à la fin, ce qui borne la mémoire en plus du résultat.
+        """
+        taches: Dict[Nom, Tache] = dict()
+        inconnus: Dict[Nom, int] = dict()
+        for numero, ligne in enumerate(lignes, start=1):
+            contenu = ligne.strip()
+            if not contenu or contenu.startswith("#"):
+                continue
+            if contenu.count("/") != 2:
+                raise ValueError(
+                    f"Ligne {numero} : format attendu 'nom / durée / prérequis'."
+                )
+            try:
+                tache = cls._encode(contenu)
+            except ValueError as erreur:
+                raise ValueError(f"Ligne {numero} : {erreur}") from erreur
+            if tache.nom in taches:
+                raise ValueError(
+                    f"Ligne {numero} : {tache.nom} est présente deux fois!"
+                )
+            taches[tache.nom] = tache
+            inconnus.pop(tache.nom, None)
+            for nom in tache.prerequis:
+                if nom not in taches:
+                    inconnus.setdefault(nom, numero)
+
+        for nom, numero in inconnus.items():
+            raise ValueError(
+                f"Ligne {numero} : {nom} n'est pas une tâche existante."
+            )
+        return cls._depuis_dict(taches)
+
+    @classmethod
+    def _depuis_csr(
+        cls,
+        noms: List[Nom],
+        durees: List[Duree],
+        debuts: List[int],
+        prerequis: List[int],
+        capacites: Optional[Dict[str, int]] = None,
+        liens: Optional[Dict[Nom, Dict[Nom, Lien]]] = None,
+    ) -> "Probleme":
+        """Construit sans revalider des colonnes au format CSR.
+
+        Les colonnes restent la référence : les tâches sont créées à la
+        demande (voir _TachesCSR). liens donne les liens typés des tâches
+        qui en ont.
+        """
+        probleme = cls.__new__(cls)
+        probleme.capacites = dict(capacites or {})
+        probleme._taches = _TachesCSR(noms, durees, debuts, prerequis, liens)
+        probleme._initialise()
+        return probleme
+
+    @classmethod
+    def par_colonnes(
+        cls,
+        noms: Sequence[Nom],
+        durees: Sequence[Duree],
+        prerequis: Sequence[Union[str, Sequence[Nom]]],
+        capacites: Optional[Dict[str, int]] = None,
+    ) -> "Probleme":
+        """Constructeur à partir de colonnes (tableaux NumPy ou séquences).
+
+        prerequis donne pour chaque tâche la liste de ses prérequis, ou une
+        chaîne de noms séparés par des espaces. Les vérifications sont
+        vectorisées (voir le module chargement).
+        Exemple:
+        >>> Probleme.par_colonnes(["A", "B", "C"], [1, 2, 3], [[], ["A"], "A B"])
+        Probleme(taches=[Tache(nom='A', duree=1, prerequis=[]), Tache(nom='B', duree=2, prerequis=['A']), Tache(nom='C', duree=3, prerequis=['A', 'B'])])
+        """
+        from .chargement import depuis_listes
+
+        return cls._depuis_csr(*depuis_listes(noms, durees, prerequis), capacites)
+
+    @classmethod
+    def par_aretes(
+        cls,
+        noms: Sequence[Nom],
+        durees: Sequence[Duree],
+        aretes: Sequence[Sequence[Nom]],
+        capacites: Optional[Dict[str, int]] = None,
+    ) -> "Probleme":
+        """Constructeur à partir d'une table d'arêtes (prérequis, tâche).
+
+        Les prérequis d'une tâche suivent l'ordre des arêtes.
+        Exemple:
+        >>> aretes = [("A", "C"), ("B", "C")]
+        >>> Probleme.par_aretes(["A", "B", "C"], [1, 2, 3], aretes)["C"]
+        Tache(nom='C', duree=3, prerequis=['A', 'B'])
+        """
+        from .chargement import depuis_aretes
+
+        return cls._depuis_csr(*depuis_aretes(noms, durees, aretes), capacites)
+
+    @classmethod
+    def par_fichier(
+        cls, chemin: Union[str, PathLike], encodage: str = "utf-8"
+    ) -> "Probleme":
+        """Constructeur à partir d'un fichier lu ligne à ligne."""
+        with open(chemin, encoding=encodage) as fichier:
+            return cls.par_flux(fichier)
+
+    def __len__(self) -> int:
+        """Nombre de tâches."""
+        return len(self._taches)
+
     @property
     def taches(self) -> Generator[Tache, None, None]:
         """Itére sur les tâches."""
@@ -148,10 +557,17 @@ class Probleme:
         """Egalite."""
         if type(autre) != type(self):
             return False
-        return self._taches == autre._taches
+        return (
+            self._taches == autre._taches and self.capacites == autre.capacites
+        )
 
     def __repr__(self) -> str:
         """Renvoie la liste de construction."""
+        if self.capacites:
+            return (
+                f"Probleme(taches={list(self.taches) !r}, "
+                f"capacites={self.capacites !r})"
+            )
         return f"Probleme(taches={list(self.taches) !r})"
 
     def __str__(self) -> str:
@@ -162,21 +578,297 @@ class Probleme:
         """Accès aux tâches par leurs noms."""
         return self._taches[nom]
 
-    def genere_table(self) -> Table:
-        """Renvoie une table rich."""
-        resultat = Table(title="Problème d'ordonnancement")
-        resultat.add_column("Tache")
-        resultat.add_column("Durée")
-        resultat.add_column("Prérequis")
+    def analyse(self) -> Analyse:
+        """Ordre topologique ou cycle, calculé une fois par problème.
+
+        Un seul parcours de Kahn ordonne les tâches, génération par
+        génération dans l'ordre de déclaration ; s'il en reste, chacune a
+        un prérequis restant et remonter ces prérequis mène à un cycle.
+        Exemple:
+        >>> probleme = Probleme.par_str('''
+        ... A / 1 / C
+        ... B / 2 / A
+        ... C / 3 / B
+        ... D / 1 /
+        ... E / 1 / B
+        ... '''
+        ... )
+        >>> analyse = probleme.analyse()
+        >>> analyse.ordre, analyse.cycle, analyse.bloquees
+        (['D'], ['A', 'B', 'C'], ['A', 'B', 'C', 'E'])
+        >>> probleme.verifie()
+        Traceback (most recent call last):
+        ...
+        ValueError: Le problème n'a pas de solution : cycle A -> B -> C -> A, 4 tâche(s) bloquée(s).
+        """
+        if self._analyse is not None:
+            return self._analyse
+        successeurs: Dict[Nom, List[Nom]] = {nom: [] for nom in self._taches}
+        degres = dict()
         for tache in self.taches:
-            resultat.add_row(
-                tache.nom, str(tache.duree), str(", ".join(tache.prerequis))
+            uniques = dict.fromkeys(tache.prerequis)
+            degres[tache.nom] = len(uniques)
+            for prerequis in uniques:
+                successeurs[prerequis].append(tache.nom)
+        ordre = [nom for nom, degre in degres.items() if degre == 0]
+        for nom in ordre:
+            for suivant in successeurs[nom]:
+                degres[suivant] -= 1
+                if degres[suivant] == 0:
+                    ordre.append(suivant)
+
+        bloquees = [nom for nom, degre in degres.items() if degre > 0]
+        cycle: List[Nom] = []
+        if bloquees:
+            chemin: Dict[Nom, int] = dict()
+            nom = bloquees[0]
+            while nom not in chemin:
+                chemin[nom] = len(chemin)
+                nom = next(
+                    autre
+                    for autre in self._taches[nom].prerequis
+                    if degres[autre] > 0
+                )
+            # Remis dans le sens des prérequis, en commençant par nom.
+            cycle = list(chemin)[chemin[nom] :]
+            cycle.reverse()
+            cycle = cycle[-1:] + cycle[:-1]
+        self._analyse = Analyse(ordre, cycle, bloquees, successeurs)
+        return self._analyse
+
+    def verifie(self) -> List[Nom]:
+        """Renvoie l'ordre topologique, ou lève une erreur qui décrit le cycle."""
+        analyse = self.analyse()
+        if not analyse.valide:
+            raise analyse.erreur()
+        return analyse.ordre
+
+    def empreinte(self) -> str:
+        """Empreinte stable des noms, durées et prérequis, dans l'ordre.
+
+        Deux problèmes égaux ont la même empreinte, d'un processus à
+        l'autre ; elle sert de clé au cache des résolutions (module cache).
+        Seules les mutations faites par les méthodes du problème la
+        renouvellent.
+        Exemple:
+        >>> un = Probleme.par_str("A / 1 /\\nB / 2 / A")
+        >>> deux = Probleme.par_str("A / 1 /\\nB / 2 / A")
+        >>> un.empreinte() == deux.empreinte()
+        True
+        >>> deux.modifie_duree("B", 3)
+        >>> un.empreinte() == deux.empreinte()
+        False
+        """
+        if self._empreinte is None:
+            somme = hashlib.blake2b(digest_size=16)
+            for tache in self.taches:
+                # Chaque champ est préfixé par sa longueur : pas d'ambiguïté
+                # quels que soient les caractères des noms.
+                champs = [tache.nom, repr(tache.duree), *tache.prerequis]
+                if tache.liens:
+                    # Sans lien typé, l'empreinte reste celle d'avant les liens.
+                    champs.append("\xfe")
+                    champs += [
+                        f"{nom}:{tache.liens[nom]}" for nom in sorted(tache.liens)
+                    ]
+                for champ in champs:
+                    octets = champ.encode("utf-8")
+                    somme.update(len(octets).to_bytes(4, "little") + octets)
+                somme.update(b"\xff" * 4)
+            self._empreinte = somme.hexdigest()
+        return self._empreinte
+
+    def _invalide(self, aretes: bool = True):
+        """Oublie l'empreinte, et l'analyse après un changement de prérequis."""
+        self._empreinte = None
+        if aretes:
+            self._analyse = None
+
+    def _prepare(self):
+        """Construit successeurs et rangs topologiques s'ils manquent.
+
+        Appelée avant toute mutation : des tâches lues dans des colonnes
+        deviennent un dict ordinaire.
+        """
+        if not isinstance(self._taches, dict):
+            self._taches = dict(self._taches.items())
+        if self._rangs is not None:
+            return
+        ordre = self.verifie()
+        self._successeurs = {
+            nom: list(suivants)
+            for nom, suivants in self.analyse()._successeurs.items()
+        }
+        self._rangs = {nom: rang for rang, nom in enumerate(ordre)}
+        self._rang_suivant = len(ordre)
+
+    def successeurs(self, nom: Nom) -> List[Nom]:
+        """Renvoie les tâches qui ont nom pour prérequis."""
+        self._prepare()
+        return self._successeurs[nom]
+
+    def rang(self, nom: Nom) -> int:
+        """Position de la tâche dans un ordre topologique entretenu."""
+        self._prepare()
+        return self._rangs[nom]
+
+    def lie(self, edt):
+        """Met à jour edt après chaque mutation du problème."""
+        self._prepare()
+        self._edts.append(weakref.ref(edt))
+
+    def _notifie(self, noms: Iterable[Nom], retiree: Optional[Nom] = None):
+        """Propage les changements aux emplois du temps liés."""
+        noms = list(noms)
+        self._edts = [lien for lien in self._edts if lien() is not None]
+        for lien in self._edts:
+            edt = lien()
+            if retiree is not None:
+                edt.retire(retiree)
+            edt.propage(self, noms)
+
+    def _remplace(self, nom: Nom, duree: Duree, prerequis: List[Nom]):
+        """Remplace la tâche plutôt que de modifier un objet partagé."""
+        tache = self._taches[nom]
+        liens = tache.liens
+        if liens is not None:
+            liens = {autre: liens[autre] for autre in liens if autre in prerequis}
+        self._taches[nom] = replace(
+            tache, duree=duree, prerequis=prerequis, liens=liens
+        )
+
+    def modifie_duree(self, nom: Nom, duree: Duree):
+        """Change la durée d'une tâche."""
+        tache = self[nom]
+        self._prepare()
+        self._remplace(nom, duree, list(tache.prerequis))
+        self._invalide(aretes=False)
+        self._notifie([nom])
+
+    def ajoute_prerequis(self, nom: Nom, prerequis: Nom):
+        """Ajoute prerequis aux prérequis de nom.
+
+        Seule la zone comprise entre les rangs des deux tâches est
+        parcourue pour détecter un cycle et réordonner (Pearce-Kelly).
+        """
+        tache = self[nom]
+        if prerequis not in self._taches:
+            raise ValueError(f"{prerequis} n'est pas une tâche existante.")
+        if prerequis == nom:
+            raise ValueError(f"{nom} ne peut pas être son propre prérequis.")
+        if prerequis in tache.prerequis:
+            return
+        self._prepare()
+        rangs = self._rangs
+        if rangs[nom] < rangs[prerequis]:
+            borne_basse, borne_haute = rangs[nom], rangs[prerequis]
+            avant = self._parcours(
+                nom,
+                lambda autre: self._successeurs[autre],
+                lambda autre: rangs[autre] <= borne_haute,
+            )
+            if prerequis in avant:
+                raise ValueError(
+                    f"{prerequis} ne peut pas précéder {nom} : cycle."
+                )
+            arriere = self._parcours(
+                prerequis,
+                lambda autre: self._taches[autre].prerequis,
+                lambda autre: rangs[autre] >= borne_basse,
+            )
+            deplaces = sorted(arriere, key=rangs.__getitem__) + sorted(
+                avant, key=rangs.__getitem__
             )
+            places = sorted(rangs[autre] for autre in deplaces)
+            for autre, rang in zip(deplaces, places):
+                rangs[autre] = rang
+        self._successeurs[prerequis].append(nom)
+        self._remplace(nom, tache.duree, tache.prerequis + [prerequis])
+        self._invalide()
+        self._notifie([nom])
+
+    @staticmethod
+    def _parcours(depart: Nom, voisins, garde) -> set:
+        """Tâches atteignables depuis depart sans sortir de la garde."""
+        vus = {depart}
+        pile = [depart]
+        while pile:
+            for voisin in voisins(pile.pop()):
+                if voisin not in vus and garde(voisin):
+                    vus.add(voisin)
+                    pile.append(voisin)
+        return vus
+
+    def retire_prerequis(self, nom: Nom, prerequis: Nom):
+        """Retire prerequis des prérequis de nom."""
+        tache = self[nom]
+        if prerequis not in tache.prerequis:
+            raise ValueError(f"{prerequis} n'est pas un prérequis de {nom}.")
+        self._prepare()
+        self._successeurs[prerequis].remove(nom)
+        restants = [autre for autre in tache.prerequis if autre != prerequis]
+        self._remplace(nom, tache.duree, restants)
+        self._invalide()
+        self._notifie([nom])
+
+    def ajoute_tache(self, tache: Tache):
+        """Ajoute une tâche dont les prérequis existent déjà."""
+        if tache.nom in self._taches:
+            raise ValueError(f"{tache.nom} est présente deux fois!")
+        for nom in tache.prerequis:
+            if nom not in self._taches:
+                raise ValueError(f"{nom} n'est pas une tâche existante.")
+        self._prepare()
+        # Sans successeur, la nouvelle tâche peut passer après toutes les autres.
+        self._rangs[tache.nom] = self._rang_suivant
+        self._rang_suivant += 1
+        self._successeurs[tache.nom] = []
+        for nom in dict.fromkeys(tache.prerequis):
+            self._successeurs[nom].append(tache.nom)
+        self._taches[tache.nom] = tache
+        self._invalide()
+        self._notifie([tache.nom])
+
+    def retire_tache(self, nom: Nom):
+        """Retire une tâche, et la retire des prérequis de ses successeurs."""
+        tache = self[nom]
+        self._prepare()
+        successeurs = self._successeurs.pop(nom)
+        for prerequis in dict.fromkeys(tache.prerequis):
+            self._successeurs[prerequis].remove(nom)
+        for suivant in dict.fromkeys(successeurs):
+            autre = self._taches[suivant]
+            restants = [p for p in autre.prerequis if p != nom]
+            self._remplace(suivant, autre.duree, restants)
+        del self._taches[nom]
+        del self._rangs[nom]
+        self._invalide()
+        self._notifie(dict.fromkeys(successeurs), retiree=nom)
+
+    def genere_table(self) -> "Table":
+        """Renvoie une table rich."""
+        from .export import table
+
+        return table(self)
+
+    def affiche(
+        self,
+        colonnes: Optional[Sequence[str]] = None,
+        page: int = 1,
+        taille_page: Optional[int] = None,
+    ):
+        """Affiche une page de la table (voir export.affiche)."""
+        from .export import affiche
 
-        return resultat
+        affiche(self, colonnes, page, taille_page)
 
-    def affiche(self):
-        """Affiche la table directement."""
-        from rich import print
+    def exporte(
+        self,
+        fichier="-",
+        format: Optional[str] = None,
+        colonnes: Optional[Sequence[str]] = None,
+    ):
+        """Ecrit les tâches en CSV, TSV ou JSON Lines (voir export.ecrit)."""
+        from .export import ecrit
 
-        print(self.genere_table())
\ No newline at end of file
+        ecrit(self, fichier, format, colonnes)
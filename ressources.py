@@ -0,0 +1,289 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Ordonnancement sous contraintes de ressources renouvelables.
+
+Chaque tâche occupe, pendant toute sa durée, les quantités de ressources
+données par ``Tache.ressources`` ; ``Probleme.capacites`` borne l'occupation
+de chaque ressource à tout instant. Deux schémas de génération sont
+proposés :
+- "serie" place les tâches une à une, dans l'ordre des priorités, à la
+  première date où les prérequis sont finis et les ressources suffisent
+  (profil de ressources découpé en intervalles) ;
+- "parallele" avance dans le temps de fin de tâche en fin de tâche (file
+  de priorité d'événements) et démarre, dans l'ordre des priorités, les
+  tâches prêtes qui tiennent dans les ressources libres.
+Les priorités viennent d'une résolution sans ressources (voir REGLES).
+"""
+from bisect import bisect_right
+from heapq import heapify, heappop, heappush, heapreplace
+from typing import Callable, Dict, Iterable, List, Tuple
+from .probleme import Duree, Probleme
+from .edt import EDT
+from .moteur import GrapheCompact, _sans_liens, _zeros, assemble, calcule
+
+Demandes = List[Tuple[int, int]]
+
+REGLES: Dict[str, Callable] = {
+    # Plus petite date de début au plus tard.
+    "dta": lambda graphe, fin_projet, dta, totale, i: dta[i],
+    # Plus petite marge totale.
+    "marge": lambda graphe, fin_projet, dta, totale, i: totale[i],
+    # Plus longue chaîne de tâches restant après la fin de la tâche.
+    "chemin": lambda graphe, fin_projet, dta, totale, i: (
+        dta[i] + graphe.durees[i] - fin_projet
+    ),
+}
+
+
+class ProfilRessources:
+    """Ressources libres au cours du temps, par intervalles.
+
+    L'intervalle j va de instants[j] à instants[j + 1] (le dernier est sans
+    fin) et libres[j][r] est la quantité libre de la ressource r sur cet
+    intervalle.
+
+    Les réservations ne font que diminuer les quantités libres : la
+    première date où la ressource r offre q unités pendant une durée d ne
+    peut que reculer. Elle est retenue pour chaque triplet (r, q, d) et sert
+    de borne de départ à la recherche, qui saute ainsi la zone déjà saturée.
+    Exemple:
+    >>> profil = ProfilRessources([2])
+    >>> profil.reserve(0, 3, [(0, 2)])
+    >>> profil.premier_debut(1, 2, [(0, 1)])
+    3
+    >>> profil.instants, profil.libres
+    ([0, 3], [[0], [2]])
+    """
+
+    def __init__(self, capacites: List[int]):
+        """Toutes les ressources sont libres à partir de 0."""
+        self.instants: List[Duree] = [0]
+        self.libres: List[List[int]] = [list(capacites)]
+        self._bornes: Dict[Tuple[int, int, Duree], Duree] = dict()
+
+    def _coupe(self, instant: Duree) -> int:
+        """Indice de l'intervalle qui commence à instant, créé au besoin."""
+        position = bisect_right(self.instants, instant) - 1
+        if self.instants[position] == instant:
+            return position
+        self.instants.insert(position + 1, instant)
+        self.libres.insert(position + 1, list(self.libres[position]))
+        return position + 1
+
+    def _fenetre(self, debut, duree, demandes, courant) -> Duree:
+        """Avance debut jusqu'à une fenêtre libre, à partir de l'intervalle courant."""
+        instants, libres = self.instants, self.libres
+        while courant < len(instants) and instants[courant] < debut + duree:
+            ligne = libres[courant]
+            courant += 1
+            for r, quantite in demandes:
+                if ligne[r] < quantite:
+                    # La tâche ne peut pas commencer avant la fin de cet
+                    # intervalle.
+                    debut = instants[courant]
+                    break
+        return debut
+
+    def premier_debut(self, debut: Duree, duree: Duree, demandes: Demandes):
+        """Première date à partir de debut où la tâche tient en entier."""
+        if duree == 0 or not demandes:
+            return debut
+        instants = self.instants
+        for demande in demandes:
+            cle = (*demande, duree)
+            borne = self._bornes.get(cle, 0)
+            position = bisect_right(instants, borne) - 1
+            borne = self._fenetre(borne, duree, [demande], position)
+            self._bornes[cle] = borne
+            if debut < borne:
+                debut = borne
+        position = bisect_right(instants, debut) - 1
+        return self._fenetre(debut, duree, demandes, position)
+
+    def reserve(self, debut: Duree, duree: Duree, demandes: Demandes):
+        """Occupe les ressources sur [debut, debut + duree)."""
+        if duree == 0 or not demandes:
+            return
+        premier = self._coupe(debut)
+        dernier = self._coupe(debut + duree)
+        for ligne in self.libres[premier:dernier]:
+            for r, quantite in demandes:
+                ligne[r] -= quantite
+
+
+def _demandes(probleme: Probleme, graphe: GrapheCompact) -> List[Demandes]:
+    """Demandes de chaque tâche, indexées par ressource ; les vérifie."""
+    indices = {nom: r for r, nom in enumerate(probleme.capacites)}
+    resultat = []
+    for tache in graphe.taches:
+        demandes = []
+        for ressource, quantite in tache.ressources.items():
+            if ressource not in indices:
+                raise ValueError(
+                    f"{tache.nom} demande {ressource}, qui n'a pas de capacité."
+                )
+            if quantite > probleme.capacites[ressource]:
+                raise ValueError(
+                    f"{tache.nom} demande plus de {ressource} que la capacité."
+                )
+            if quantite:
+                demandes.append((indices[ressource], quantite))
+        resultat.append(demandes)
+    return resultat
+
+
+def _serie(graphe, demandes, capacites, cles):
+    """Schéma série : chaque tâche prête de meilleure priorité est placée."""
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    degres = [graphe.debuts[i + 1] - graphe.debuts[i] for i in range(taille)]
+    pret = _zeros(graphe.code, taille)
+    debut = _zeros(graphe.code, taille)
+    fin = _zeros(graphe.code, taille)
+    profil = ProfilRessources(capacites)
+    prets = [(cles[i], i) for i in range(taille) if degres[i] == 0]
+    heapify(prets)
+    ordre = []
+    while prets:
+        _, courante = heappop(prets)
+        duree = graphe.durees[courante]
+        depart = profil.premier_debut(pret[courante], duree, demandes[courante])
+        profil.reserve(depart, duree, demandes[courante])
+        debut[courante] = depart
+        fin[courante] = arrivee = depart + duree
+        ordre.append(courante)
+        for k in range(debuts[courante], debuts[courante + 1]):
+            suivante = successeurs[k]
+            if pret[suivante] < arrivee:
+                pret[suivante] = arrivee
+            degres[suivante] -= 1
+            if degres[suivante] == 0:
+                heappush(prets, (cles[suivante], suivante))
+    return ordre, debut, fin
+
+
+def _parallele(graphe, demandes, capacites, cles):
+    """Schéma parallèle : boucle d'événements sur les fins de tâches.
+
+    Une tâche prête qui ne tient pas attend dans le tas (r, q) de la
+    première ressource r dont il lui manque une quantité q ; elle n'est
+    réexaminée qu'une fois q unités de r libres, ce qui ne change pas le
+    résultat d'un examen complet dans l'ordre des priorités.
+    """
+    taille = len(graphe)
+    debuts, successeurs = graphe.debuts_succ, graphe.successeurs
+    degres = [graphe.debuts[i + 1] - graphe.debuts[i] for i in range(taille)]
+    debut = _zeros(graphe.code, taille)
+    fin = _zeros(graphe.code, taille)
+    libres = list(capacites)
+    attente: List[Dict[int, list]] = [dict() for _ in capacites]
+    prets = [(cles[i], i) for i in range(taille) if degres[i] == 0]
+    heapify(prets)
+    evenements: List[Tuple[Duree, int]] = []
+    rendues: Iterable[int] = ()
+    ordre = []
+    instant: Duree = 0
+    while True:
+        sources = [(prets, -1, 0)] + [
+            (tas, r, quantite)
+            for r in rendues
+            for quantite, tas in attente[r].items()
+            if tas and libres[r] >= quantite
+        ]
+        tetes = [
+            (tas[0], numero) for numero, (tas, _, _) in enumerate(sources) if tas
+        ]
+        heapify(tetes)
+        bloquees = []
+        while tetes:
+            numero = tetes[0][1]
+            tas, r, quantite = sources[numero]
+            if numero and libres[r] < quantite:
+                heappop(tetes)
+                continue
+            entree = heappop(tas)
+            courante = entree[1]
+            manque = next(
+                ((r, q) for r, q in demandes[courante] if libres[r] < q), None
+            )
+            if manque is None:
+                for r, q in demandes[courante]:
+                    libres[r] -= q
+                debut[courante] = instant
+                fin[courante] = instant + graphe.durees[courante]
+                heappush(evenements, (fin[courante], courante))
+                ordre.append(courante)
+            else:
+                bloquees.append((manque, entree))
+            if tas:
+                heapreplace(tetes, (tas[0], numero))
+            else:
+                heappop(tetes)
+        for (r, quantite), entree in bloquees:
+            heappush(attente[r].setdefault(quantite, []), entree)
+        if not evenements:
+            break
+
+        instant = evenements[0][0]
+        liberees = set()
+        while evenements and evenements[0][0] == instant:
+            _, finie = heappop(evenements)
+            for r, quantite in demandes[finie]:
+                libres[r] += quantite
+                liberees.add(r)
+            for k in range(debuts[finie], debuts[finie + 1]):
+                suivante = successeurs[k]
+                degres[suivante] -= 1
+                if degres[suivante] == 0:
+                    heappush(prets, (cles[suivante], suivante))
+        rendues = liberees
+    return ordre, debut, fin
+
+
+SCHEMAS = {"serie": _serie, "parallele": _parallele}
+
+
+def resous_ressources(
+    probleme: Probleme, schema: str = "serie", regle: str = "dta"
+) -> EDT:
+    """Résout le problème en respectant les capacités des ressources.
+
+    schema vaut "serie" ou "parallele" et regle est une clé de REGLES ; à
+    priorité égale, la tâche déclarée en premier passe d'abord. Les
+    activités sont rangées dans l'ordre où elles ont été placées ; dta et
+    les marges ne sont pas calculées.
+    Exemple:
+    >>> from ordonnancement.probleme import Tache
+    >>> probleme = Probleme(
+    ...     [
+    ...         Tache("A", 2, [], ressources={"grue": 1}),
+    ...         Tache("B", 3, [], ressources={"grue": 1}),
+    ...         Tache("C", 1, ["A"], ressources={"grue": 1, "equipe": 2}),
+    ...     ],
+    ...     capacites={"grue": 1, "equipe": 2},
+    ... )
+    >>> for activite in resous_ressources(probleme).activites:
+    ...     print(activite.tache.nom, activite.debut, activite.fin)
+    A 0 2
+    B 2 5
+    C 5 6
+    """
+    if schema not in SCHEMAS:
+        raise ValueError(f"Schéma inconnu : {schema}.")
+    if regle not in REGLES:
+        raise ValueError(f"Règle de priorité inconnue : {regle}.")
+    graphe = GrapheCompact(probleme)
+    _sans_liens(graphe, "resous_ressources")
+    demandes = _demandes(probleme, graphe)
+    _, (_, fin, dta, totale, _) = calcule(probleme, marges=True)
+    fin_projet = max(fin, default=0)
+    priorite = REGLES[regle]
+    cles = [
+        priorite(graphe, fin_projet, dta, totale, i) for i in range(len(graphe))
+    ]
+    ordre, debut, fin = SCHEMAS[schema](
+        graphe, demandes, list(probleme.capacites.values()), cles
+    )
+    zeros = _zeros(graphe.code, len(graphe))
+    return assemble(graphe.taches, ordre, (debut, fin, zeros, zeros, zeros))
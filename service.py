@@ -0,0 +1,372 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Service local de résolution : HTTP minimal sur asyncio, par socket Unix ou
+en TCP sur localhost.
+
+POST /resous reçoit un problème au format de Probleme.par_str
+(text/plain) ou en JSON (application/json, {"taches": [{"nom", "duree",
+"prerequis"}, ...]} ou {"texte": ...}) ; ?marges=1 ajoute la passe
+arrière. La réponse JSON donne l'empreinte du problème, la durée totale et
+les activités avec debut, fin, dta et marge. GET /statistiques renvoie les
+compteurs du service. Un problème ou une requête invalide reçoit une
+réponse 400, toute autre erreur une réponse 500, avec {"erreur": ...}.
+
+Le service garde au chaud les réponses déjà calculées. Les demandes
+identiques simultanées sont regroupées en une seule résolution. Lecture,
+résolution et encodage se font dans un groupe de processus : la boucle
+d'évènements ne fait que lire et écrire les sockets. Chaque processus
+garde aussi ses problèmes lus et ses résolutions (cache.CACHE).
+Usage : python -m ordonnancement sert [--socket CHEMIN | --port N]
+"""
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .probleme import Probleme, Tache
+from .cache import resous_memo
+from .export import lignes
+
+COLONNES = ("tache", "debut", "fin", "dta", "marge")
+FORMATS = {"text/plain": "texte", "application/json": "json"}
+RAISONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+PROBLEMES_MAX = 64
+
+# Problèmes déjà lus par ce processus, par empreinte de la demande.
+_PROBLEMES: "OrderedDict[str, Probleme]" = OrderedDict()
+
+
+def _cle(corps: bytes, format: str, marges: bool) -> str:
+    """Empreinte d'une demande."""
+    somme = hashlib.blake2b(digest_size=16)
+    somme.update(f"{format}:{int(marges)}:".encode())
+    somme.update(corps)
+    return somme.hexdigest()
+
+
+def _tache_json(tache: Any) -> Tache:
+    """Tache décrite par un objet JSON ; ValueError si un type ne convient pas."""
+    if not isinstance(tache, dict):
+        raise ValueError("JSON invalide : une tâche est un objet.")
+    nom, duree = tache["nom"], tache["duree"]
+    prerequis = tache.get("prerequis", [])
+    if not isinstance(nom, str):
+        raise ValueError(f"JSON invalide : le nom {nom!r} n'est pas une chaîne.")
+    if isinstance(duree, bool) or not isinstance(duree, (int, float)):
+        raise ValueError(f"JSON invalide : {nom}, la durée n'est pas un nombre.")
+    if not isinstance(prerequis, list) or not all(
+        isinstance(autre, str) for autre in prerequis
+    ):
+        raise ValueError(f"JSON invalide : {nom}, prérequis hors liste de noms.")
+    return Tache(nom, duree, prerequis)
+
+
+def lit_probleme(corps: bytes, format: str) -> Probleme:
+    """Probleme décrit par le corps d'une demande.
+
+    En JSON, les noms sont des chaînes et les prérequis une liste de noms :
+    une chaîne "AB" n'est pas découpée.
+    """
+    texte = corps.decode("utf-8")
+    if format == "texte":
+        return Probleme.par_str(texte)
+    try:
+        donnees = json.loads(texte)
+        if not isinstance(donnees, dict):
+            raise ValueError("JSON invalide : un objet est attendu.")
+        if "texte" in donnees:
+            if not isinstance(donnees["texte"], str):
+                raise ValueError("JSON invalide : texte n'est pas une chaîne.")
+            return Probleme.par_str(donnees["texte"])
+        taches = donnees["taches"]
+        capacites = donnees.get("capacites")
+        if not isinstance(taches, list):
+            raise ValueError("JSON invalide : taches n'est pas une liste.")
+        if capacites is not None and not isinstance(capacites, dict):
+            raise ValueError("JSON invalide : capacites n'est pas un objet.")
+        return Probleme([_tache_json(tache) for tache in taches], capacites)
+    except (KeyError, TypeError, json.JSONDecodeError) as erreur:
+        raise ValueError(f"JSON invalide : {erreur!r}") from None
+
+
+def traite(corps: bytes, format: str, marges: bool) -> bytes:
+    """Lit, résout et encode une réponse ; tourne dans un processus du groupe."""
+    cle = _cle(corps, format, False)
+    probleme = _PROBLEMES.get(cle)
+    if probleme is None:
+        probleme = _PROBLEMES[cle] = lit_probleme(corps, format)
+        if len(_PROBLEMES) > PROBLEMES_MAX:
+            _PROBLEMES.popitem(last=False)
+    _PROBLEMES.move_to_end(cle)
+    edt = resous_memo(probleme, marges=marges)
+    activites = [dict(zip(COLONNES, ligne)) for ligne in lignes(edt, COLONNES)]
+    reponse = {
+        "empreinte": probleme.empreinte(),
+        "duree_totale": max((activite["fin"] for activite in activites), default=0),
+        "activites": activites,
+    }
+    return json.dumps(reponse, ensure_ascii=False).encode("utf-8")
+
+
+class Service:
+    """Réponses au chaud, regroupement des demandes et groupe de processus.
+
+    executeur vaut par défaut un ProcessPoolExecutor de travailleurs
+    processus ; reponses_max borne le nombre de réponses gardées.
+    """
+
+    def __init__(
+        self,
+        executeur: Optional[Executor] = None,
+        travailleurs: Optional[int] = None,
+        reponses_max: int = 256,
+    ):
+        """Service sans réponse en mémoire."""
+        self.executeur = executeur or ProcessPoolExecutor(travailleurs)
+        self.reponses_max = reponses_max
+        self._reponses: "OrderedDict[str, bytes]" = OrderedDict()
+        self._en_cours: Dict[str, "asyncio.Future[bytes]"] = dict()
+        self.demandes = 0
+        self.succes = 0
+        self.regroupees = 0
+        self.resolutions = 0
+
+    def statistiques(self) -> Dict[str, int]:
+        """Compteurs du service."""
+        return {
+            "demandes": self.demandes,
+            "succes": self.succes,
+            "regroupees": self.regroupees,
+            "resolutions": self.resolutions,
+            "reponses": len(self._reponses),
+        }
+
+    async def resous(
+        self, corps: bytes, format: str = "texte", marges: bool = False
+    ) -> bytes:
+        """Réponse encodée : en mémoire, en cours de calcul, ou calculée."""
+        self.demandes += 1
+        cle = _cle(corps, format, marges)
+        reponse = self._reponses.get(cle)
+        if reponse is not None:
+            self._reponses.move_to_end(cle)
+            self.succes += 1
+            return reponse
+        calcul = self._en_cours.get(cle)
+        if calcul is None:
+            calcul = asyncio.ensure_future(self._calcule(cle, corps, format, marges))
+            self._en_cours[cle] = calcul
+        else:
+            self.regroupees += 1
+        # shield : un client qui se déconnecte n'annule pas le calcul des autres.
+        return await asyncio.shield(calcul)
+
+    async def _calcule(
+        self, cle: str, corps: bytes, format: str, marges: bool
+    ) -> bytes:
+        """Résout dans le groupe de processus et garde la réponse."""
+        try:
+            self.resolutions += 1
+            boucle = asyncio.get_running_loop()
+            reponse = await boucle.run_in_executor(
+                self.executeur, traite, corps, format, marges
+            )
+        finally:
+            del self._en_cours[cle]
+        self._reponses[cle] = reponse
+        if len(self._reponses) > self.reponses_max:
+            self._reponses.popitem(last=False)
+        return reponse
+
+    async def _repond(
+        self, methode: str, cible: str, entetes: Dict[str, str], corps: bytes
+    ) -> Tuple[int, bytes]:
+        """Statut et corps de la réponse à une requête HTTP."""
+        adresse = urlsplit(cible)
+        if adresse.path == "/statistiques":
+            return 200, json.dumps(self.statistiques()).encode()
+        if adresse.path != "/resous":
+            return 404, json.dumps({"erreur": "Chemin inconnu."}).encode()
+        if methode != "POST":
+            return 405, json.dumps({"erreur": "POST attendu."}).encode()
+        type_corps = entetes.get("content-type", "text/plain").split(";")[0].strip()
+        format = FORMATS.get(type_corps, "texte")
+        options = parse_qs(adresse.query)
+        marges = options.get("marges", ["0"])[-1] not in ("0", "false", "")
+        try:
+            return 200, await self.resous(corps, format, marges)
+        except ValueError as erreur:
+            return 400, json.dumps({"erreur": str(erreur)}, ensure_ascii=False).encode()
+        except Exception as erreur:
+            # Groupe de processus cassé ou bogue : une réponse plutôt qu'une
+            # connexion coupée sans un mot.
+            return 500, json.dumps(
+                {"erreur": f"{type(erreur).__name__} : {erreur}"}, ensure_ascii=False
+            ).encode()
+
+    async def connexion(
+        self, lecteur: asyncio.StreamReader, ecrivain: asyncio.StreamWriter
+    ):
+        """Sert les requêtes d'une connexion, gardée ouverte entre deux requêtes.
+
+        Une requête mal formée reçoit une réponse 400, puis la connexion
+        est fermée.
+        """
+        try:
+            while True:
+                ligne = await lecteur.readline()
+                if not ligne:
+                    break
+                try:
+                    methode, cible, _ = ligne.decode("latin-1").split(" ", 2)
+                    entetes: Dict[str, str] = dict()
+                    while True:
+                        ligne = await lecteur.readline()
+                        if ligne in (b"\r\n", b"\n", b""):
+                            break
+                        nom, _, valeur = ligne.decode("latin-1").partition(":")
+                        entetes[nom.strip().lower()] = valeur.strip()
+                    taille = int(entetes.get("content-length", 0))
+                except ValueError:
+                    erreur = {"erreur": "Requête HTTP mal formée."}
+                    await self._envoie(ecrivain, 400, json.dumps(erreur).encode(), True)
+                    break
+                corps = await lecteur.readexactly(taille)
+                statut, reponse = await self._repond(methode, cible, entetes, corps)
+                fermer = entetes.get("connection", "").lower() == "close"
+                await self._envoie(ecrivain, statut, reponse, fermer)
+                if fermer:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            ecrivain.close()
+
+    @staticmethod
+    async def _envoie(
+        ecrivain: asyncio.StreamWriter, statut: int, reponse: bytes, fermer: bool
+    ):
+        """Ecrit une réponse HTTP."""
+        ecrivain.write(
+            f"HTTP/1.1 {statut} {RAISONS[statut]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(reponse)}\r\n"
+            f"Connection: {'close' if fermer else 'keep-alive'}\r\n\r\n".encode()
+            + reponse
+        )
+        await ecrivain.drain()
+
+    async def demarre(
+        self, socket: Optional[str] = None, hote: str = "127.0.0.1", port: int = 8421
+    ) -> asyncio.AbstractServer:
+        """Ouvre le serveur sur une socket Unix, ou en TCP sur hote:port."""
+        if socket is not None:
+            return await asyncio.start_unix_server(self.connexion, path=socket)
+        return await asyncio.start_server(self.connexion, hote, port)
+
+    def ferme(self):
+        """Arrête le groupe de processus."""
+        self.executeur.shutdown()
+
+
+class Client:
+    """Client HTTP minimal, sur une connexion gardée ouverte.
+
+    Exemple (avec un service démarré):
+        async with Client(port=8421) as client:
+            reponse = await client.resous("A / 1 /\\nB / 2 / A", marges=True)
+    """
+
+    def __init__(
+        self, socket: Optional[str] = None, hote: str = "127.0.0.1", port: int = 8421
+    ):
+        """Client non connecté."""
+        self.socket, self.hote, self.port = socket, hote, port
+        self._lecteur: Optional[asyncio.StreamReader] = None
+        self._ecrivain: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> "Client":
+        """Ouvre la connexion."""
+        if self.socket is not None:
+            connexion = asyncio.open_unix_connection(self.socket)
+        else:
+            connexion = asyncio.open_connection(self.hote, self.port)
+        self._lecteur, self._ecrivain = await connexion
+        return self
+
+    async def __aexit__(self, *erreur):
+        """Ferme la connexion."""
+        self._ecrivain.close()
+
+    async def requete(
+        self,
+        methode: str,
+        cible: str,
+        corps: bytes = b"",
+        type_corps: str = "text/plain",
+    ) -> Tuple[int, Any]:
+        """Statut et réponse JSON décodée."""
+        self._ecrivain.write(
+            f"{methode} {cible} HTTP/1.1\r\nHost: ordonnancement\r\n"
+            f"Content-Type: {type_corps}\r\n"
+            f"Content-Length: {len(corps)}\r\n\r\n".encode()
+            + corps
+        )
+        await self._ecrivain.drain()
+        statut = int((await self._lecteur.readline()).split()[1])
+        taille = 0
+        while True:
+            ligne = await self._lecteur.readline()
+            if ligne in (b"\r\n", b""):
+                break
+            nom, _, valeur = ligne.decode("latin-1").partition(":")
+            if nom.strip().lower() == "content-length":
+                taille = int(valeur)
+        return statut, json.loads(await self._lecteur.readexactly(taille))
+
+    async def resous(self, probleme: Any, marges: bool = False) -> Dict[str, Any]:
+        """Résout un texte par_str ou un dictionnaire JSON ; ValueError si refusé."""
+        if isinstance(probleme, str):
+            corps, type_corps = probleme.encode("utf-8"), "text/plain"
+        else:
+            corps, type_corps = json.dumps(probleme).encode("utf-8"), "application/json"
+        cible = "/resous?marges=1" if marges else "/resous"
+        statut, reponse = await self.requete("POST", cible, corps, type_corps)
+        if statut != 200:
+            raise ValueError(reponse["erreur"])
+        return reponse
+
+
+async def _sert(
+    socket: Optional[str], hote: str, port: int, travailleurs: Optional[int]
+):
+    """Sert jusqu'à l'interruption."""
+    service = Service(travailleurs=travailleurs)
+    try:
+        serveur = await service.demarre(socket, hote, port)
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        service.ferme()
+
+
+def sert(
+    socket: Optional[str] = None,
+    hote: str = "127.0.0.1",
+    port: int = 8421,
+    travailleurs: Optional[int] = None,
+):
+    """Lance le service ; Ctrl-C l'arrête."""
+    try:
+        asyncio.run(_sert(socket, hote, port, travailleurs))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste l'analyse de risque par Monte-Carlo.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement.aleas import Empirique, Loi, Normale, Pert, Triangulaire, simule
+from ordonnancement.generateur import aleatoire
+
+
+def test_deterministe():
+    """Sans loi, chaque scénario donne la durée et les marges de resous."""
+    probleme = aleatoire(300, graine=2, flottantes=True)
+    edt = resous(probleme, moteur="natif", marges=True)
+    resultat = simule(probleme, scenarios=20, bloc=1000)
+    fin = max(activite.fin for activite in edt.activites)
+    assert np.allclose(resultat.durees_totales, fin)
+    for activite in edt.activites:
+        critique = activite.mar == pytest.approx(0, abs=1e-9)
+        assert (resultat.criticite[activite.tache.nom] == 1.0) == critique
+
+
+@pytest.mark.parametrize(
+    "loi, bas, haut",
+    [
+        (Triangulaire(1, 2, 5), 1, 5),
+        (Pert(1, 2, 5), 1, 5),
+        (Empirique((3, 4)), 3, 4),
+        (Normale(1, 5), 0, np.inf),
+        (Triangulaire(2, 2, 2), 2, 2),
+    ],
+)
+def test_bornes(loi, bas, haut):
+    """Les tirages restent dans le support de la loi."""
+    tirage = loi.tire(np.random.default_rng(0), 1000)
+    assert tirage.shape == (1000,)
+    assert bas <= tirage.min() and tirage.max() <= haut
+
+
+def test_graine():
+    """Même graine, mêmes scénarios."""
+    probleme = Probleme([
+        Tache("A", 2, [], loi=Pert(1, 2, 4)),
+        Tache("B", 3, [], loi=Triangulaire(2, 3, 4)),
+        Tache("C", 1, ["A", "B"]),
+    ])
+    premier = simule(probleme, scenarios=500, graine=5)
+    second = simule(probleme, scenarios=500, graine=5)
+    assert np.array_equal(premier.durees_totales, second.durees_totales)
+    assert premier.criticite["C"] == 1.0
+    assert premier.criticite["A"] + premier.criticite["B"] >= 1.0
+
+
+def test_lois_invalides():
+    """Durées observées positives, mode entre les bornes, écart-type positif."""
+    with pytest.raises(ValueError):
+        Empirique(())
+    with pytest.raises(ValueError):
+        Empirique((1, -2))
+    with pytest.raises(ValueError, match="mode"):
+        Triangulaire(5, 1, 3)
+    with pytest.raises(ValueError, match="mode"):
+        Pert(1, 6, 5)
+    with pytest.raises(ValueError, match="écart-type"):
+        Normale(3, -1)
+    with pytest.raises(TypeError):
+        Loi()
+
+
+def test_loi_conservee():
+    """Modifier la durée d'une tâche garde sa loi."""
+    loi = Triangulaire(1, 2, 3)
+    probleme = Probleme([Tache("A", 2, [], loi=loi)])
+    probleme.modifie_duree("A", 4)
+    assert probleme["A"].loi is loi
@@ -3,8 +3,19 @@
 """Description.
 Teste la fonction de résolution.
 """
+import subprocess
+import sys
 import pytest
 from ordonnancement import Activite, EDT, Probleme, resous
+from ordonnancement.algorithme import (
+    marges,
+    range_bis_desor,
+    range_prob,
+    range_res,
+    resous_3,
+    resous_4,
+)
+from ordonnancement.moteur import GrapheCompact
 
 
 def test_sans_solution():
@@ -83,4 +94,185 @@ G / 1 / F
             Activite(g, debut=6, fin=7),
         ]
     )
-    assert solution == edt
\ No newline at end of file
+    assert solution == edt
+
+
+def test_moteur_natif():
+    """Même EDT que kahn."""
+    probleme = Probleme.par_str(
+        """
+A / 1 / 
+B / 2 / A
+C / 3 / A B
+D / 4 / A
+E / 4 /
+F / 2 / E
+G / 1 / F
+"""
+    )
+    assert resous(probleme, moteur="natif") == resous(probleme)
+
+
+def test_moteur_natif_tache_isolee():
+    """Les tâches sans arête font partie de la solution."""
+    probleme = Probleme.par_str(
+        """
+A / 1 / 
+B / 2 / A
+C / 3 /
+"""
+    )
+    a, b, c = probleme.taches
+    assert resous(probleme, moteur="natif") == EDT(
+        activites=[
+            Activite(a, debut=0, fin=1, dta=0, mar=0),
+            Activite(c, debut=0, fin=3, dta=0, mar=0),
+            Activite(b, debut=1, fin=3, dta=0, mar=0),
+        ]
+    )
+
+
+def test_moteur_natif_sans_solution():
+    """Doit planter."""
+    probleme = Probleme.par_str(
+        """
+A / 1 / C
+B / 2 / A
+C / 3 / B
+D / 1 /
+"""
+    )
+    with pytest.raises(ValueError):
+        resous(probleme, moteur="natif")
+
+
+def test_moteur_inconnu():
+    """Seuls kahn, natif et niveaux existent."""
+    probleme = Probleme.par_str("A / 1 /")
+    with pytest.raises(ValueError):
+        resous(probleme, moteur="autre")
+
+
+def test_moteur_networkx():
+    """Ancien nom du moteur kahn, déprécié."""
+    probleme = Probleme.par_str("A / 1 /\nB / 2 / A")
+    with pytest.warns(DeprecationWarning, match="kahn"):
+        assert resous(probleme, moteur="networkx") == resous(probleme, moteur="kahn")
+
+def test_graphe_compact():
+    """Tableaux CSR des prérequis et des successeurs."""
+    graphe = GrapheCompact(
+        Probleme.par_str(
+            """
+A / 1 /
+B / 2 / A
+C / 3 / A B
+D / 4 / A
+"""
+        )
+    )
+    assert list(graphe.debuts) == [0, 0, 1, 3, 4]
+    assert list(graphe.prerequis) == [0, 0, 1, 0]
+    assert list(graphe.debuts_succ) == [0, 3, 4, 4, 4]
+    assert list(graphe.successeurs) == [1, 2, 3, 2]
+
+
+NOTEBOOK = """
+A / 3 /
+B / 4 / A I
+C / 1 / B
+D / 4 /
+E / 2 / D H
+F / 5 / E I
+G / 1 /
+H / 3 / G
+I / 5 / H
+J / 6 /
+K / 3 / J I
+L / 14 /
+M / 2 / I
+N / 2 / M L
+O / 3 / M F C
+P / 3 / O N
+Q / 2 / P
+R / 1 / N K O
+S / 3 / R
+"""
+
+
+def test_passe_arriere():
+    """Dates au plus tard et marges du problème du notebook."""
+    attendu = {
+        "A": (0, 3, 6, 6, 6),
+        "D": (0, 4, 3, 3, 0),
+        "G": (0, 1, 0, 0, 0),
+        "J": (0, 6, 9, 9, 3),
+        "L": (0, 14, 1, 1, 0),
+        "H": (1, 4, 1, 0, 0),
+        "E": (4, 6, 7, 3, 3),
+        "I": (4, 9, 4, 0, 0),
+        "B": (9, 13, 9, 0, 0),
+        "F": (9, 14, 9, 0, 0),
+        "K": (9, 12, 15, 6, 5),
+        "M": (9, 11, 12, 3, 3),
+        "C": (13, 14, 13, 0, 0),
+        "N": (14, 16, 15, 1, 1),
+        "O": (14, 17, 14, 0, 0),
+        "P": (17, 20, 17, 0, 0),
+        "R": (17, 18, 18, 1, 0),
+        "S": (18, 21, 19, 1, 1),
+        "Q": (20, 22, 20, 0, 0),
+    }
+    solution = resous(Probleme.par_str(NOTEBOOK), moteur="natif", marges=True)
+    assert {
+        activite.tache.nom: (
+            activite.debut,
+            activite.fin,
+            activite.dta,
+            activite.mar,
+            activite.marge_libre,
+        )
+        for activite in solution.activites
+    } == attendu
+
+
+def test_resous_4():
+    """Rangé par début, avec les marges totales."""
+    solution = resous_4(Probleme.par_str(NOTEBOOK))
+    debuts = [activite.debut for activite in solution.activites]
+    assert debuts == sorted(debuts)
+    assert marges(solution) == [activite.mar for activite in solution.activites]
+    sans_marges = resous_3(Probleme.par_str(NOTEBOOK))
+    assert all(activite.mar == 0 for activite in sans_marges.activites)
+
+
+def test_marges_kahn():
+    """La passe arrière n'existe que pour le moteur natif."""
+    with pytest.raises(ValueError):
+        resous(Probleme.par_str("A / 1 /"), marges=True)
+
+
+def test_imports_paresseux():
+    """Résoudre ne charge ni matplotlib, ni rich, ni networkx."""
+    code = """
+import sys
+from ordonnancement.probleme import Probleme
+from ordonnancement.algorithme import resous
+resous(Probleme.par_str("A / 1 /\\nB / 2 / A"), moteur="natif")
+print(*(nom for nom in ("matplotlib", "rich", "networkx") if nom in sys.modules))
+"""
+    sortie = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    )
+    assert sortie.stdout.strip() == ""
+
+
+def test_range_res_stable():
+    """Ordre croissant de début, ordre de résolution à égalité."""
+    probleme = Probleme.par_str(NOTEBOOK)
+    solution = list(resous(probleme).activites)
+    attendu = sorted(solution, key=lambda activite: activite.debut)
+    assert range_res(probleme) == attendu
+    assert range_prob(probleme) == [activite.tache for activite in attendu]
+    decroissant = sorted(solution, key=lambda activite: -activite.debut)
+    assert list(range_bis_desor(probleme).activites) == decroissant
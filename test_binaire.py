@@ -0,0 +1,89 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le format binaire.
+"""
+import pytest
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement.aleas import Triangulaire
+from ordonnancement.binaire import charge, ouvre, sauve
+
+
+@pytest.fixture
+def probleme():
+    """Problème avec une durée flottante et une tâche isolée."""
+    return Probleme.par_str(
+        """
+A / 1 /
+B / 2.5 / A
+C / 3 / A B
+D / 4 / A
+É / 1 /
+"""
+    )
+
+
+def test_aller_retour_probleme(tmp_path, probleme):
+    """Relu, le problème est égal à celui de par_str."""
+    chemin = tmp_path / "probleme.ordo"
+    sauve(probleme, chemin)
+    relu = charge(chemin)
+    # Les tâches ne sont créées qu'à la lecture.
+    assert not any(relu._taches._creees)
+    assert relu == probleme
+    assert relu["C"].prerequis[0] is relu["B"].prerequis[0]
+
+
+def test_aller_retour_edt(tmp_path, probleme):
+    """Les colonnes de l'EDT sont conservées."""
+    chemin = tmp_path / "edt.ordo"
+    edt = resous(probleme, moteur="natif", marges=True)
+    sauve(edt, chemin)
+    assert charge(chemin) == edt
+
+
+def test_ouvre(tmp_path, probleme):
+    """Accès aux sections sans tout créer."""
+    chemin = tmp_path / "probleme.ordo"
+    sauve(probleme, chemin)
+    with ouvre(chemin) as conteneur:
+        assert len(conteneur) == 5
+        assert conteneur.colonnes is None
+        assert conteneur.tache(3) == probleme["D"]
+        assert list(conteneur.positions) == [0, 0, 1, 3, 4, 4]
+        with pytest.raises(ValueError):
+            conteneur.edt()
+
+
+def test_mauvais_fichier(tmp_path):
+    """Un fichier quelconque est refusé."""
+    chemin = tmp_path / "autre.ordo"
+    chemin.write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        charge(chemin)
+
+
+@pytest.mark.parametrize("edt", [False, True])
+def test_fichier_tronque(tmp_path, probleme, edt):
+    """Un fichier tronqué, dans l'entête ou dans une section, est refusé."""
+    chemin = tmp_path / "complet.ordo"
+    sauve(resous(probleme, moteur="natif", marges=True) if edt else probleme, chemin)
+    octets = chemin.read_bytes()
+    tronque = tmp_path / "tronque.ordo"
+    for taille in range(len(octets)):
+        tronque.write_bytes(octets[:taille])
+        with pytest.raises(ValueError, match="format attendu"):
+            charge(tronque)
+
+
+def test_refus(tmp_path):
+    """Lois, ressources et capacités ne sont pas perdues en silence."""
+    chemin = tmp_path / "refuse.ordo"
+    refuses = [
+        Probleme([Tache("A", 1, [], loi=Triangulaire(1, 1, 2))]),
+        Probleme([Tache("A", 1, [], ressources={"grue": 1})], {"grue": 1}),
+        Probleme([Tache("A", 1, [])], {"grue": 1}),
+    ]
+    for probleme in refuses:
+        with pytest.raises(ValueError, match="absentes du format binaire"):
+            sauve(probleme, chemin)
@@ -0,0 +1,77 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le cache des résolutions.
+"""
+import pytest
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement.algorithme import dta_fin, max_fin, range_bis, range_res, resous_2
+from ordonnancement.cache import CACHE, CacheResolutions, resous_memo
+from ordonnancement.generateur import chaine
+
+
+@pytest.fixture
+def probleme():
+    """Petit problème du notebook."""
+    return Probleme.par_str(
+        """
+A / 1 /
+B / 2 / A
+C / 3 / A B
+D / 4 / A
+"""
+    )
+
+
+def test_empreinte(probleme):
+    """Stable pour un contenu égal, renouvelée par les mutations."""
+    copie = Probleme(list(probleme.taches))
+    assert copie.empreinte() == probleme.empreinte()
+    avant = probleme.empreinte()
+    probleme.ajoute_prerequis("D", "B")
+    assert probleme.empreinte() != avant
+    probleme.retire_prerequis("D", "B")
+    assert probleme.empreinte() == avant
+    # Les séparateurs ne peuvent pas être confondus avec les noms.
+    assert (
+        Probleme([Tache("AB", 1, [])]).empreinte()
+        != Probleme([Tache("A", 1, []), Tache("B", 1, [])]).empreinte()
+    )
+
+
+def test_fonctions_partagent(probleme):
+    """Un rapport complet ne résout le problème qu'une fois."""
+    CACHE.vide()
+    max_fin(probleme)
+    range_res(probleme)
+    range_bis(probleme)
+    dta_fin(probleme)
+    resous_2(probleme)
+    assert CACHE.statistiques()["echecs"] == 1
+    assert CACHE.statistiques()["succes"] >= 5
+    assert resous_memo(probleme) == resous(probleme, moteur="natif")
+
+
+def test_edt_independants(probleme):
+    """Modifier l'EDT rendu ne touche pas au cache."""
+    cache = CacheResolutions()
+    edt = resous_memo(probleme, cache=cache)
+    edt.retire("C")
+    assert len(resous_memo(probleme, cache=cache)) == 4
+
+
+def test_eviction():
+    """Le moins récemment utilisé part en premier, en nombre et en octets."""
+    cache = CacheResolutions(taille_max=2)
+    problemes = [chaine(10, graine=graine) for graine in range(3)]
+    for probleme in problemes:
+        resous_memo(probleme, cache=cache)
+    assert len(cache) == 2 and cache.evictions == 1
+    resous_memo(problemes[0], cache=cache)
+    assert cache.statistiques()["echecs"] == 4
+
+    # 200 tâches : 6400 octets par résultat.
+    cache = CacheResolutions(octets_max=10_000)
+    for graine in range(3):
+        resous_memo(chaine(200, graine=graine), cache=cache)
+    assert len(cache) == 1 and cache.octets == 6400
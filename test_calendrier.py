@@ -0,0 +1,94 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste les calendriers de travail.
+"""
+import io
+import random
+from datetime import date
+import pytest
+from ordonnancement import Probleme, resous
+from ordonnancement.calendrier import Calendrier, resous_calendrier
+from ordonnancement.generateur import aleatoire
+
+LUNDI = date(2026, 1, 5)
+
+
+@pytest.fixture
+def calendrier():
+    """Deux ans de semaines de 5 jours, avec pause de midi et fériés."""
+    return Calendrier.hebdomadaire(
+        LUNDI, 730, feries=[date(2026, 5, 1), date(2026, 12, 25)]
+    )
+
+
+def test_conversions(calendrier):
+    """Mêmes résultats qu'un parcours heure par heure."""
+    travaille = [
+        any(d <= heure < f for d, f in zip(calendrier.debuts, calendrier.fins))
+        for heure in range(24 * 100)
+    ]
+    cumul = 0
+    for heure in range(24 * 100):
+        assert calendrier.travail(heure) == cumul
+        if travaille[heure]:
+            assert calendrier.debut(cumul) == heure
+            assert calendrier.fin(cumul + 1) == heure + 1
+        cumul += travaille[heure]
+    hasard = random.Random(0)
+    for _ in range(200):
+        instant = hasard.uniform(0, 24 * 700)
+        travail = calendrier.travail(instant)
+        assert calendrier.travail(calendrier.debut(travail)) == pytest.approx(travail)
+    assert calendrier.date(calendrier.debut(0)).hour == 8
+    with pytest.raises(ValueError, match="s'arrête"):
+        calendrier.ajoute(0, calendrier.total + 1)
+    with pytest.raises(ValueError, match="aucune période"):
+        Calendrier([(3, 3)])
+
+
+def test_un_calendrier(calendrier):
+    """Passes en travail, ou en instants tâche par tâche : même EDT."""
+    probleme = aleatoire(300, graine=2)
+    edt = resous_calendrier(probleme, calendrier, marges=True)
+    par_tache = {nom: calendrier for nom in probleme.noms}
+    assert edt == resous_calendrier(probleme, calendrier, par_tache, marges=True)
+    assert edt == resous(probleme, moteur="natif", marges=True, calendrier=calendrier)
+    continu = Calendrier([(0, 10**9)])
+    assert resous_calendrier(probleme, continu, marges=True) == resous(
+        probleme, moteur="natif", marges=True
+    )
+    for activite in edt.activites:
+        travail = calendrier.travail(activite.fin) - calendrier.travail(activite.debut)
+        assert travail == activite.tache.duree
+        assert calendrier.date(activite.debut).weekday() < 5
+
+
+def test_par_tache(calendrier):
+    """Tâches en 3x8 sept jours sur sept au milieu de tâches en semaine."""
+    continu = Calendrier.hebdomadaire(LUNDI, 730, ((0, 24),), range(7))
+    probleme = aleatoire(300, graine=5)
+    par_tache = {nom: continu for nom in list(probleme.noms)[::3]}
+    edt = resous_calendrier(probleme, calendrier, par_tache, marges=True)
+    assert edt.est_valide()
+    for activite in edt.activites:
+        local = par_tache.get(activite.tache.nom, calendrier)
+        assert local.travail(activite.fin) - local.travail(activite.debut) == (
+            activite.tache.duree
+        )
+        assert activite.dta >= activite.debut
+        assert activite.mar >= 0 and activite.marge_libre >= 0
+    fin = max(activite.fin for activite in edt.activites)
+    assert any(activite.mar == 0 and activite.fin == fin for activite in edt.activites)
+
+
+def test_dates(calendrier):
+    """L'EDT affiche et exporte les dates du calendrier."""
+    probleme = Probleme.par_str("A / 30 /\nB / 4 / A")
+    edt = resous(probleme, moteur="natif", calendrier=calendrier)
+    sortie = io.StringIO()
+    edt.exporte(sortie, colonnes=["tache", "debut", "fin"], calendrier=calendrier)
+    assert sortie.getvalue().splitlines()[1:] == [
+        "A,2026-01-05 08:00:00,2026-01-08 15:00:00",
+        "B,2026-01-08 15:00:00,2026-01-09 10:00:00",
+    ]
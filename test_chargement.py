@@ -0,0 +1,124 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste la construction des problèmes par colonnes.
+"""
+import pickle
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement.compact import ProblemeCompact
+from ordonnancement.generateur import aleatoire
+
+
+@pytest.fixture
+def probleme():
+    """Problème aléatoire mélangé : des prérequis déclarés après leur tâche."""
+    return aleatoire(300, graine=5, melange=True, flottantes=True)
+
+
+def colonnes(probleme):
+    """Noms, durées et listes de prérequis."""
+    taches = list(probleme.taches)
+    return (
+        [tache.nom for tache in taches],
+        [tache.duree for tache in taches],
+        [tache.prerequis for tache in taches],
+    )
+
+
+def test_meme_probleme(probleme):
+    """Listes, tableaux NumPy et arêtes donnent le même problème."""
+    noms, durees, prerequis = colonnes(probleme)
+    aretes = [(autre, nom) for nom, liste in zip(noms, prerequis) for autre in liste]
+    assert Probleme.par_colonnes(noms, durees, prerequis) == probleme
+    tableaux = Probleme.par_colonnes(np.array(noms), np.array(durees), prerequis)
+    assert tableaux == probleme
+    assert Probleme.par_aretes(noms, durees, np.array(aretes)) == probleme
+    # Les arêtes en désordre : les prérequis suivent l'ordre des arêtes.
+    assert Probleme.par_aretes(noms, durees, aretes[::-1])._taches == {
+        nom: Tache(nom, tache.duree, tache.prerequis[::-1])
+        for nom, tache in probleme._taches.items()
+    }
+    compact = ProblemeCompact.par_colonnes(noms, durees, prerequis)
+    assert compact._taches == probleme._taches
+    assert compact.empreinte() == probleme.empreinte()
+    assert ProblemeCompact.par_aretes(noms, durees, aretes)._taches == compact._taches
+
+
+def test_vide_et_chaines():
+    """Problème vide, prérequis en chaînes, durées entières gardées entières."""
+    assert len(Probleme.par_colonnes([], [], [])) == 0
+    assert len(Probleme.par_aretes([], [], [])) == 0
+    probleme = Probleme.par_colonnes(
+        np.array(["A", "B"]), np.array([1, 2]), ["", "A"]
+    )
+    assert probleme == Probleme.par_str("A / 1 /\nB / 2 / A")
+    assert type(probleme["B"].duree) is int
+
+
+@pytest.mark.parametrize(
+    "noms, durees, prerequis, message",
+    [
+        (["A", "B", "A"], [1, 2, 3], [[], [], []], "A est présente deux fois"),
+        (["A", "B"], [1, -2], [[], []], "B : la durée doit être positive"),
+        (["A", "B"], [1, 2], [[], ["C"]], "C n'est pas une tâche existante"),
+        (["A", "B"], [1, 2], [["Z"], []], "Z n'est pas une tâche existante"),
+        (["A", "B"], [1], [[], []], "même longueur"),
+        (["A", "B"], [1, 2], [[]], "une liste par tâche"),
+    ],
+)
+def test_erreurs(noms, durees, prerequis, message):
+    """Les vérifications vectorisées nomment la tâche fautive."""
+    with pytest.raises(ValueError, match=message):
+        Probleme.par_colonnes(noms, durees, prerequis)
+
+
+def test_erreurs_aretes():
+    """Extrémités inconnues et arêtes mal formées."""
+    with pytest.raises(ValueError, match="X n'est pas"):
+        Probleme.par_aretes(["A", "B"], [1, 2], [("A", "B"), ("B", "X")])
+    with pytest.raises(ValueError, match="paires"):
+        Probleme.par_aretes(["A", "B"], [1, 2], [("A", "B", "C")])
+
+
+def test_taches_a_la_demande(probleme):
+    """Les moteurs lisent les colonnes ; une mutation revient à un dict."""
+    noms, durees, prerequis = colonnes(probleme)
+    lu = Probleme.par_colonnes(noms, durees, prerequis)
+    assert lu._taches._creees.count(None) == len(noms)
+    for moteur in ("natif", "niveaux"):
+        edt = resous(lu, moteur=moteur, marges=True)
+        assert edt == resous(probleme, moteur=moteur, marges=True)
+    assert pickle.loads(pickle.dumps(lu)) == probleme
+    assert lu.empreinte() == probleme.empreinte()
+    tache = lu[noms[0]]
+    assert lu[noms[0]] is tache
+    lu.modifie_duree(noms[0], 50)
+    probleme.modifie_duree(noms[0], 50)
+    assert type(lu._taches) is dict
+    assert lu == probleme
+    assert resous(lu, moteur="natif") == resous(probleme, moteur="natif")
+
+
+def test_durees_mixtes():
+    """Une liste mixte garde ses entiers : même empreinte que par_str."""
+    probleme = Probleme.par_colonnes(["A", "B"], [1, 2.5], [[], ["A"]])
+    assert type(probleme["A"].duree) is int
+    attendu = Probleme.par_str("A / 1 /\nB / 2.5 / A")
+    assert probleme.empreinte() == attendu.empreinte()
+
+
+def test_compact_fige():
+    """Les tâches compactes créées à la demande restent figées."""
+    compact = ProblemeCompact.par_colonnes(["A", "B"], [1, 2], [[], ["A"]])
+    tache = compact["B"]
+    with pytest.raises(AttributeError):
+        tache._duree = 9
+    with pytest.raises(AttributeError):
+        del tache.duree
+    assert compact.empreinte() == Probleme.par_str("A / 1 /\nB / 2 / A").empreinte()
+    compact.ajoute_tache(Tache("C", 3, ["B"]))
+    assert compact["C"].ids_prerequis == (1,)
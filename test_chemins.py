@@ -0,0 +1,92 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste les chemins critiques et les plus longs chemins.
+"""
+import pytest
+from ordonnancement import Probleme, resous
+from ordonnancement.chemins import (
+    LIMITE_CRITIQUES,
+    chemins_critiques,
+    k_plus_longs_chemins,
+    plus_longs_chemins,
+)
+from ordonnancement.generateur import aleatoire
+
+
+def _tous_les_chemins(probleme):
+    """Enumération exhaustive, pour comparer."""
+    successeurs = {nom: [] for nom in probleme.noms}
+    for tache in probleme.taches:
+        for nom in tache.prerequis:
+            successeurs[nom].append(tache.nom)
+
+    def depuis(nom):
+        if not successeurs[nom]:
+            yield [nom]
+        for suivant in successeurs[nom]:
+            for suite in depuis(suivant):
+                yield [nom] + suite
+
+    for tache in probleme.taches:
+        if not tache.prerequis:
+            yield from depuis(tache.nom)
+
+
+def _longueur(probleme, chemin):
+    """Somme des durées."""
+    return sum(probleme[nom].duree for nom in chemin)
+
+
+@pytest.mark.parametrize("graine", range(5))
+def test_exhaustif(graine):
+    """Même suite de longueurs que l'énumération complète."""
+    probleme = aleatoire(40, degre=1.5, graine=graine)
+    tous = list(_tous_les_chemins(probleme))
+    obtenus = list(plus_longs_chemins(probleme))
+    assert len(obtenus) == len(tous)
+    assert sorted(map(tuple, (chemin for _, chemin in obtenus))) == sorted(
+        map(tuple, tous)
+    )
+    longueurs = [longueur for longueur, _ in obtenus]
+    assert longueurs == sorted(longueurs, reverse=True)
+    assert all(longueur == _longueur(probleme, c) for longueur, c in obtenus)
+
+
+@pytest.mark.parametrize("graine", range(3))
+def test_critiques(graine):
+    """Les chemins critiques ne passent que par des tâches de marge nulle."""
+    probleme = aleatoire(300, graine=graine, flottantes=True)
+    edt = resous(probleme, moteur="natif", marges=True)
+    fin = max(activite.fin for activite in edt.activites)
+    chemins = chemins_critiques(probleme)
+    assert chemins
+    for chemin in chemins:
+        assert _longueur(probleme, chemin) == pytest.approx(fin)
+        assert all(edt[nom].mar == pytest.approx(0, abs=1e-9) for nom in chemin)
+
+
+def test_echelle():
+    """Une échelle de 40 barreaux a 2**40 chemins : seuls k sont construits."""
+    lignes = ["G0 / 1 /", "D0 / 1 /"]
+    for barreau in range(1, 40):
+        precedents = f"G{barreau - 1} D{barreau - 1}"
+        lignes.append(f"G{barreau} / 2 / {precedents}")
+        lignes.append(f"D{barreau} / 1 / {precedents}")
+    probleme = Probleme.par_str("\n".join(lignes))
+    chemins = k_plus_longs_chemins(probleme, 1000)
+    assert chemins[0] == (79, ["G0"] + [f"G{b}" for b in range(1, 40)])
+    assert len(chemins) == 1000
+    critiques = chemins_critiques(probleme, limite=5)
+    assert critiques == [chemins[0][1], chemins[1][1]]
+
+
+def test_limite_par_defaut():
+    """Sans limite donnée, un éventail de chemins égaux est tronqué."""
+    lignes = ["D / 1 /"]
+    for etage in range(12):
+        precedents = " ".join(f"E{etage - 1}_{i}" for i in range(2)) if etage else "D"
+        lignes += [f"E{etage}_{i} / 1 / {precedents}" for i in range(2)]
+    probleme = Probleme.par_str("\n".join(lignes))
+    assert len(chemins_critiques(probleme)) == LIMITE_CRITIQUES
+    assert len(chemins_critiques(probleme, limite=None)) == 2**12
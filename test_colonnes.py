@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste l'emploi du temps en colonnes NumPy.
+"""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from ordonnancement import EDT, Probleme, resous
+from ordonnancement.algorithme import marges
+from ordonnancement.colonnes import EDTColonnes, resous_colonnes
+from ordonnancement.generateur import aleatoire
+
+
+@pytest.fixture
+def probleme():
+    """Problème aléatoire à dates flottantes."""
+    return aleatoire(500, graine=3, flottantes=True, melange=True)
+
+
+def test_meme_edt(probleme):
+    """Mêmes activités, dans le même ordre, que le moteur natif."""
+    for avec_marges in (False, True):
+        attendu = resous(probleme, moteur="natif", marges=avec_marges)
+        colonnes = resous_colonnes(probleme, marges=avec_marges)
+        assert colonnes.edt() == attendu
+        assert list(colonnes.activites) == list(attendu.activites)
+        assert EDTColonnes.depuis_edt(attendu).edt() == attendu
+
+
+def test_agregats(probleme):
+    """Mêmes résultats que les boucles sur les objets."""
+    attendu = resous(probleme, moteur="natif", marges=True)
+    colonnes = attendu.colonnes()
+    assert colonnes.marges().tolist() == marges(attendu)
+    assert colonnes.marge_max() == attendu.marge_max()
+    assert colonnes.chemin_critique() == attendu.chemin_critique()
+    assert colonnes.date_valide() == attendu.date_valide()
+    assert colonnes.est_valide() and attendu.est_valide()
+    for cle in ("debut", "mar"):
+        for decroissant in (False, True):
+            vue = attendu.ordonne(cle, decroissant=decroissant)
+            positions = colonnes.ordonne(cle, decroissant=decroissant)
+            assert [colonnes.taches[p] for p in positions] == [
+                activite.tache for activite in vue
+            ]
+
+
+def test_vues():
+    """Les vues écrivent dans les tableaux."""
+    probleme = Probleme.par_str("A / 1 /\nB / 2 / A")
+    colonnes = resous_colonnes(probleme)
+    vue = colonnes["B"]
+    assert (vue.debut, vue.fin) == (1, 3)
+    vue.debut = 0
+    assert colonnes.debut.tolist() == [0, 0]
+    assert not colonnes.est_valide()
+    assert "B" in colonnes and "C" not in colonnes
+    with pytest.raises(ValueError):
+        colonnes["C"]
+
+
+def test_prerequis_absent():
+    """Un prérequis sans activité ne peut pas être indexé."""
+    edt = resous(Probleme.par_str("A / 1 /\nB / 2 / A"), moteur="natif")
+    edt.retire("A")
+    with pytest.raises(ValueError):
+        edt.colonnes()
+    assert len(EDTColonnes.depuis_edt(EDT([]))) == 0
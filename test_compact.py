@@ -0,0 +1,84 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le mode compact.
+"""
+import pickle
+import pytest
+from ordonnancement import Tache, resous
+from ordonnancement.compact import ProblemeCompact, TacheCompacte
+from ordonnancement.generateur import aleatoire
+from ordonnancement.probleme import Lien
+
+
+@pytest.fixture
+def probleme():
+    """Problème aléatoire mélangé : des prérequis déclarés après leur tâche."""
+    return aleatoire(500, graine=4, melange=True)
+
+
+def test_meme_probleme(probleme):
+    """Mêmes tâches, mêmes accès par nom, mêmes solutions."""
+    compact = ProblemeCompact.depuis(probleme)
+    assert list(compact.taches) == list(probleme.taches)
+    assert repr(compact["T7"]) == repr(probleme["T7"])
+    assert compact.empreinte() == probleme.empreinte()
+    assert resous(compact, moteur="natif", marges=True) == resous(
+        probleme, moteur="natif", marges=True
+    )
+    assert resous(compact, moteur="kahn") == resous(probleme, moteur="kahn")
+    assert ProblemeCompact.par_str("A / 1 /\nB / 2 / A")["B"].ids_prerequis == (0,)
+
+
+def test_partage(probleme):
+    """Noms internés, entiers et table partagés, pas de __dict__."""
+    compact = ProblemeCompact.depuis(probleme)
+    tache = next(tache for tache in compact.taches if tache.ids_prerequis)
+    prerequis = compact.tache(tache.ids_prerequis[0])
+    assert tache.ids_prerequis[0] is prerequis.ident
+    assert compact.tache(tache.ident) is tache
+    assert not hasattr(tache, "__dict__")
+    with pytest.raises(AttributeError):
+        tache.duree = 3
+    copie = pickle.loads(pickle.dumps(compact))
+    assert copie._taches == compact._taches
+    assert copie.tache(0)._table is copie.tache(1)._table
+
+
+def test_mutations():
+    """Identifiants stables, renumérotés après un retrait."""
+    compact = ProblemeCompact.par_str("A / 1 /\nB / 2 / A\nC / 3 / B")
+    edt = resous(compact, moteur="natif")
+    compact.lie(edt)
+    compact.ajoute_tache(Tache("D", 1, ["A", "C"]))
+    compact.modifie_duree("B", 5)
+    assert isinstance(compact["D"], TacheCompacte)
+    assert compact["D"].ident == 3 and edt["D"].fin == 10
+    compact.retire_tache("B")
+    assert compact["C"].ident == 1 and compact["D"].ids_prerequis == (0, 1)
+    assert edt.est_valide() and "B" not in edt
+    with pytest.raises(ValueError):
+        compact.ajoute_tache(Tache("E", 1, ["X"]))
+    with pytest.raises(ValueError):
+        ProblemeCompact([Tache("A", 1, [], ressources={"grue": 1})])
+    with pytest.raises(ValueError):
+        ProblemeCompact([Tache("A", 1, ["X"])])
+
+
+def test_depuis_csr():
+    """Même signature que Probleme._depuis_csr ; les liens sont refusés."""
+    colonnes = (["A", "B"], [1, 2], [0, 0, 1], [0])
+    compact = ProblemeCompact._depuis_csr(*colonnes, liens={})
+    assert compact["B"].ids_prerequis == (0,)
+    with pytest.raises(ValueError, match="B : le mode compact n'a pas de liens"):
+        ProblemeCompact._depuis_csr(*colonnes, liens={"B": {"A": Lien("SS")}})
+
+
+def test_colonnes(probleme):
+    """Dans un EDT en colonnes, la position d'une activité est l'identifiant."""
+    pytest.importorskip("numpy")
+    from ordonnancement.colonnes import resous_colonnes
+
+    colonnes = resous_colonnes(ProblemeCompact.depuis(probleme))
+    assert all(vue.position == vue.tache.ident for vue in colonnes.activites)
+    assert colonnes.edt() == resous(probleme, moteur="natif")
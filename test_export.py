@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste l'export en flux et l'affichage par pages.
+"""
+import csv
+import io
+import json
+import pytest
+from ordonnancement import Probleme, resous
+from ordonnancement.export import ecrit, lignes, table
+from ordonnancement.generateur import aleatoire
+
+
+@pytest.fixture
+def edt():
+    """EDT du notebook, avec marges."""
+    probleme = Probleme.par_str(
+        """
+A / 1 /
+B / 2 / A
+C / 3 / A B
+D / 4 / A
+"""
+    )
+    return resous(probleme, moteur="natif", marges=True)
+
+
+def test_formats(edt, tmp_path):
+    """CSV, TSV et JSON Lines relisent les mêmes lignes."""
+    colonnes = ["tache", "prerequis", "debut", "fin", "dta", "marge"]
+    attendu = [
+        [activite.tache.nom, " ".join(activite.tache.prerequis)]
+        + [str(getattr(activite, nom)) for nom in ("debut", "fin", "dta", "mar")]
+        for activite in edt.activites
+    ]
+    for format, separateur in (("csv", ","), ("tsv", "\t")):
+        chemin = tmp_path / f"edt.{format}"
+        edt.exporte(chemin, colonnes=colonnes)
+        with open(chemin, encoding="utf-8", newline="") as fichier:
+            relues = list(csv.reader(fichier, delimiter=separateur))
+        assert relues == [colonnes] + attendu
+    sortie = io.StringIO()
+    ecrit(edt, sortie, "jsonl", colonnes)
+    relues = [json.loads(ligne) for ligne in sortie.getvalue().splitlines()]
+    assert relues[2] == dict(
+        tache="D", prerequis=["A"], debut=1, fin=5, dta=2, marge=1
+    )
+
+
+def test_erreurs(edt, tmp_path):
+    """Colonnes et formats inconnus, colonnes d'activité sur un problème."""
+    with pytest.raises(ValueError):
+        ecrit(edt, io.StringIO(), "xml")
+    # L'erreur arrive avant l'ouverture : le fichier existant est gardé.
+    chemin = tmp_path / "plan.xlsx"
+    chemin.write_bytes(b"classeur")
+    with pytest.raises(ValueError, match="Format inconnu"):
+        ecrit(edt, chemin)
+    with pytest.raises(ValueError, match="Colonne inconnue"):
+        ecrit(edt, chemin, "csv", ["retard"])
+    assert chemin.read_bytes() == b"classeur"
+    with pytest.raises(ValueError):
+        next(lignes(edt, ["retard"]))
+    with pytest.raises(ValueError):
+        next(lignes(Probleme.par_str("A / 1 /"), ["debut"]))
+
+
+def test_fenetre():
+    """Seules les lignes de la page sont dans la table."""
+    probleme = aleatoire(1000, graine=1)
+    edt = resous(probleme, moteur="natif", marges=True)
+    page = table(edt, ["debut", "marge"], premier=990, nombre=50)
+    assert page.row_count == 10
+    assert page.caption == "lignes 991 à 1000 sur 1000"
+    assert table(probleme).row_count == 1000 and table(probleme).caption is None
+    # L'EDT en colonnes s'exporte de la même façon.
+    assert list(lignes(edt.colonnes(), ["tache", "fin"])) == list(
+        lignes(edt, ["tache", "fin"])
+    )
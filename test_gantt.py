@@ -0,0 +1,62 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le diagramme de Gantt.
+"""
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from ordonnancement import Probleme, resous
+from ordonnancement.colonnes import resous_colonnes
+from ordonnancement.gantt import dessine, enregistre
+from ordonnancement.generateur import aleatoire
+
+
+@pytest.fixture
+def probleme():
+    """Petit problème du notebook."""
+    return Probleme.par_str(
+        """
+A / 1 /
+B / 2 / A
+C / 3 / A B
+D / 4 / A
+"""
+    )
+
+
+def test_collections(probleme):
+    """Une collection de barres, une de marges, les noms en ordonnée."""
+    repere = dessine(resous(probleme, moteur="natif", marges=True)).axes[0]
+    barres, marges = repere.collections
+    assert len(barres.get_paths()) == 4
+    noms = [texte.get_text() for texte in repere.get_yticklabels()]
+    assert sorted(noms) == list("ABCD")
+    # Seule D a une marge : de sa fin 5 à 6.
+    ligne = noms.index("D")
+    assert marges.get_segments()[0].tolist() == [[5, ligne], [6, ligne]]
+    # Sans marges calculées, rien n'est surligné.
+    repere = dessine(resous(probleme, moteur="natif")).axes[0]
+    assert len(repere.collections) == 1
+
+
+def test_regroupe():
+    """Plus d'activités que de lignes : une barre par groupe."""
+    probleme = aleatoire(1000, graine=2)
+    colonnes = resous_colonnes(probleme, marges=True)
+    repere = dessine(colonnes, lignes_max=100).axes[0]
+    barres = repere.collections[0]
+    assert len(barres.get_paths()) == 100
+    assert repere.get_xlim()[1] == colonnes.fin.max()
+
+
+def test_enregistre(probleme, tmp_path):
+    """PNG et SVG sans pyplot, EDT vide compris."""
+    edt = resous(probleme, moteur="natif", marges=True)
+    enregistre(edt, tmp_path / "gantt.png")
+    enregistre(edt, tmp_path / "gantt.svg")
+    enregistre(resous(Probleme([]), moteur="natif"), tmp_path / "vide.png")
+    assert (tmp_path / "gantt.png").read_bytes()[:4] == b"\x89PNG"
+    assert b"<svg" in (tmp_path / "gantt.svg").read_bytes()
+    assert (tmp_path / "vide.png").exists()
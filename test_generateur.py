@@ -0,0 +1,37 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste les générateurs de problèmes synthétiques.
+"""
+import pytest
+from ordonnancement import resous
+from ordonnancement.generateur import FORMES, aleatoire, chaine, couches, eventail
+
+
+@pytest.mark.parametrize("forme", FORMES)
+def test_graine(forme):
+    """Même graine, même problème ; graine différente, autre problème."""
+    generateur = FORMES[forme]
+    assert generateur(50, graine=3) == generateur(50, graine=3)
+    assert generateur(50, graine=3) != generateur(50, graine=4)
+
+
+@pytest.mark.parametrize("forme", FORMES)
+def test_soluble(forme):
+    """Même mélangés, les problèmes générés ont une solution."""
+    probleme = FORMES[forme](200, melange=True, flottantes=True)
+    assert len(resous(probleme, moteur="natif")) == 200
+    assert all(isinstance(tache.duree, float) for tache in probleme.taches)
+
+
+def test_formes():
+    """Structure de chaque forme."""
+    assert [len(tache.prerequis) for tache in chaine(4).taches] == [0, 1, 1, 1]
+    assert all(tache.prerequis == ["T0"] for tache in list(eventail(5).taches)[1:])
+    for tache in list(couches(30, largeur=10).taches)[10:]:
+        couche = int(tache.nom[1:]) // 10
+        assert tache.prerequis
+        assert all(int(nom[1:]) // 10 == couche - 1 for nom in tache.prerequis)
+    probleme = aleatoire(2000, degre=3)
+    aretes = sum(len(tache.prerequis) for tache in probleme.taches)
+    assert 2.5 < aretes / 2000 < 3.5
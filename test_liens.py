@@ -0,0 +1,125 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste les liens de précédence typés (FS, SS, FF, SF) avec décalages.
+"""
+import io
+import pytest
+from ordonnancement import Probleme, resous
+from ordonnancement.probleme import Lien
+from ordonnancement.binaire import sauve
+from ordonnancement.chemins import chemins_critiques
+from ordonnancement.compact import ProblemeCompact
+from ordonnancement.generateur import aleatoire, avec_liens, taches_fictives
+from ordonnancement.portefeuille import Portefeuille
+
+EXEMPLE = "A / 4 /\nB / 3 / A:SS+2\nC / 1 / A B:FF-1\nD / 2 / C:SF+5"
+
+
+def test_exemple():
+    """Dates et marges calculées à la main."""
+    edt = resous(Probleme.par_str(EXEMPLE), moteur="natif", marges=True)
+    assert [
+        (a.tache.nom, a.debut, a.fin, a.dta, a.mar, a.marge_libre)
+        for a in edt.activites
+    ] == [
+        ("A", 0, 4, 0, 0, 0),
+        ("B", 2, 5, 3, 1, 1),
+        ("C", 4, 5, 4, 0, 0),
+        ("D", 7, 9, 7, 0, 0),
+    ]
+    # Un recouvrement ne fait pas commencer avant 0.
+    edt = resous(Probleme.par_str("A / 1 /\nB / 5 / A:FF-3"), moteur="natif")
+    assert edt["B"].debut == 0
+
+
+@pytest.mark.parametrize("flottantes", [False, True])
+def test_moteurs(flottantes):
+    """Les trois moteurs donnent les mêmes dates."""
+    probleme = avec_liens(aleatoire(500, graine=4, flottantes=flottantes), graine=4)
+    edt = resous(probleme, moteur="natif", marges=True)
+    assert edt == resous(probleme, moteur="niveaux", marges=True)
+    reference = resous(probleme)
+    assert [(a.debut, a.fin) for a in reference.activites] == [
+        (edt[a.tache.nom].debut, edt[a.tache.nom].fin) for a in reference.activites
+    ]
+    assert edt.est_valide()
+
+
+def test_marges():
+    """L'EDT au plus tard est valide ; les marges libres n'ont pas d'effet."""
+    probleme = avec_liens(aleatoire(500, graine=5), graine=5)
+    edt = resous(probleme, moteur="natif", marges=True)
+    fin_projet = max(activite.fin for activite in edt.activites)
+    tard = resous(probleme, moteur="natif", marges=True)
+    for activite in tard.activites:
+        activite.debut = activite.dta
+        activite.fin = activite.dta + activite.tache.duree
+        assert activite.fin <= fin_projet
+        assert activite.mar >= 0 and 0 <= activite.marge_libre <= activite.mar
+    assert tard.est_valide()
+    # Retarder une tâche de sa marge libre ne décale aucun successeur.
+    for activite in list(edt.activites)[::7]:
+        activite.debut += activite.marge_libre
+        activite.fin += activite.marge_libre
+        assert edt.est_valide()
+        assert activite.fin <= fin_projet
+
+
+def test_taches_fictives():
+    """Liens FS et SS : mêmes dates qu'avec des tâches fictives."""
+    probleme = avec_liens(
+        aleatoire(800, graine=6), types=("FS", "SS"), decalages=range(4), graine=6
+    )
+    edt = resous(probleme, moteur="natif", marges=True)
+    fictif = resous(taches_fictives(probleme), moteur="natif", marges=True)
+    for activite in edt.activites:
+        nom = activite.tache.nom
+        assert (activite.debut, activite.fin) == (fictif[nom].debut, fictif[nom].fin)
+        jalon = fictif[nom + "@debut"]
+        assert (activite.dta, activite.mar) == (jalon.dta, jalon.mar)
+
+
+def test_probleme():
+    """Lecture, export, empreinte et mutations."""
+    probleme = Probleme.par_str(EXEMPLE)
+    sortie = io.StringIO()
+    probleme.exporte(sortie)
+    assert sortie.getvalue().splitlines()[1:] == [
+        "A,4,", "B,3,A:SS+2", "C,1,A B:FF-1", "D,2,C:SF+5"
+    ]
+    simple = Probleme.par_str("A / 4 /\nB / 3 / A:FS")
+    assert simple["B"].liens is None
+    assert simple.empreinte() == Probleme.par_str("A / 4 /\nB / 3 / A").empreinte()
+    decale = Probleme.par_str("A / 4 /\nB / 3 / A:FS+1")
+    assert simple.empreinte() != decale.empreinte()
+    empreinte = probleme.empreinte()
+    probleme.retire_prerequis("C", "B")
+    assert probleme["C"].liens is None and probleme.empreinte() != empreinte
+    probleme.retire_tache("A")
+    assert probleme["B"].liens is None
+    with pytest.raises(ValueError, match="deux liens"):
+        Probleme.par_str("A / 1 /\nB / 1 / A:SS A:FF")
+    with pytest.raises(ValueError, match="inconnu"):
+        Lien("XS")
+
+
+def test_refus(tmp_path):
+    """Les modules qui supposent des liens fin-début refusent les liens typés."""
+    probleme = Probleme.par_str(EXEMPLE)
+    with pytest.raises(ValueError, match="liens typés"):
+        ProblemeCompact.depuis(probleme)
+    with pytest.raises(ValueError, match="liens typés"):
+        sauve(probleme, tmp_path / "liens.bin")
+    with pytest.raises(ValueError, match="fin-début"):
+        chemins_critiques(probleme)
+    # Le portefeuille garde les liens, projet par projet comme combiné.
+    portefeuille = Portefeuille(
+        {"P1": Probleme.par_str("X / 2 /"), "P2": Probleme.par_str(EXEMPLE)}
+    )
+    portefeuille.lie("P2:A", "P1:X")
+    combine = portefeuille.resous()
+    assert [
+        (nom, combine["P2:" + nom].debut) for nom in "ABCD"
+    ] == [(nom, portefeuille.edt("P2")[nom].debut) for nom in "ABCD"]
+    assert combine["P2:D"].debut == 9
@@ -0,0 +1,58 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste la résolution par lots.
+"""
+import json
+from ordonnancement import Probleme, resous
+from ordonnancement.generateur import aleatoire, avec_liens
+from ordonnancement.lot import main, resous_lot, resous_dossier
+
+
+def test_resous_lot():
+    """Mêmes EDT qu'une résolution un par un, avec ou sans processus."""
+    problemes = [aleatoire(50, graine=graine) for graine in range(6)]
+    problemes[0].lie(resous(problemes[0], moteur="natif"))
+    attendus = [
+        resous(probleme, moteur="natif", marges=True) for probleme in problemes
+    ]
+    assert resous_lot(problemes, workers=2, marges=True) == attendus
+    assert resous_lot(problemes, workers=1, marges=True) == attendus
+
+
+def test_resous_lot_colonnes():
+    """Colonnes et liens typés : mêmes activités, sans EDT assemblé."""
+    problemes = [
+        aleatoire(50, graine=1),
+        avec_liens(aleatoire(50, graine=2), graine=2),
+        Probleme.par_colonnes(["A", "B"], [1, 2.5], ["", "A"]),
+    ]
+    attendus = [
+        resous(probleme, moteur="natif", marges=True) for probleme in problemes
+    ]
+    for workers in (1, 2):
+        resultats = resous_lot(problemes, workers=workers, marges=True, colonnes=True)
+        assert [resultat.edt() for resultat in resultats] == attendus
+        assert resous_lot(problemes, workers=workers, marges=True) == attendus
+
+
+def test_resous_dossier(tmp_path):
+    """Un résumé par fichier ; les erreurs n'arrêtent pas le lot."""
+    (tmp_path / "a.txt").write_text("A / 1 /\nB / 2 / A\nC / 1 / A\n")
+    (tmp_path / "b.txt").write_text("A / 1 / B\nB / 1 / A\n")
+    (tmp_path / "c.txt").write_text("A / 1 / Z\n")
+    resumes = resous_dossier(str(tmp_path), workers=2)
+    fichiers = [resume["fichier"][-5:] for resume in resumes]
+    assert fichiers == ["a.txt", "b.txt", "c.txt"]
+    assert resumes[0]["duree_totale"] == 3
+    assert resumes[0]["chemin_critique"] == ["A", "B"]
+    assert "erreur" in resumes[1] and "Ligne 1" in resumes[2]["erreur"]
+
+
+def test_ligne_de_commande(tmp_path):
+    """Les résumés sont écrits en JSON Lines."""
+    (tmp_path / "a.txt").write_text("A / 1 /\nB / 2 / A\n")
+    sortie = tmp_path / "resumes.jsonl"
+    assert main(["solve", str(tmp_path), "--sortie", str(sortie)]) == 0
+    resume = json.loads(sortie.read_text())
+    assert resume["taches"] == 2 and resume["duree_totale"] == 3
@@ -0,0 +1,49 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le moteur par niveaux.
+"""
+import pytest
+
+pytest.importorskip("numpy")
+
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement import niveaux as module_niveaux
+from ordonnancement.generateur import FORMES
+from ordonnancement.moteur import GrapheCompact, calcule
+from ordonnancement.niveaux import calcule_niveaux, niveaux
+
+
+@pytest.mark.parametrize("forme", sorted(FORMES))
+@pytest.mark.parametrize("flottantes", [False, True])
+def test_identique(forme, flottantes):
+    """Même ordre et mêmes colonnes que le moteur natif, bit pour bit."""
+    probleme = FORMES[forme](300, graine=2, flottantes=flottantes, melange=True)
+    for marges in (False, True):
+        assert calcule_niveaux(probleme, marges) == calcule(probleme, marges)
+        assert resous(probleme, moteur="niveaux", marges=marges) == resous(
+            probleme, moteur="natif", marges=marges
+        )
+
+
+def test_threads(monkeypatch):
+    """Les niveaux découpés entre threads donnent le même résultat."""
+    monkeypatch.setattr(module_niveaux, "SEUIL_THREADS", 4)
+    probleme = FORMES["couches"](400, largeur=40, densite=0.1, graine=3)
+    assert calcule_niveaux(probleme, True, travailleurs=3) == calcule(probleme, True)
+
+
+def test_cas_limites():
+    """Prérequis en double, problème vide, cycle."""
+    probleme = Probleme(
+        [Tache("A", 1, []), Tache("B", 2, ["A", "A"]), Tache("C", 1, ["B", "A"])]
+    )
+    assert calcule_niveaux(probleme, True) == calcule(probleme, True)
+    assert [palier.tolist() for palier in niveaux(GrapheCompact(probleme))] == [
+        [0],
+        [1],
+        [2],
+    ]
+    assert calcule_niveaux(Probleme([]), True) == calcule(Probleme([]), True)
+    with pytest.raises(ValueError, match="cycle A -> B -> A"):
+        calcule_niveaux(Probleme.par_str("A / 1 / B\nB / 1 / A"))
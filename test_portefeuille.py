@@ -0,0 +1,100 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste les portefeuilles de projets.
+"""
+import random
+import pytest
+from ordonnancement import Probleme
+from ordonnancement.generateur import aleatoire
+from ordonnancement.portefeuille import Portefeuille
+
+
+@pytest.fixture
+def portefeuille():
+    """Six projets aléatoires ; chaque projet attend des tâches des précédents."""
+    hasard = random.Random(3)
+    resultat = Portefeuille(
+        {f"P{numero}": aleatoire(200, graine=numero) for numero in range(6)}
+    )
+    for numero in range(1, 6):
+        for _ in range(4):
+            amont = hasard.randrange(numero)
+            resultat.lie(
+                f"P{numero}:T{hasard.randrange(200)}",
+                f"P{amont}:T{hasard.randrange(200)}",
+            )
+    return resultat
+
+
+def dates(edt, prefixe=""):
+    """Début et fin de chaque tâche, par nom."""
+    return {
+        prefixe + activite.tache.nom: (activite.debut, activite.fin)
+        for activite in edt.activites
+    }
+
+
+def test_memes_dates(portefeuille):
+    """Projet par projet, mêmes dates que le problème combiné."""
+    combine = dates(portefeuille.resous(marges=True))
+    par_projet = {}
+    for projet in portefeuille.projets:
+        par_projet.update(dates(portefeuille.edt(projet), projet + ":"))
+    assert par_projet == combine
+    assert len(combine) == 6 * 200
+    assert portefeuille.resolutions == 6
+
+
+def test_incremental():
+    """Seuls le projet modifié et les projets aval sont résolus de nouveau."""
+    portefeuille = Portefeuille(
+        {
+            "P1": Probleme.par_str("A / 2 /\nB / 3 / A\nC / 1 /"),
+            "P2": Probleme.par_str("X / 1 /\nY / 4 / X"),
+            "P3": Probleme.par_str("U / 5 /"),
+            "P4": Probleme.par_str("V / 1 /"),
+        }
+    )
+    portefeuille.lie("P2:Y", "P1:B")
+    portefeuille.lie("P3:U", "P2:Y")
+    assert portefeuille.ordre() == ["P1", "P4", "P2", "P3"]
+    assert portefeuille.rafraichit() == ["P1", "P4", "P2", "P3"]
+    assert portefeuille.rafraichit() == []
+    portefeuille["P2"].modifie_duree("Y", 5)
+    assert portefeuille.rafraichit() == ["P2", "P3"]
+    # La fin de P1:B ne change pas : P2 et P3 sont gardés.
+    portefeuille["P1"].modifie_duree("C", 7)
+    assert portefeuille.rafraichit() == ["P1"]
+    portefeuille.remplace_projet("P1", Probleme.par_str("B / 1 /"))
+    assert portefeuille.rafraichit(["P2"]) == ["P1", "P2"]
+    assert portefeuille.edt("P3")["U"].debut == 6
+    assert portefeuille.resolutions == 10
+
+
+def test_erreurs():
+    """Cycles entre projets, liens internes, noms inconnus ou réservés."""
+    portefeuille = Portefeuille(
+        {
+            "P1": Probleme.par_str("A / 1 /\nB / 1 /"),
+            "P2": Probleme.par_str("X / 1 /"),
+        }
+    )
+    portefeuille.lie("P2:X", "P1:A")
+    # Pas de cycle entre tâches, mais un cycle entre projets.
+    with pytest.raises(ValueError, match="cycle entre projets"):
+        portefeuille.lie("P1:B", "P2:X")
+    assert portefeuille.ordre() == ["P1", "P2"]
+    with pytest.raises(ValueError, match="même projet"):
+        portefeuille.lie("P1:B", "P1:A")
+    with pytest.raises(ValueError, match="P1:Z n'est pas"):
+        portefeuille.lie("P2:X", "P1:Z")
+    with pytest.raises(ValueError, match="ne désigne pas"):
+        portefeuille.lie("X", "P1:A")
+    with pytest.raises(ValueError, match="réservé"):
+        portefeuille.ajoute_projet("P:3", Probleme.par_str("A / 1 /"))
+    with pytest.raises(ValueError, match="A n'est pas"):
+        portefeuille.remplace_projet("P1", Probleme.par_str("B / 1 /"))
+    portefeuille.delie("P2:X", "P1:A")
+    portefeuille.lie("P1:B", "P2:X")
+    assert portefeuille.ordre() == ["P2", "P1"]
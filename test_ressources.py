@@ -0,0 +1,108 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste l'ordonnancement sous contraintes de ressources.
+"""
+import random
+from dataclasses import replace
+import pytest
+from ordonnancement import Probleme, Tache, resous
+from ordonnancement.generateur import aleatoire
+from ordonnancement.ressources import REGLES, SCHEMAS, resous_ressources
+
+
+def _avec_ressources(taille, graine=0):
+    """Problème aléatoire où les tâches se disputent quatre ressources."""
+    hasard = random.Random(graine)
+    capacites = {"R0": 2, "R1": 3, "R2": 5, "R3": 1}
+    taches = dict()
+    for tache in aleatoire(taille, graine=graine).taches:
+        noms = hasard.sample(sorted(capacites), hasard.randint(0, 2))
+        demandes = {nom: hasard.randint(1, capacites[nom]) for nom in noms}
+        taches[tache.nom] = replace(tache, ressources=demandes)
+    return Probleme._depuis_dict(taches, capacites)
+
+
+def _verifie(probleme, edt):
+    """Prérequis respectés et capacités jamais dépassées."""
+    assert len(edt) == len(list(probleme.taches))
+    for activite in edt.activites:
+        assert activite.fin == activite.debut + activite.tache.duree
+        for nom in activite.tache.prerequis:
+            assert edt[nom].fin <= activite.debut
+    variations = dict()
+    for activite in edt.activites:
+        if activite.tache.duree == 0:
+            continue
+        for ressource, quantite in activite.tache.ressources.items():
+            variations.setdefault(ressource, []).extend(
+                [(activite.debut, quantite), (activite.fin, -quantite)]
+            )
+    for ressource, evenements in variations.items():
+        occupee = 0
+        # Les fins passent avant les débuts au même instant.
+        for _, variation in sorted(evenements, key=lambda e: (e[0], e[1])):
+            occupee += variation
+            assert occupee <= probleme.capacites[ressource]
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+@pytest.mark.parametrize("regle", REGLES)
+def test_faisable(schema, regle):
+    """Les deux schémas donnent un ordonnancement réalisable."""
+    probleme = _avec_ressources(300, graine=4)
+    _verifie(probleme, resous_ressources(probleme, schema=schema, regle=regle))
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+def test_sans_ressource(schema):
+    """Sans demande, les dates sont celles de la résolution classique."""
+    probleme = aleatoire(200, graine=1)
+    attendu = resous(probleme, moteur="natif")
+    edt = resous_ressources(probleme, schema=schema)
+    for activite in edt.activites:
+        assert activite.debut == attendu[activite.tache.nom].debut
+
+
+@pytest.mark.parametrize("schema", SCHEMAS)
+def test_une_grue(schema):
+    """Une ressource de capacité 1 met les tâches bout à bout."""
+    probleme = Probleme(
+        [
+            Tache("A", 2, [], ressources={"grue": 1}),
+            Tache("B", 3, [], ressources={"grue": 1}),
+            Tache("C", 1, ["A"], ressources={"grue": 1}),
+            Tache("D", 4, []),
+        ],
+        capacites={"grue": 1},
+    )
+    edt = resous_ressources(probleme, schema=schema)
+    _verifie(probleme, edt)
+    assert edt["D"].debut == 0
+    assert max(activite.fin for activite in edt.activites) == 6
+
+
+def test_erreurs():
+    """Demandes impossibles et options inconnues."""
+    with pytest.raises(ValueError):
+        Tache("A", 1, [], ressources={"grue": -1})
+    probleme = Probleme([Tache("A", 1, [], ressources={"grue": 2})])
+    with pytest.raises(ValueError):
+        resous_ressources(probleme)
+    probleme.capacites["grue"] = 1
+    with pytest.raises(ValueError):
+        resous_ressources(probleme)
+    probleme.capacites["grue"] = 2
+    with pytest.raises(ValueError):
+        resous_ressources(probleme, schema="autre")
+    with pytest.raises(ValueError):
+        resous_ressources(probleme, regle="autre")
+    assert len(resous_ressources(probleme)) == 1
+
+
+def test_capacites_egalite():
+    """Les capacités font partie du problème."""
+    taches = [Tache("A", 1, [])]
+    assert Probleme(taches, {"grue": 1}) != Probleme(taches, {"grue": 2})
+    assert "capacites" in repr(Probleme(taches, {"grue": 1}))
+    assert "capacites" not in repr(Probleme(taches))
@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+"""Description.
+Teste le service local, avec un groupe de threads à la place des processus.
+"""
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from ordonnancement import Probleme, resous
+from ordonnancement.service import Client, Service
+
+TEXTE = "A / 1 /\nB / 2 / A\nC / 3 / A B\nD / 4 / A"
+
+
+def service() -> Service:
+    """Service sur deux threads."""
+    return Service(ThreadPoolExecutor(2))
+
+
+def test_regroupement():
+    """Demandes identiques simultanées : une seule résolution."""
+
+    async def scenario():
+        serveur = service()
+        reponses = await asyncio.gather(
+            *(serveur.resous(TEXTE.encode()) for _ in range(10)),
+            serveur.resous(TEXTE.encode(), marges=True),
+        )
+        assert len(set(reponses[:10])) == 1
+        assert serveur.statistiques()["resolutions"] == 2
+        assert serveur.statistiques()["regroupees"] == 9
+        await serveur.resous(TEXTE.encode())
+        assert serveur.statistiques()["succes"] == 1
+        serveur.ferme()
+        return json.loads(reponses[-1])
+
+    reponse = asyncio.run(scenario())
+    attendu = resous(Probleme.par_str(TEXTE), moteur="natif", marges=True)
+    assert reponse["duree_totale"] == 6
+    assert reponse["empreinte"] == Probleme.par_str(TEXTE).empreinte()
+    assert [
+        [a["tache"], a["debut"], a["fin"], a["dta"], a["marge"]]
+        for a in reponse["activites"]
+    ] == [[a.tache.nom, a.debut, a.fin, a.dta, a.mar] for a in attendu.activites]
+
+
+def test_http(tmp_path):
+    """Texte et JSON sur socket Unix, erreurs, statistiques."""
+
+    async def scenario():
+        serveur = service()
+        chemin = str(tmp_path / "ordonnancement.sock")
+        async with await serveur.demarre(socket=chemin):
+            async with Client(socket=chemin) as client:
+                texte = await client.resous(TEXTE, marges=True)
+                taches = [
+                    {"nom": "A", "duree": 1},
+                    {"nom": "B", "duree": 2, "prerequis": ["A"]},
+                ]
+                donnees = await client.resous({"taches": taches})
+                assert await client.resous({"texte": TEXTE}) == await client.resous(
+                    TEXTE
+                )
+                with pytest.raises(ValueError, match="Z n'est pas"):
+                    await client.resous("A / 1 / Z")
+                with pytest.raises(ValueError, match="JSON invalide"):
+                    await client.resous({"taches": [{"nom": "A"}]})
+                with pytest.raises(ValueError, match="n'est pas une chaîne"):
+                    await client.resous({"taches": [{"nom": 1, "duree": 1}]})
+                with pytest.raises(ValueError, match="liste de noms"):
+                    await client.resous(
+                        {"taches": [{"nom": "C", "duree": 1, "prerequis": "AB"}]}
+                    )
+                assert (await client.requete("GET", "/resous"))[0] == 405
+                assert (await client.requete("GET", "/inconnu"))[0] == 404
+                statistiques = (await client.requete("GET", "/statistiques"))[1]
+        serveur.ferme()
+        return texte, donnees, statistiques
+
+    texte, donnees, statistiques = asyncio.run(scenario())
+    assert {a["tache"]: a["marge"] for a in texte["activites"]}["D"] == 1
+    assert donnees["duree_totale"] == 3
+    assert statistiques["demandes"] == 8
+    # Les erreurs ne sont pas gardées.
+    assert statistiques["reponses"] == 4
+
+
+def test_tcp():
+    """Même réponse en TCP sur localhost."""
+
+    async def scenario():
+        serveur = service()
+        tcp = await serveur.demarre(port=0)
+        port = tcp.sockets[0].getsockname()[1]
+        async with tcp:
+            async with Client(port=port) as client:
+                reponse = await client.resous(TEXTE)
+        serveur.ferme()
+        return reponse
+
+    assert asyncio.run(scenario())["duree_totale"] == 6
+
+
+def test_erreurs_serveur(tmp_path):
+    """Requête mal formée et groupe arrêté : une réponse JSON, pas une coupure."""
+
+    async def scenario():
+        serveur = service()
+        chemin = str(tmp_path / "ordonnancement.sock")
+        async with await serveur.demarre(socket=chemin):
+            lecteur, ecrivain = await asyncio.open_unix_connection(chemin)
+            ecrivain.write(b"n'importe quoi\r\n\r\n")
+            mal_forme = await lecteur.read()
+            ecrivain.close()
+            serveur.executeur.shutdown()
+            async with Client(socket=chemin) as client:
+                arrete = await client.requete("POST", "/resous", TEXTE.encode())
+        return mal_forme, arrete
+
+    mal_forme, (statut, reponse) = asyncio.run(scenario())
+    assert mal_forme.startswith(b"HTTP/1.1 400 ")
+    assert statut == 500 and "RuntimeError" in reponse["erreur"]
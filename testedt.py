@@ -166,4 +166,46 @@ def test_date_valide(activites_2):
 def test_datevalide(activites):
     """ savoir si il fait bien son travail"""
     resultat = date_valide(activites)
-    assert resultat == True
\ No newline at end of file
+    assert resultat == True
+
+def test_index_noms():
+    """Accès, appartenance et longueur par l'index des noms."""
+    a = Tache(nom="A", duree=1, prerequis=[])
+    b = Tache(nom="B", duree=2, prerequis=["A"])
+    edt = EDT(
+        activites=[
+            Activite(tache=a, debut=0, fin=1, dta=0, mar=0),
+            Activite(tache=b, debut=1, fin=3, dta=1, mar=0),
+        ]
+    )
+    assert len(edt) == 2
+    assert "B" in edt and "C" not in edt
+    assert edt["B"].debut == 1
+    assert [activite.tache.nom for activite in edt.activites] == ["A", "B"]
+    with pytest.raises(ValueError):
+        edt["C"]
+    with pytest.raises(ValueError):
+        edt.ajoute(Activite(tache=a, debut=3, fin=4, dta=3, mar=0))
+    assert len(edt) == 2
+
+
+def test_ordonne():
+    """Vues triées stables, sans copie des activités."""
+    taches = [Tache(nom=nom, duree=1, prerequis=[]) for nom in "ABCD"]
+    activites = [
+        Activite(tache=taches[0], debut=2, fin=3, dta=4, mar=2),
+        Activite(tache=taches[1], debut=0, fin=1, dta=0, mar=0),
+        Activite(tache=taches[2], debut=2, fin=3, dta=2, mar=0),
+        Activite(tache=taches[3], debut=1, fin=2, dta=5, mar=4),
+    ]
+    edt = EDT(activites)
+    vue = edt.ordonne("debut")
+    assert [activite.tache.nom for activite in vue] == list("BDAC")
+    assert vue[0] is activites[1]
+    assert list(vue.permutation) == [1, 3, 0, 2]
+    decroissant = edt.ordonne("debut", decroissant=True)
+    assert [activite.tache.nom for activite in decroissant] == list("ACDB")
+    assert [a.tache.nom for a in edt.ordonne("marge", True)] == list("DABC")
+    assert edt.ordonne("dta").edt() == EDT([activites[i] for i in (1, 2, 0, 3)])
+    with pytest.raises(ValueError):
+        edt.ordonne("duree")
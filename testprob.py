@@ -2,8 +2,10 @@
 """Description.
 Tests pour la classe Probleme du module ordonnancement.
 """
+import io
 import pytest
 from ordonnancement.probleme import Probleme, Tache
+from ordonnancement.moteur import resous_natif
 
 
 @pytest.fixture
@@ -102,4 +104,137 @@ C / 3 / A B
 D / 4 / A
 """
     probleme = Probleme.par_str(entree)
-    assert probleme == Probleme(taches)
\ No newline at end of file
+    assert probleme == Probleme(taches)
+
+def _dates(edt):
+    """Début et fin par nom de tâche."""
+    return {
+        activite.tache.nom: (activite.debut, activite.fin)
+        for activite in edt.activites
+    }
+
+
+@pytest.fixture
+def lie(taches):
+    """Un problème et son emploi du temps lié."""
+    probleme = Probleme(taches)
+    edt = resous_natif(probleme)
+    probleme.lie(edt)
+    return probleme, edt
+
+
+def test_modifie_duree(lie):
+    """Seuls les successeurs bougent."""
+    probleme, edt = lie
+    probleme.modifie_duree("B", 5)
+    assert probleme["B"].duree == 5
+    assert edt["B"].tache is probleme["B"]
+    assert _dates(edt) == _dates(resous_natif(probleme))
+    assert edt["C"].debut == 6
+    with pytest.raises(ValueError):
+        probleme.modifie_duree("B", -1)
+
+
+def test_ajoute_retire_prerequis(lie):
+    """Ajout, retrait et détection locale des cycles."""
+    probleme, edt = lie
+    probleme.ajoute_prerequis("B", "D")
+    assert _dates(edt) == _dates(resous_natif(probleme))
+    assert probleme.rang("D") < probleme.rang("B") < probleme.rang("C")
+    with pytest.raises(ValueError):
+        probleme.ajoute_prerequis("A", "C")
+    with pytest.raises(ValueError):
+        probleme.ajoute_prerequis("A", "A")
+    assert probleme["A"].prerequis == []
+    probleme.retire_prerequis("B", "D")
+    assert _dates(edt) == _dates(resous_natif(probleme))
+    with pytest.raises(ValueError):
+        probleme.retire_prerequis("B", "D")
+
+
+def test_ajoute_retire_tache(lie):
+    """Les successeurs d'une tâche retirée perdent ce prérequis."""
+    probleme, edt = lie
+    probleme.ajoute_tache(Tache(nom="E", duree=2, prerequis=["C", "D"]))
+    assert edt["E"].debut == 6
+    probleme.retire_tache("B")
+    assert "B" not in edt
+    assert probleme["C"].prerequis == ["A"]
+    assert _dates(edt) == _dates(resous_natif(probleme))
+    assert list(probleme.noms) == ["A", "C", "D", "E"]
+    with pytest.raises(ValueError):
+        probleme.ajoute_tache(Tache(nom="F", duree=1, prerequis=["B"]))
+
+
+def test_par_flux(taches):
+    """Commentaires, lignes vides et prérequis déclarés plus loin."""
+    entree = io.StringIO(
+        """# export
+C / 3 / A B
+
+A / 1 /
+  # suite
+B / 2 / A
+D / 4 / A
+"""
+    )
+    probleme = Probleme.par_flux(entree)
+    assert list(probleme.noms) == list("CABD")
+    assert probleme == Probleme(taches)
+
+
+def test_par_flux_erreurs():
+    """Les erreurs donnent le numéro de ligne."""
+    erreurs = {
+        "A / 1 /\n\nB / x / A": "Ligne 3",
+        "A / 1 /\nB / 1 / A\nA / 2 /": "Ligne 3 : A est présente deux fois",
+        "A / 1 / Z\nB / 1 / Z": "Ligne 1 : Z n'est pas",
+        "A / 1": "Ligne 1 : format",
+    }
+    for entree, message in erreurs.items():
+        with pytest.raises(ValueError, match=message):
+            Probleme.par_flux(entree.splitlines())
+
+
+def test_par_fichier(tmp_path, taches):
+    """Lecture d'un fichier."""
+    chemin = tmp_path / "probleme.txt"
+    chemin.write_text("A / 1 /\nB / 2 / A\nC / 3 / A B\nD / 4 / A\n")
+    assert Probleme.par_fichier(chemin) == Probleme(taches)
+
+
+def test_analyse_cycle():
+    """Le cycle et les tâches bloquées sont donnés par un seul parcours."""
+    probleme = Probleme.par_str(
+        """
+A / 1 /
+B / 1 / A E
+C / 1 / B
+D / 1 / C
+E / 1 / D
+F / 1 / E
+G / 1 / G
+"""
+    )
+    analyse = probleme.analyse()
+    assert not analyse.valide
+    assert analyse.ordre == ["A"]
+    assert analyse.cycle == ["B", "C", "D", "E"]
+    assert analyse.bloquees == ["B", "C", "D", "E", "F", "G"]
+    assert probleme.analyse() is analyse
+    for moteur in (Probleme.verifie, resous_natif):
+        with pytest.raises(ValueError, match="cycle B -> C -> D -> E -> B"):
+            moteur(probleme)
+
+
+def test_analyse_invalidee(taches):
+    """L'analyse en cache est oubliée quand les prérequis changent."""
+    probleme = Probleme(taches)
+    assert probleme.verifie() == ["A", "B", "D", "C"]
+    analyse = probleme.analyse()
+    probleme.modifie_duree("A", 5)
+    assert probleme.analyse() is analyse
+    probleme.retire_prerequis("C", "B")
+    assert probleme.verifie() == ["A", "B", "C", "D"]
+    probleme.ajoute_tache(Tache(nom="E", duree=1, prerequis=["D"]))
+    assert probleme.verifie()[-1] == "E"